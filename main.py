@@ -1,16 +1,60 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
 from src.routes import auth
 from src.routes import accounts
 from src.routes import currency_invests
+from src.routes import deposits
+from src.routes import assets
+from src.routes import transactions
+from src.routes import metrics
 from src.config.constants import API
+from src.config.config import settings
+from src.services.dependencies import password_handler
+from src.database.dependencies import cache
+from src.database.query_counter import count_queries, QUERY_COUNT_HEADER
+from src.services.token_reaper import token_reaper
+from src.services.transaction_import import import_jobs
+from src.services.snapshots import snapshot_writer
+from src.services.deposits import accrual_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await cache.start()
+    await token_reaper.start()
+    await snapshot_writer.start()
+    await accrual_writer.start()
+    yield
+    await import_jobs.stop()
+    await accrual_writer.stop()
+    await snapshot_writer.stop()
+    await token_reaper.stop()
+    await cache.stop()
+    password_handler.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if settings.query_count_header:
+
+    @app.middleware("http")
+    async def add_query_count_header(request: Request, call_next):
+        with count_queries() as counter:
+            response = await call_next(request)
+        response.headers[QUERY_COUNT_HEADER] = str(counter.count)
+        return response
 
-app = FastAPI()
 
 app.include_router(auth.router, prefix=API)
 app.include_router(accounts.router, prefix=API)
 app.include_router(currency_invests.router, prefix=API)
+app.include_router(deposits.router, prefix=API)
+app.include_router(assets.router, prefix=API)
+app.include_router(transactions.router, prefix=API)
+app.include_router(metrics.router, prefix=API)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""store money as numeric
+
+Revision ID: f1b7c3a95d20
+Revises: e8d4a6b27c15
+Create Date: 2026-10-18 14:06:21.518377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7c3a95d20'
+down_revision: Union[str, None] = 'e8d4a6b27c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # existing values are rounded to the scale of the new type
+    op.alter_column('accounts', 'balance_investable_funds',
+               existing_type=sa.Float(),
+               type_=sa.Numeric(precision=18, scale=2),
+               existing_nullable=True,
+               postgresql_using='round(balance_investable_funds::numeric, 2)')
+    op.alter_column('transactions', 'amount',
+               existing_type=sa.Float(),
+               type_=sa.Numeric(precision=18, scale=2),
+               existing_nullable=False,
+               postgresql_using='round(amount::numeric, 2)')
+    op.alter_column('assets', 'purchase_share_price',
+               existing_type=sa.Float(),
+               type_=sa.Numeric(precision=18, scale=6),
+               existing_nullable=False,
+               postgresql_using='round(purchase_share_price::numeric, 6)')
+    op.alter_column('currency_invests', 'current_amount',
+               existing_type=sa.Float(),
+               type_=sa.Numeric(precision=18, scale=2),
+               existing_nullable=False,
+               postgresql_using='round(current_amount::numeric, 2)')
+
+
+def downgrade() -> None:
+    op.alter_column('currency_invests', 'current_amount',
+               existing_type=sa.Numeric(precision=18, scale=2),
+               type_=sa.Float(),
+               existing_nullable=False)
+    op.alter_column('assets', 'purchase_share_price',
+               existing_type=sa.Numeric(precision=18, scale=6),
+               type_=sa.Float(),
+               existing_nullable=False)
+    op.alter_column('transactions', 'amount',
+               existing_type=sa.Numeric(precision=18, scale=2),
+               type_=sa.Float(),
+               existing_nullable=False)
+    op.alter_column('accounts', 'balance_investable_funds',
+               existing_type=sa.Numeric(precision=18, scale=2),
+               type_=sa.Float(),
+               existing_nullable=True)
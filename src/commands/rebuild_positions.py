@@ -0,0 +1,36 @@
+"""
+Rebuild the positions table from the transactions.
+
+Usage:
+    python -m src.commands.rebuild_positions [--account-id ID ...]
+"""
+
+import argparse
+import asyncio
+
+from src.database.db import session_scope
+from src.repositories.positions import PostgresPositionRepo
+
+
+async def rebuild_positions(account_ids: list[int] | None) -> int:
+    async with session_scope() as db:
+        return await PostgresPositionRepo(db).rebuild_positions(account_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--account-id",
+        dest="account_ids",
+        metavar="ID",
+        type=int,
+        action="append",
+        help="account to rebuild, can be repeated; all accounts if not given",
+    )
+    args = parser.parse_args()
+    positions = asyncio.run(rebuild_positions(args.account_ids))
+    print(f"Rebuilt {positions} positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,13 +12,47 @@ class Settings(BaseSettings):
         database_host (str): Hostname of the database.
         database_port (int): Port number of the database.
         sqlalchemy_database_url (str): URL for the SQLAlchemy database.
+        database_async (bool): Whether to use the asyncpg driver with AsyncSession instead of psycopg2.
+        async_sqlalchemy_database_url (str | None): URL for the async engine, derived from sqlalchemy_database_url if not set.
+        database_pool_size (int): Number of connections kept open in the pool.
+        database_max_overflow (int): Number of connections allowed above pool size.
+        database_pool_timeout (int): Seconds to wait for a free connection before failing.
+        database_pool_recycle (int): Seconds after which a connection is replaced.
+        database_pool_pre_ping (bool): Whether to test connections on checkout.
+        query_count_header (bool): Whether to report the number of SQL statements of a request in the X-Query-Count header.
+        bcrypt_rounds (int): Cost factor for new password hashes; older hashes are upgraded on login.
+        password_hash_executor (str): Pool running bcrypt, "thread" or "process".
+        password_hash_workers (int): Number of concurrent bcrypt computations.
+        password_hash_max_queue (int): Number of hash requests allowed to wait for a worker before returning 503.
         secret_key (str): Secret key for the application encryption.
         algorithm (str): Algorithm for the application encryption.
         access_token_expire_minutes (int): Expiration time for access tokens in minutes.
         refresh_token_expire_days (int): Expiration time for refresh tokens in days.
+        token_claims_cache_size (int): Maximum number of verified tokens kept decoded in memory.
+        token_reaper_interval (int): Seconds between runs of the expired refresh token cleanup.
+        token_reaper_batch_size (int): Number of expired refresh tokens deleted per transaction.
         redis_host (str): Hostname of the Redis server.
         redis_port (int): Port number of the Redis server.
         redis_password (str): Password for the Redis server.
+        redis_max_connections (int): Size of the shared Redis connection pool.
+        cache_serializer (str): Encoding of cached values, "orjson" or "pickle".
+        local_cache_max_size (int): Maximum number of entries in the in-process cache.
+        local_cache_ttl (int): Seconds a value is kept in the in-process cache.
+        local_cache_negative_ttl (int): Seconds a cache miss is kept in the in-process cache.
+        revoked_token_filter_capacity (int): Number of revoked tokens the Bloom prefilter is sized for.
+        revoked_token_filter_error_rate (float): False positive rate of the Bloom prefilter at capacity.
+        exchange_rates_file (str): CSV file with columns day, base, quote, rate read by the local rate provider.
+        exchange_rate_cache_ttl (int): Seconds an exchange rate is kept in the cache.
+        import_batch_size (int): Rows of an imported file validated and written in one transaction.
+        import_max_errors (int): Rejected rows reported per import job.
+        import_job_ttl (int): Seconds the progress of an import job is kept in Redis for the status endpoint.
+        export_batch_size (int): Rows fetched from the database cursor and encoded at once by exports.
+        snapshot_interval (int): Seconds between runs of the account value snapshot job.
+        snapshot_batch_size (int): Accounts valued and written per transaction by the snapshot job.
+        performance_cache_ttl (int): Seconds the performance metrics of an account are kept in the cache.
+        accrual_interval (int): Seconds between runs of the deposit interest accrual job.
+        accrual_batch_size (int): Deposits accrued and written per transaction by the accrual job.
+        metrics_emails (list[str]): Emails of the users allowed to read the metrics endpoints, nobody if empty.
         mail_username (str): Username for the email server.
         mail_password (str): Password for the email server.
         mail_from (str): Email address for the sender.
@@ -38,13 +72,47 @@ class Settings(BaseSettings):
     database_host: str
     database_port: int
     sqlalchemy_database_url: str
+    database_async: bool = True
+    async_sqlalchemy_database_url: str | None = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    query_count_header: bool = False
+    bcrypt_rounds: int = 12
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 32
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
     refresh_token_expire_days: int
+    token_claims_cache_size: int = 10000
+    token_reaper_interval: int = 300
+    token_reaper_batch_size: int = 1000
     redis_host: str
     redis_port: int
     redis_password: str
+    redis_max_connections: int = 50
+    cache_serializer: str = "orjson"
+    local_cache_max_size: int = 10000
+    local_cache_ttl: int = 30
+    local_cache_negative_ttl: int = 5
+    revoked_token_filter_capacity: int = 100000
+    revoked_token_filter_error_rate: float = 0.001
+    exchange_rates_file: str = "data/exchange_rates.csv"
+    exchange_rate_cache_ttl: int = 3600
+    import_batch_size: int = 1000
+    import_max_errors: int = 100
+    import_job_ttl: int = 86400
+    export_batch_size: int = 1000
+    snapshot_interval: int = 3600
+    snapshot_batch_size: int = 500
+    performance_cache_ttl: int = 3600
+    accrual_interval: int = 3600
+    accrual_batch_size: int = 1000
+    metrics_emails: list[str] = []
     mail_username: str
     mail_password: str
     mail_from: str
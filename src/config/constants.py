@@ -5,11 +5,45 @@ API = API_V1
 AUTH = "/auth"
 ACCOUNTS = "/accounts"
 CURRENCIES = "/currencies"
+DEPOSITS = "/deposits"
+ASSETS = "/assets"
+TRANSACTIONS = "/transactions"
+METRICS = "/metrics"
 
 MIN_USERNAME_LENGTH = 3
 MAX_USERNAME_LENGTH = 255
 MAX_NOTE_LENGTH = 500
 MAX_ACTIVE_SESSIONS = 5
+MAX_BULK_TRANSACTIONS = 10000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# money is stored as NUMERIC(MONEY_PRECISION, MONEY_SCALE), share prices with PRICE_SCALE
+MONEY_PRECISION = 18
+MONEY_SCALE = 2
+PRICE_SCALE = 6
+MINOR_UNITS = 10**MONEY_SCALE
+
+INSTRUMENT_CURRENCY = "CURRENCY"
+INSTRUMENT_ASSET = "ASSET"
+INSTRUMENT_DEPOSIT = "DEPOSIT"
+
+SNAPSHOT_DAY = "day"
+SNAPSHOT_WEEK = "week"
+SNAPSHOT_MONTH = "month"
+
+TRANSACTION_EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "type",
+    "amount",
+    "note",
+    "currency",
+    "asset_name",
+    "currency_invest_id",
+    "asset_id",
+    "deposit_id",
+)
 
 TRANSACTION_TYPE_ENUM = Enum(
     "INVESTMENT",
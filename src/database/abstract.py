@@ -1,9 +1,19 @@
 import abc
 
 
+class AbstractSerializer(abc.ABC):
+    @abc.abstractmethod
+    def dumps(self, value: object) -> bytes:
+        pass
+
+    @abc.abstractmethod
+    def loads(self, data: bytes) -> object | None:
+        pass
+
+
 class AbstractCache(abc.ABC):
     @abc.abstractmethod
-    async def get_from_cache(self, key: str) -> bytes | None:
+    async def get_from_cache(self, key: str) -> object | None:
         pass
 
     @abc.abstractmethod
@@ -13,3 +23,15 @@ class AbstractCache(abc.ABC):
     @abc.abstractmethod
     async def delete_from_cache(self, key: str) -> None:
         pass
+
+    @abc.abstractmethod
+    async def get_many(self, keys: list[str]) -> list[object | None]:
+        pass
+
+    @abc.abstractmethod
+    async def set_many(self, values: dict[str, object], expire: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete_many(self, keys: list[str]) -> None:
+        pass
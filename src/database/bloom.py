@@ -0,0 +1,47 @@
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings.
+
+    Answers "definitely not added" or "maybe added". Items cannot be removed,
+    the filter is rebuilt instead.
+
+    Attributes:
+        capacity (int): number of items the filter is sized for
+        error_rate (float): false positive rate at capacity
+        size (int): number of bits
+        hash_count (int): number of bit positions per item
+        count (int): number of items added
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __positions(self, item: str):
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self.__positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self.__positions(item)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
@@ -1,26 +1,374 @@
-import pickle
+import asyncio
+import time
+from collections import OrderedDict
 
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from src.database.abstract import AbstractCache
+from src.database.abstract import AbstractCache, AbstractSerializer
+from src.database.bloom import BloomFilter
 from src.config.config import settings
+from src.database.cache_keys import INVALIDATION_CHANNEL
 
 
 class RedisCache(AbstractCache):
-    def __init__(self):
-        self.redis_connection = Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            password=settings.redis_password,
-            db=0,
-        )
+    def __init__(self, redis_connection: Redis, serializer: AbstractSerializer):
+        self.redis_connection = redis_connection
+        self.serializer = serializer
+        self.hits = 0
+        self.misses = 0
 
-    async def get_from_cache(self, key: str) -> bytes | None:
-        return await self.redis_connection.get(key)
+    def __decode(self, value: bytes | None) -> object | None:
+        if value is not None:
+            value = self.serializer.loads(value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def get_from_cache(self, key: str) -> object | None:
+        return self.__decode(await self.redis_connection.get(key))
 
     async def set_to_cache(self, key: str, value: object, expire: int) -> None:
-        await self.redis_connection.set(key, pickle.dumps(value))
-        await self.redis_connection.expire(key, expire)
+        await self.redis_connection.set(key, self.serializer.dumps(value), ex=expire)
 
     async def delete_from_cache(self, key: str) -> None:
         await self.redis_connection.delete(key)
+
+    async def get_many(self, keys: list[str]) -> list[object | None]:
+        if not keys:
+            return []
+        return [
+            self.__decode(value) for value in await self.redis_connection.mget(keys)
+        ]
+
+    async def set_many(self, values: dict[str, object], expire: int) -> None:
+        async with self.redis_connection.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, self.serializer.dumps(value), ex=expire)
+            await pipe.execute()
+
+    async def delete_many(self, keys: list[str]) -> None:
+        if keys:
+            await self.redis_connection.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with a TTL per entry.
+
+    Attributes:
+        max_size (int): maximum number of entries, the least recently used is evicted
+        hits (int): number of lookups that found a live entry
+        misses (int): number of lookups that found nothing or an expired entry
+        evictions (int): number of entries dropped because the cache was full
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """
+        Get entry from the cache.
+
+        Args:
+            key (str): key of the entry
+
+        Returns:
+            tuple (bool, object): whether a live entry was found, its value
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, key: str, value: object, expire: float) -> None:
+        self._entries[key] = (time.monotonic() + expire, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+class KeyPrefilter:
+    """
+    Bloom filter of the Redis keys under one prefix.
+
+    A lookup of a key the filter has never seen is answered without touching
+    either cache tier. The filter is seeded with SCAN when the invalidation
+    listener connects, and learns new keys from local writes and from
+    invalidations published by other workers. Until it is seeded, and while
+    the listener is disconnected, every key is treated as a possible hit.
+
+    Attributes:
+        prefix (str): key prefix covered by the filter
+        capacity (int): minimum number of keys the filter is sized for
+        error_rate (float): false positive rate at capacity
+        ready (bool): whether the filter is in sync with Redis
+        connected (bool): whether the invalidation listener is connected, the
+            filter is only ready while it is
+        skipped_lookups (int): lookups answered by the filter alone
+        checked_lookups (int): lookups passed on to the cache tiers
+    """
+
+    def __init__(self, prefix: str, capacity: int, error_rate: float) -> None:
+        self.prefix = prefix
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ready = False
+        self.connected = False
+        self.skipped_lookups = 0
+        self.checked_lookups = 0
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._pending: list[str] | None = None
+
+    def matches(self, key: str) -> bool:
+        return key.startswith(self.prefix)
+
+    def add(self, key: str) -> None:
+        if self._pending is not None:
+            self._pending.append(key)
+        if key not in self._bloom:
+            self._bloom.add(key)
+
+    def might_contain(self, key: str) -> bool:
+        if not self.ready or key in self._bloom:
+            self.checked_lookups += 1
+            return True
+        self.skipped_lookups += 1
+        return False
+
+    def is_saturated(self) -> bool:
+        return self._pending is None and self._bloom.count > self._bloom.capacity
+
+    async def rebuild(self, redis_connection: Redis) -> None:
+        """
+        Replace the filter with one built from the keys currently in Redis.
+
+        Args:
+            redis_connection (Redis): connection used to scan the keys
+        """
+        self._pending = []
+        try:
+            keys = [
+                key.decode("utf-8")
+                async for key in redis_connection.scan_iter(
+                    match=f"{self.prefix}*", count=1000
+                )
+            ]
+            bloom = BloomFilter(max(self.capacity, 2 * len(keys)), self.error_rate)
+            for key in keys + self._pending:
+                bloom.add(key)
+            self._bloom = bloom
+            # keys written while disconnected were not seen, scanned or not
+            self.ready = self.connected
+        finally:
+            self._pending = None
+
+    def stats(self) -> dict:
+        return {
+            "prefix": self.prefix,
+            "ready": self.ready,
+            "keys": self._bloom.count,
+            "size_bytes": self._bloom.size_bytes,
+            "bytes_per_key": self._bloom.size_bytes / max(self._bloom.count, 1),
+            "skipped_lookups": self.skipped_lookups,
+            "checked_lookups": self.checked_lookups,
+        }
+
+
+class TieredCache(AbstractCache):
+    """
+    In-process LocalCache in front of RedisCache.
+
+    The local tier keeps decoded values, so a local hit costs no decoding.
+    Misses are cached locally too (negative caching), except under a prefilter
+    prefix, where a key that was never written is already answered by the
+    prefilter and a stale miss could let a revoked token through. Writes and
+    deletes are published on a Redis channel and every worker drops its local
+    copy of the key, so logout on one worker is seen by the others.
+    Keys under a prefilter prefix are looked up only when the prefilter says
+    they may exist.
+
+    Attributes:
+        remote (RedisCache): shared Redis tier
+        local (LocalCache): in-process tier
+        local_ttl (int): lifetime in seconds of locally cached values
+        negative_ttl (int): lifetime in seconds of locally cached misses
+        prefilters (list[KeyPrefilter]): Bloom filters for sparse key prefixes
+    """
+
+    def __init__(
+        self,
+        remote: RedisCache,
+        local: LocalCache,
+        local_ttl: int = settings.local_cache_ttl,
+        negative_ttl: int = settings.local_cache_negative_ttl,
+        prefilters: list[KeyPrefilter] = None,
+    ) -> None:
+        self.remote = remote
+        self.local = local
+        self.local_ttl = local_ttl
+        self.negative_ttl = negative_ttl
+        self.prefilters = prefilters or []
+        self._listener: asyncio.Task | None = None
+        self._rebuilds: set[asyncio.Task] = set()
+
+    def __prefilter(self, key: str) -> KeyPrefilter | None:
+        for prefilter in self.prefilters:
+            if prefilter.matches(key):
+                return prefilter
+        return None
+
+    def __skip_lookup(self, key: str) -> bool:
+        prefilter = self.__prefilter(key)
+        return prefilter is not None and not prefilter.might_contain(key)
+
+    def __add_to_prefilter(self, key: str) -> None:
+        prefilter = self.__prefilter(key)
+        if prefilter is None:
+            return
+        prefilter.add(key)
+        if prefilter.is_saturated():
+            task = asyncio.create_task(prefilter.rebuild(self.remote.redis_connection))
+            self._rebuilds.add(task)
+            task.add_done_callback(self._rebuilds.discard)
+
+    def __set_local(self, key: str, value: object | None) -> None:
+        if value is not None:
+            self.local.set(key, value, self.local_ttl)
+        # a miss under a prefilter prefix is answered by the prefilter; cached
+        # locally, it would outlive an invalidation received during the lookup
+        elif self.__prefilter(key) is None:
+            self.local.set(key, None, self.negative_ttl)
+
+    async def get_from_cache(self, key: str) -> object | None:
+        if self.__skip_lookup(key):
+            return None
+        found, value = self.local.get(key)
+        if found:
+            return value
+        value = await self.remote.get_from_cache(key)
+        self.__set_local(key, value)
+        return value
+
+    async def set_to_cache(self, key: str, value: object, expire: int) -> None:
+        self.__add_to_prefilter(key)
+        await self.remote.set_to_cache(key, value, expire)
+        await self.__invalidate([key])
+
+    async def delete_from_cache(self, key: str) -> None:
+        await self.remote.delete_from_cache(key)
+        await self.__invalidate([key])
+
+    async def get_many(self, keys: list[str]) -> list[object | None]:
+        values = {}
+        missing = []
+        for key in keys:
+            if self.__skip_lookup(key):
+                values[key] = None
+                continue
+            found, value = self.local.get(key)
+            if found:
+                values[key] = value
+            else:
+                missing.append(key)
+        for key, value in zip(missing, await self.remote.get_many(missing)):
+            self.__set_local(key, value)
+            values[key] = value
+        return [values[key] for key in keys]
+
+    async def set_many(self, values: dict[str, object], expire: int) -> None:
+        for key in values:
+            self.__add_to_prefilter(key)
+        await self.remote.set_many(values, expire)
+        await self.__invalidate(list(values))
+
+    async def delete_many(self, keys: list[str]) -> None:
+        await self.remote.delete_many(keys)
+        await self.__invalidate(keys)
+
+    async def __invalidate(self, keys: list[str]) -> None:
+        for key in keys:
+            self.local.delete(key)
+        async with self.remote.redis_connection.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+
+    async def __listen(self) -> None:
+        while True:
+            pubsub = self.remote.redis_connection.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                for prefilter in self.prefilters:
+                    prefilter.connected = True
+                    await prefilter.rebuild(self.remote.redis_connection)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        key = message["data"].decode("utf-8")
+                        self.local.delete(key)
+                        self.__add_to_prefilter(key)
+            except RedisError as e:
+                print(e)  # TODO: log error
+                # invalidations may have been missed while disconnected
+                self.local.clear()
+                for prefilter in self.prefilters:
+                    prefilter.connected = False
+                    prefilter.ready = False
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """
+        Start listening for invalidations published by other workers.
+        """
+        if self._listener is None:
+            self._listener = asyncio.create_task(self.__listen())
+
+    async def stop(self) -> None:
+        """
+        Stop listening for invalidations.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "redis": self.remote.stats(),
+            "prefilters": [prefilter.stats() for prefilter in self.prefilters],
+        }
@@ -0,0 +1,89 @@
+"""
+Key schema for everything the application stores in Redis.
+
+Every key starts with the namespace and the schema version. Bump
+CACHE_KEY_VERSION when the layout or the encoding of a cached value changes,
+so old entries are ignored and expire on their own instead of being decoded
+by new code.
+"""
+
+from datetime import date
+
+CACHE_NAMESPACE = "investment-tracker"
+CACHE_KEY_VERSION = "v2"
+CACHE_KEY_PREFIX = f"{CACHE_NAMESPACE}:{CACHE_KEY_VERSION}"
+
+INVALIDATION_CHANNEL = f"{CACHE_KEY_PREFIX}:invalidate"
+BLACKLIST_KEY_PREFIX = f"{CACHE_KEY_PREFIX}:blacklist:"
+
+
+def user_key(email: str) -> str:
+    """
+    Key of a cached user.
+
+    Args:
+        email (str): email of the user
+
+    Returns:
+        str: cache key
+    """
+    return f"{CACHE_KEY_PREFIX}:user:{email}"
+
+
+def blacklist_key(token_id: str) -> str:
+    """
+    Key marking a logged out access token.
+
+    Args:
+        token_id (str): jti claim of the access token
+
+    Returns:
+        str: cache key
+    """
+    return f"{BLACKLIST_KEY_PREFIX}{token_id}"
+
+
+def exchange_rate_key(base: str, quote: str, day: date) -> str:
+    """
+    Key of an exchange rate.
+
+    Args:
+        base (str): currency being priced
+        quote (str): currency the rate is expressed in
+        day (date): day the rate applies to
+
+    Returns:
+        str: cache key
+    """
+    return f"{CACHE_KEY_PREFIX}:rate:{base}:{quote}:{day.isoformat()}"
+
+
+def import_job_key(job_id: str) -> str:
+    """
+    Key of the progress of a file import.
+
+    Args:
+        job_id (str): id of the import job
+
+    Returns:
+        str: cache key
+    """
+    return f"{CACHE_KEY_PREFIX}:import-job:{job_id}"
+
+
+def performance_key(account_id: int, last_transaction_id: int, day: date) -> str:
+    """
+    Key of the performance metrics of an account.
+
+    The key changes with every new transaction and every day, so stale
+    metrics are never read and expire on their own.
+
+    Args:
+        account_id (int): id of the account
+        last_transaction_id (int): id of the newest transaction of the account, 0 if none
+        day (date): day the metrics were computed on
+
+    Returns:
+        str: cache key
+    """
+    return f"{CACHE_KEY_PREFIX}:performance:{account_id}:{last_transaction_id}:{day.isoformat()}"
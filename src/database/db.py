@@ -1,29 +1,197 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from src.config.config import settings
+from src.database.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from src.database.query_counter import install_query_counter
 
 SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.async_sqlalchemy_database_url or make_url(
+    SQLALCHEMY_DATABASE_URL
+).set(drivername="postgresql+asyncpg")
+
+POOL_OPTIONS = {
+    "pool_size": settings.database_pool_size,
+    "max_overflow": settings.database_max_overflow,
+    "pool_timeout": settings.database_pool_timeout,
+    "pool_recycle": settings.database_pool_recycle,
+    "pool_pre_ping": settings.database_pool_pre_ping,
+}
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, echo_pool=True, poolclass=TimedQueuePool, **POOL_OPTIONS
+)
+
+install_query_counter(engine)
+
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+if settings.database_async:
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        echo_pool=True,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **POOL_OPTIONS,
+    )
+    install_query_counter(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a synchronous Session.
+
+    Used when the async driver is disabled in settings. Every call that can hit the
+    database runs in the threadpool, so the repositories use the same API in both
+    modes and never block the event loop.
+
+    Attributes:
+        sync_session (Session): wrapped synchronous session
+    """
+
+    def __init__(self, sync_session: Session) -> None:
+        self.sync_session = sync_session
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo_pool=True)
+    def add(self, instance: object) -> None:
+        self.sync_session.add(instance)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def add_all(self, instances: list[object]) -> None:
+        self.sync_session.add_all(instances)
 
+    async def execute(self, statement, params=None, **kwargs) -> Any:
+        return await run_in_threadpool(
+            self.sync_session.execute, statement, params, **kwargs
+        )
+
+    async def scalar(self, statement, params=None, **kwargs) -> Any:
+        return await run_in_threadpool(
+            self.sync_session.scalar, statement, params, **kwargs
+        )
+
+    async def scalars(self, statement, params=None, **kwargs) -> Any:
+        return await run_in_threadpool(
+            self.sync_session.scalars, statement, params, **kwargs
+        )
+
+    async def stream(self, statement, params=None, **kwargs) -> "ThreadedStreamResult":
+        return ThreadedStreamResult(
+            await run_in_threadpool(
+                self.sync_session.execute, statement, params, **kwargs
+            )
+        )
+
+    async def get(self, entity, ident, **kwargs) -> Any:
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance: object, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def delete(self, instance: object) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+class ThreadedStreamResult:
+    """
+    Awaitable facade over a synchronous Result, the counterpart of AsyncResult.
 
-def get_db():
+    Attributes:
+        sync_result (Result): wrapped result, read one partition at a time in the threadpool
     """
-    Create a database session.
+
+    def __init__(self, sync_result) -> None:
+        self.sync_result = sync_result
+
+    async def partitions(self, size: int | None = None) -> AsyncIterator[list]:
+        partitions = self.sync_result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                break
+            yield partition
+
+
+DatabaseSession = AsyncSession | ThreadedSession
+
+
+def new_session() -> DatabaseSession:
+    """
+    Create a database session for the mode selected in settings.
+
+    Returns:
+        DatabaseSession: AsyncSession (asyncpg) or ThreadedSession (psycopg2)
+    """
+    if settings.database_async:
+        return AsyncSessionLocal()
+    return ThreadedSession(SessionLocal())
+
+
+def get_pool() -> QueuePool:
+    """
+    Connection pool of the engine selected in settings.
+
+    Returns:
+        QueuePool: pool used by the request sessions
+    """
+    if settings.database_async:
+        return async_engine.pool
+    return engine.pool
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[DatabaseSession, None]:
+    """
+    Database session for work running outside a request (background jobs, streams).
 
     Yields:
-        SessionLocal: A database session.
+        DatabaseSession: A database session, always closed on exit.
     Exceptions:
-        Exception: If an error occurs during the database session.
+        Exception: re-raised after the session is rolled back.
     """
-    db = SessionLocal()
+    db = new_session()
     try:
         yield db
-    except Exception as e:
+    except Exception:
         # todo: log error
-        db.rollback()
+        await db.rollback()
+        raise
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db() -> AsyncGenerator[DatabaseSession, None]:
+    """
+    Create a database session shared by every repository used in a request.
+
+    FastAPI caches the dependency per request, so all repositories get the same
+    session and the connection is returned to the pool when the request ends.
+
+    Yields:
+        DatabaseSession: A database session.
+    """
+    async with session_scope() as db:
+        yield db
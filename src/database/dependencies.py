@@ -1,37 +1,75 @@
-from redis.asyncio import Redis
+from fastapi import Depends
+from redis.asyncio import Redis, ConnectionPool
 
-from src.database.db import get_db
+from src.database.db import get_db, DatabaseSession
 from src.repositories.abstract import (
     AbstractUserRepo,
     AbstractTokenRepo,
     AbstractAccountRepo,
     AbstractCurrencyInvestRepo,
+    AbstractDepositRepo,
+    AbstractAssetRepo,
+    AbstractTransactionRepo,
+    AbstractSnapshotRepo,
 )
 from src.repositories.users import PostgresUserRepo
 from src.repositories.tokens import PostgresTokenRepo
 from src.repositories.accounts import PostgresAccountRepo
 from src.repositories.currency_invests import PostgresCurrencyInvestRepo
-from src.database.abstract import AbstractCache
-from src.database.cache import RedisCache
+from src.repositories.deposits import PostgresDepositRepo
+from src.repositories.assets import PostgresAssetRepo
+from src.repositories.transactions import PostgresTransactionRepo
+from src.repositories.snapshots import PostgresSnapshotRepo
+from src.database.abstract import AbstractCache, AbstractSerializer
+from src.database.cache import RedisCache, LocalCache, TieredCache, KeyPrefilter
+from src.database.cache_keys import BLACKLIST_KEY_PREFIX
+from src.database.serializers import OrjsonSerializer, PickleSerializer
 from src.config.config import settings
+from src.schemas.users import CachedUser
+
+redis_pool = ConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    password=settings.redis_password,
+    db=0,
+    max_connections=settings.redis_max_connections,
+)
 
 
-def get_redis(**kwargs) -> Redis:
+def get_redis() -> Redis:
     """
     Function to get Redis.
 
-    Args:
-        **kwargs: redis connection parameters - except: host, port and password
     Returns:
-        Redis instance
+        Redis instance sharing the application connection pool
+    """
+    return Redis(connection_pool=redis_pool)
+
+
+def get_serializer() -> AbstractSerializer:
     """
-    redis = Redis(
-        host=settings.redis_host,
-        port=settings.redis_port,
-        password=settings.redis_password,
-        **kwargs,
-    )
-    return redis
+    Function to get serializer for cached values.
+    Returns:
+        Serializer instance selected in settings
+    """
+    if settings.cache_serializer == "pickle":
+        return PickleSerializer()
+    if settings.cache_serializer == "orjson":
+        return OrjsonSerializer(schemas=[CachedUser])
+    raise ValueError(f"Invalid cache serializer: {settings.cache_serializer}")
+
+
+cache = TieredCache(
+    RedisCache(get_redis(), get_serializer()),
+    LocalCache(settings.local_cache_max_size),
+    prefilters=[
+        KeyPrefilter(
+            BLACKLIST_KEY_PREFIX,
+            settings.revoked_token_filter_capacity,
+            settings.revoked_token_filter_error_rate,
+        )
+    ],
+)
 
 
 def get_cache() -> AbstractCache:
@@ -40,20 +78,46 @@ def get_cache() -> AbstractCache:
     Returns:
         Cache instance
     """
-    return RedisCache()
+    return cache
+
+
+def get_user_repo(db: DatabaseSession = Depends(get_db)) -> AbstractUserRepo:
+    return PostgresUserRepo(db)
+
+
+def get_token_repo(db: DatabaseSession = Depends(get_db)) -> AbstractTokenRepo:
+    return PostgresTokenRepo(db)
+
+
+def get_account_repo(db: DatabaseSession = Depends(get_db)) -> AbstractAccountRepo:
+    return PostgresAccountRepo(db)
+
+
+def get_currency_invest_repo(
+    db: DatabaseSession = Depends(get_db),
+) -> AbstractCurrencyInvestRepo:
+    return PostgresCurrencyInvestRepo(db)
 
 
-def get_user_repo() -> AbstractUserRepo:
-    return PostgresUserRepo(next(get_db()))
+def get_deposit_repo(
+    db: DatabaseSession = Depends(get_db),
+) -> AbstractDepositRepo:
+    return PostgresDepositRepo(db)
 
 
-def get_token_repo() -> AbstractTokenRepo:
-    return PostgresTokenRepo(next(get_db()))
+def get_asset_repo(
+    db: DatabaseSession = Depends(get_db),
+) -> AbstractAssetRepo:
+    return PostgresAssetRepo(db)
 
 
-def get_account_repo() -> AbstractAccountRepo:
-    return PostgresAccountRepo(next(get_db()))
+def get_transaction_repo(
+    db: DatabaseSession = Depends(get_db),
+) -> AbstractTransactionRepo:
+    return PostgresTransactionRepo(db)
 
 
-def get_currency_invest_repo() -> AbstractCurrencyInvestRepo:
-    return PostgresCurrencyInvestRepo(next(get_db()))
+def get_snapshot_repo(
+    db: DatabaseSession = Depends(get_db),
+) -> AbstractSnapshotRepo:
+    return PostgresSnapshotRepo(db)
@@ -2,12 +2,15 @@ from sqlalchemy import (
     Column,
     Integer,
     Float,
+    Numeric,
     String,
     ForeignKey,
     DateTime,
+    Date,
     Boolean,
     func,
     JSON,
+    Index,
 )
 from sqlalchemy.orm import relationship, declarative_base
 
@@ -15,6 +18,9 @@ from src.config.constants import (
     MAX_USERNAME_LENGTH,
     TRANSACTION_TYPE_ENUM,
     MAX_NOTE_LENGTH,
+    MONEY_PRECISION,
+    MONEY_SCALE,
+    PRICE_SCALE,
 )
 
 Base = declarative_base()
@@ -60,7 +66,7 @@ class Account(Base):
     Attributes:
         id (int): primary key
         user_id (int): foreign key to the users table
-        balance_investable_funds (float): balance of money available for investment
+        balance_investable_funds (Decimal): balance of money available for investment
         currency (str): currency of the account
         created_at (DateTime): date and time when the account was created
 
@@ -73,7 +79,9 @@ class Account(Base):
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    balance_investable_funds = Column(Float, default=0.00)
+    balance_investable_funds = Column(
+        Numeric(MONEY_PRECISION, MONEY_SCALE), default=0.00
+    )
     currency = Column(String(3), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -93,12 +101,23 @@ class Transaction(Base):
         asset_id (int): foreign key to the assets table
         currency_invest_id (int): foreign key to the currency_invests table
         type (TRANSACTION_TYPE_ENUM): type of the transaction
-        amount (float): amount of the transaction in the account's currency
+        amount (Decimal): amount of the transaction in the account's currency
         note (str): note to the transaction
         created_at (DateTime): date and time when the transaction was created
     """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # keyset pagination of an account's history, newest first
+        Index(
+            "ix_transactions_account_id_created_at_id",
+            "account_id",
+            "created_at",
+            "id",
+        ),
+    )
+    # server defaults are returned by the INSERT instead of a separate SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(
@@ -110,7 +129,7 @@ class Transaction(Base):
         Integer, ForeignKey("currency_invests.id", ondelete="CASCADE")
     )
     type = Column(TRANSACTION_TYPE_ENUM, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
     note = Column(String(MAX_NOTE_LENGTH))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -122,9 +141,13 @@ class Deposit(Base):
 
     Attributes:
         id (int): primary key
-        amount (float): amount of the deposit
-        interest_rate (float): interest rate of the deposit
+        interest_rate (float): annual interest rate of the deposit in percent
         maturity_date (DateTime): maturity date of the deposit
+        compounding (str): how often interest is compounded, simple for never
+        accrued_interest (Decimal): interest accrued up to accrued_on
+        accrued_on (Date): day the interest was last accrued to
+
+        transactions (relationship): relationship with the transactions table
     """
 
     __tablename__ = "deposits"
@@ -132,6 +155,11 @@ class Deposit(Base):
     id = Column(Integer, primary_key=True, index=True)
     interest_rate = Column(Float, nullable=False)
     maturity_date = Column(DateTime(timezone=True), nullable=False)
+    compounding = Column(String(10), nullable=False, server_default="simple")
+    accrued_interest = Column(
+        Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False, server_default="0"
+    )
+    accrued_on = Column(Date)
 
     transactions = relationship(
         "Transaction", backref="deposit", cascade="all, delete-orphan"
@@ -144,23 +172,28 @@ class Asset(Base):
 
     Attributes:
         id (int): primary key
-        purchase_amount (float): amount of the purchase
-        purchase_date (DateTime): date and time when the asset was purchased
-        purchase_share_price (float): purchase share price of the asset
-        share_quantity (float): quantity of shares of the asset
-        current_share_quantity (float): current quantity of shares of the asset
+        purchase_date (DateTime): date and time when the asset was purchased or sold
+        purchase_share_price (Decimal): share price of the purchase or sale
+        share_quantity (float): quantity of shares bought or sold
+        current_share_quantity (float): shares of a purchase not sold yet, 0 for a sale
+        realized_pnl (Decimal): profit or loss of a sale, None for a purchase
 
         transactions (relationship): relationship with the transactions table
     """
 
     __tablename__ = "assets"
+    __table_args__ = (
+        # transactions filtered by instrument and the lots of an asset
+        Index("ix_assets_asset_name_id", "asset_name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     asset_name = Column(String(10), nullable=False)
     purchase_date = Column(DateTime(timezone=True), server_default=func.now())
-    purchase_share_price = Column(Float, nullable=False)
+    purchase_share_price = Column(Numeric(MONEY_PRECISION, PRICE_SCALE), nullable=False)
     share_quantity = Column(Float, nullable=False)
     current_share_quantity = Column(Float, nullable=False)
+    realized_pnl = Column(Numeric(MONEY_PRECISION, MONEY_SCALE))
 
     transactions = relationship(
         "Transaction", backref="asset", cascade="all, delete-orphan"
@@ -176,18 +209,24 @@ class CurrencyInvest(Base):
         purchase_amount (float): amount of the purchase in the currency of the investment
         purchase_exchange_rate (float): exchange rate of the purchase
         purchase_date (DateTime): date and time when the investment was purchased
-        current_amount (float): current amount of the investment in the currency of the investment
+        current_amount (Decimal): current amount of the investment in the currency of the investment
 
         transactions (relationship): relationship with the transactions table
     """
 
     __tablename__ = "currency_invests"
+    __table_args__ = (
+        # transactions filtered by instrument
+        Index("ix_currency_invests_currency_id", "currency", "id"),
+    )
+    # server defaults are returned by the INSERT instead of a separate SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     currency = Column(String(3), nullable=False)
     purchase_exchange_rate = Column(Float, nullable=False)
     purchase_date = Column(DateTime(timezone=True), server_default=func.now())
-    current_amount = Column(Float, nullable=False)
+    current_amount = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
 
     transactions = relationship(
         "Transaction", backref="currency_invest", cascade="all, delete-orphan"
@@ -207,11 +246,98 @@ class RefreshToken(Base):
     """
 
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id_session_id", "user_id", "session_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    token = Column(String(350), nullable=False)
+    token = Column(String(350), nullable=False, index=True)
     session_id = Column(String(350), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class ExchangeRate(Base):
+    """
+    Model for the exchange_rates table.
+
+    One row per currency pair and day. The primary key doubles as the time
+    index of a pair, so a rate at a past date is a single index lookup.
+
+    Attributes:
+        base (str): currency being priced
+        quote (str): currency the rate is expressed in
+        day (Date): day the rate applies to
+        rate (float): amount of quote currency for one unit of base currency
+    """
+
+    __tablename__ = "exchange_rates"
+
+    base = Column(String(3), primary_key=True)
+    quote = Column(String(3), primary_key=True)
+    day = Column(Date, primary_key=True)
+    rate = Column(Float, nullable=False)
+
+
+class Position(Base):
+    """
+    Model for the positions table.
+
+    Projection of the transactions: one row per instrument held in an account,
+    updated in the same database transaction as every trade, so the holdings
+    of an account are one primary key range scan. Can be rebuilt from the
+    transactions at any time.
+
+    Attributes:
+        account_id (int): foreign key to the accounts table
+        instrument_type (str): CURRENCY, ASSET or DEPOSIT
+        instrument (str): currency code, asset name or deposit id
+        quantity (float): held quantity of the instrument
+        cost_basis (Decimal): purchase cost of the held quantity in the account's currency
+        last_trade_at (DateTime): date and time of the last trade of the instrument
+    """
+
+    __tablename__ = "positions"
+
+    account_id = Column(
+        Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    instrument_type = Column(String(10), primary_key=True)
+    instrument = Column(String(10), primary_key=True)
+    quantity = Column(Float, nullable=False)
+    cost_basis = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
+    last_trade_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class AccountSnapshot(Base):
+    """
+    Model for the account_snapshots table.
+
+    Value of an account at the end of a day, and the same value rolled up to
+    the week and the month containing that day. A week or month row holds the
+    values of the last day snapshotted in the period, so a chart of any
+    interval reads one row per point.
+
+    Attributes:
+        account_id (int): foreign key to the accounts table
+        interval (str): day, week or month
+        period_start (Date): first day of the period
+        day (Date): day the values were taken on
+        cash (Decimal): balance of investable funds
+        cost_basis (Decimal): purchase cost of all positions
+        positions_value (Decimal): market value of all positions
+    """
+
+    __tablename__ = "account_snapshots"
+
+    account_id = Column(
+        Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    interval = Column(String(5), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    day = Column(Date, nullable=False)
+    cash = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
+    cost_basis = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
+    positions_value = Column(Numeric(MONEY_PRECISION, MONEY_SCALE), nullable=False)
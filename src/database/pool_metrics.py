@@ -0,0 +1,81 @@
+import time
+
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Counters for connection pool checkouts, used to size the pool for the worker count.
+
+    Attributes:
+        checkouts (int): number of connections handed out by the pool
+        wait_time_total (float): total seconds spent waiting for a connection
+        wait_time_max (float): longest single wait for a connection in seconds
+        failures (int): number of checkouts that failed (pool timeout or connect error)
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.failures = 0
+
+    def record_wait(self, seconds: float, failed: bool = False) -> None:
+        """
+        Record a single checkout.
+
+        Args:
+            seconds (float): time spent waiting for the connection
+            failed (bool): whether the checkout failed
+        """
+        if failed:
+            self.failures += 1
+        else:
+            self.checkouts += 1
+        self.wait_time_total += seconds
+        self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        """
+        Current state of the pool merged with the collected counters.
+
+        Args:
+            pool (QueuePool): pool of the active engine
+
+        Returns:
+            dict: pool state and checkout counters
+        """
+        attempts = self.checkouts + self.failures
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "failures": self.failures,
+            "wait_time_avg": self.wait_time_total / attempts if attempts else 0.0,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedPoolMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record_wait(time.perf_counter() - start, failed=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
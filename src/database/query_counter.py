@@ -0,0 +1,70 @@
+"""
+Counting of the SQL statements run while handling a request.
+
+The listener is installed on both engines and records statements into the
+counter of the current context, so concurrent requests are counted apart.
+Use count_queries() around a request, or enable settings.query_count_header
+to get the count in the X-Query-Count response header.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCounter:
+    """
+    Statements run in one context.
+
+    Attributes:
+        statements (list[str]): SQL of every statement, in order
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_current_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "query_counter", default=None
+)
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.statements.append(statement)
+
+
+def install_query_counter(engine: Engine) -> None:
+    """
+    Record the statements of an engine in the counter of the current context.
+
+    Args:
+        engine (Engine): engine to listen on, the sync_engine of an AsyncEngine
+    """
+    event.listen(engine, "before_cursor_execute", _record_statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count the statements run inside the block, including tasks and threads started from it.
+
+    Yields:
+        QueryCounter: counter of the block
+    """
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
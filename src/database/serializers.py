@@ -0,0 +1,64 @@
+import pickle
+
+import orjson
+from pydantic import BaseModel
+
+from src.database.abstract import AbstractSerializer
+
+
+class PickleSerializer(AbstractSerializer):
+    """
+    Serializer kept for compatibility, stores any picklable object.
+    """
+
+    def dumps(self, value: object) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> object | None:
+        return pickle.loads(data)
+
+
+class OrjsonSerializer(AbstractSerializer):
+    """
+    Compact JSON serializer for plain values and registered pydantic schemas.
+
+    Payload layout: format version byte, kind byte, then the JSON body. Schema
+    payloads carry the schema name before the body and are decoded straight
+    from JSON into the schema by pydantic-core. Payloads written in another
+    format version, or for a schema that is no longer registered, are treated
+    as a cache miss.
+
+    Attributes:
+        VERSION (bytes): format version written in front of the payload
+        schemas (dict[str, type[BaseModel]]): schemas that can be decoded, by name
+    """
+
+    VERSION = b"\x01"
+    VALUE = b"v"
+    SCHEMA = b"s"
+
+    def __init__(self, schemas: list[type[BaseModel]] = None) -> None:
+        self.schemas = {schema.__name__: schema for schema in schemas or []}
+
+    def dumps(self, value: object) -> bytes:
+        if isinstance(value, BaseModel):
+            name = type(value).__name__.encode("utf-8")
+            return (
+                self.VERSION
+                + self.SCHEMA
+                + name
+                + b":"
+                + value.model_dump_json().encode()
+            )
+        return self.VERSION + self.VALUE + orjson.dumps(value)
+
+    def loads(self, data: bytes) -> object | None:
+        if data[:1] != self.VERSION:
+            return None
+        if data[1:2] == self.VALUE:
+            return orjson.loads(data[2:])
+        name, _, body = data[2:].partition(b":")
+        schema = self.schemas.get(name.decode("utf-8"))
+        if schema is None:
+            return None
+        return schema.model_validate_json(body)
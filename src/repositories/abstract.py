@@ -1,11 +1,24 @@
 import abc
-from datetime import datetime
+from typing import AsyncIterator
+from datetime import datetime, date
+from decimal import Decimal
 
-from src.database.models import User, RefreshToken, Account, CurrencyInvest, Transaction
+from src.database.models import (
+    User,
+    RefreshToken,
+    Account,
+    CurrencyInvest,
+    Transaction,
+    Deposit,
+    Asset,
+    AccountSnapshot,
+)
 from src.schemas.users import UserIn
 from src.schemas.accounts import AccountIn
 from src.schemas.currency_invests import CurrencyInvestToBuy
+from src.schemas.deposits import DepositIn
 from src.schemas.transactions import TransactionIn
+from src.schemas.assets import AssetToBuy, AssetToSell
 
 
 class AbstractUserRepo(abc.ABC):
@@ -59,7 +72,7 @@ class AbstractTokenRepo(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def remove_expired_refresh_tokens(self, user_id: int) -> None:
+    async def remove_expired_refresh_tokens(self, batch_size: int) -> int:
         pass
 
 
@@ -77,28 +90,37 @@ class AbstractAccountRepo(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def update_funds(self, account_id: int, amount: float) -> Account:
+    async def update_funds(self, account_id: int, amount: Decimal) -> Account:
         pass
 
     @abc.abstractmethod
     async def delete_account(self, account_id: int) -> None:
         pass
 
+    @abc.abstractmethod
+    async def get_positions(
+        self, user_id: int, account_id: int | None = None
+    ) -> list[tuple]:
+        pass
+
 
 class AbstractCurrencyInvestRepo(abc.ABC):
     @abc.abstractmethod
     async def get_currency_invest_by_id(
         self, currency_invest_id: int
-    ) -> CurrencyInvest:
+    ) -> CurrencyInvest | None:
         pass
 
-    # @abc.abstractmethod
-    # async def get_currency_invests(self, account_id: int) -> list[CurrencyInvest]:
-    #     pass
+    @abc.abstractmethod
+    async def get_currency_invests(self, account_id: int) -> list[CurrencyInvest]:
+        pass
 
     @abc.abstractmethod
     async def create_currency_invest(
-        self, transaction_in: TransactionIn, currency_invest_to_buy: CurrencyInvestToBuy
+        self,
+        transaction_in: TransactionIn,
+        currency_invest_to_buy: CurrencyInvestToBuy,
+        account: Account,
     ) -> CurrencyInvest:
         pass
 
@@ -109,3 +131,184 @@ class AbstractCurrencyInvestRepo(abc.ABC):
     # @abc.abstractmethod
     # async def delete_currency_invest(self, currency_invest_id: int) -> None:
     #     pass
+
+
+class AbstractExchangeRateRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_rate(self, base: str, quote: str, day: date) -> float | None:
+        pass
+
+    @abc.abstractmethod
+    async def add_rate(self, base: str, quote: str, day: date, rate: float) -> None:
+        pass
+
+
+class AbstractTransactionRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_accounts(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[Account]:
+        pass
+
+    @abc.abstractmethod
+    async def get_positions(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[tuple]:
+        pass
+
+    @abc.abstractmethod
+    async def add_transactions(
+        self,
+        transactions: list[tuple[TransactionIn, CurrencyInvestToBuy | AssetToBuy]],
+    ) -> list[int]:
+        pass
+
+    @abc.abstractmethod
+    async def get_transactions_page(
+        self,
+        account_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        transaction_type: str | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        instrument_type: str | None = None,
+        instrument: str | None = None,
+    ) -> list[Transaction]:
+        pass
+
+    @abc.abstractmethod
+    def stream_transactions(
+        self, account_id: int, batch_size: int
+    ) -> AsyncIterator[list[tuple]]:
+        pass
+
+    @abc.abstractmethod
+    async def get_latest_transaction_id(self, account_id: int) -> int | None:
+        pass
+
+    @abc.abstractmethod
+    async def get_cash_flows(self, account_id: int) -> list[tuple]:
+        pass
+
+
+class AbstractPositionRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_positions(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[tuple]:
+        pass
+
+    @abc.abstractmethod
+    async def apply_trades(self, trades: list[tuple]) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def rebuild_positions(self, account_ids: list[int] | None = None) -> int:
+        pass
+
+
+class AbstractSnapshotRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_accounts(self, after_id: int, limit: int) -> list[Account]:
+        pass
+
+    @abc.abstractmethod
+    async def add_snapshots(self, snapshots: list[dict]) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def get_snapshots(
+        self,
+        account_id: int,
+        interval: str,
+        period_from: date | None = None,
+        period_to: date | None = None,
+    ) -> list[AccountSnapshot]:
+        pass
+
+
+class AbstractDepositRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_deposit_by_id(self, deposit_id: int) -> Deposit | None:
+        pass
+
+    @abc.abstractmethod
+    async def get_deposits(self, account_id: int) -> list[Deposit]:
+        pass
+
+    @abc.abstractmethod
+    async def create_deposit(
+        self,
+        transaction_in: TransactionIn,
+        deposit_in: DepositIn,
+        account: Account,
+    ) -> Deposit:
+        pass
+
+    @abc.abstractmethod
+    async def get_accrual_terms(
+        self,
+        account_id: int | None = None,
+        after_id: int = 0,
+        limit: int | None = None,
+        due_on: date | None = None,
+    ) -> list[tuple]:
+        pass
+
+    @abc.abstractmethod
+    async def update_accruals(self, accruals: list[tuple]) -> int:
+        pass
+
+
+class AbstractAssetRepo(abc.ABC):
+    @abc.abstractmethod
+    async def get_asset_by_id(self, asset_id: int) -> Asset | None:
+        pass
+
+    @abc.abstractmethod
+    async def get_assets(self, account_id: int) -> list[Asset]:
+        pass
+
+    @abc.abstractmethod
+    async def create_asset(
+        self,
+        transaction_in: TransactionIn,
+        asset_to_buy: AssetToBuy,
+        account: Account,
+    ) -> Asset:
+        pass
+
+    @abc.abstractmethod
+    async def get_position(
+        self, account_id: int, asset_name: str, for_update: bool = False
+    ) -> tuple | None:
+        pass
+
+    @abc.abstractmethod
+    async def get_open_lots(
+        self, account_id: int, asset_name: str, quantity: float
+    ) -> list[tuple]:
+        pass
+
+    @abc.abstractmethod
+    async def add_sale(
+        self,
+        transaction_in: TransactionIn,
+        asset_to_sell: AssetToSell,
+        account: Account,
+        lots: list[tuple[int, float]],
+        cost_basis: Decimal,
+        realized_pnl: Decimal,
+    ) -> Asset:
+        pass
+
+    @abc.abstractmethod
+    async def get_asset_trades(
+        self, account_id: int, for_update: bool = False
+    ) -> list[tuple]:
+        pass
+
+    @abc.abstractmethod
+    async def replace_lots(self, account_id: int, lots: list[tuple]) -> int:
+        pass
@@ -1,20 +1,26 @@
-from sqlalchemy.orm import Session
+from decimal import Decimal
+
+from sqlalchemy import select
 
 from src.repositories.abstract import AbstractAccountRepo
-from src.database.models import Account
+from src.repositories.positions import valued_positions
+from src.database.db import DatabaseSession
+from src.database.models import Account, Position
 from src.schemas.accounts import AccountIn
 
 
 class PostgresAccountRepo(AbstractAccountRepo):
-    def __init__(self, db: Session):
+    def __init__(self, db: DatabaseSession):
         self.db = db
 
     async def get_account_by_id(self, account_id: int) -> Account:
-        return self.db.query(Account).filter(Account.id == account_id).first()
+        return await self.db.scalar(select(Account).where(Account.id == account_id))
 
     async def get_accounts(self, user_id: int) -> list[Account]:
-        accounts = self.db.query(Account).filter(Account.user_id == user_id).all()
-        return accounts
+        accounts = await self.db.scalars(
+            select(Account).where(Account.user_id == user_id)
+        )
+        return list(accounts)
 
     async def create_account(self, user_id: int, account_in: AccountIn) -> Account:
         new_account = Account(
@@ -23,19 +29,43 @@ class PostgresAccountRepo(AbstractAccountRepo):
             currency=account_in.currency,
         )
         self.db.add(new_account)
-        self.db.commit()
-        self.db.refresh(new_account)
+        await self.db.commit()
+        await self.db.refresh(new_account)
         return new_account
 
-    async def update_funds(self, account_id: int, amount: float) -> Account:
-        account = self.get_account_by_id(account_id)
+    async def update_funds(self, account_id: int, amount: Decimal) -> Account:
+        account = await self.get_account_by_id(account_id)
         account.balance_investable_funds += amount
-        self.db.commit()
-        self.db.refresh(account)
+        await self.db.commit()
+        await self.db.refresh(account)
         return account
 
     async def delete_account(self, account_id: int) -> Account:
-        account = self.get_account_by_id(account_id)
-        self.db.delete(account)
-        self.db.commit()
+        account = await self.get_account_by_id(account_id)
+        await self.db.delete(account)
+        await self.db.commit()
         return account
+
+    async def get_positions(
+        self, user_id: int, account_id: int | None = None
+    ) -> list[tuple]:
+        """
+        Get every position held in the user's accounts from the positions table.
+
+        Args:
+            user_id (int): id of the user
+            account_id (int | None): limit the positions to one account
+
+        Returns:
+            list[tuple]: rows of (account_id, instrument_type, instrument, quantity,
+                cost_basis) as returned by valued_positions, one per position
+        """
+        statement = (
+            valued_positions()
+            .join(Account, Account.id == Position.account_id)
+            .where(Account.user_id == user_id)
+        )
+        if account_id is not None:
+            statement = statement.where(Position.account_id == account_id)
+        result = await self.db.execute(statement)
+        return result.all()
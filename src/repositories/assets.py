@@ -0,0 +1,299 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    select,
+    update,
+    values,
+    column,
+    bindparam,
+    func,
+    Integer,
+    Float,
+    Numeric,
+)
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.config.constants import INSTRUMENT_ASSET, MONEY_PRECISION, MONEY_SCALE
+from src.repositories.abstract import AbstractAssetRepo
+from src.repositories.positions import (
+    PostgresPositionRepo,
+    position_trade,
+    minor_units,
+)
+from src.database.db import DatabaseSession
+from src.database.models import Asset, Transaction, Account, Position
+from src.schemas.assets import AssetToBuy, AssetToSell
+from src.schemas.transactions import TransactionIn
+
+assets_table = Asset.__table__
+
+
+class PostgresAssetRepo(AbstractAssetRepo):
+
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+        self.position_repo = PostgresPositionRepo(db)
+
+    async def get_asset_by_id(self, asset_id: int) -> Asset | None:
+        result = await self.db.scalars(
+            select(Asset)
+            .options(joinedload(Asset.transactions))
+            .where(Asset.id == asset_id)
+        )
+        return result.unique().first()
+
+    async def get_assets(self, account_id: int) -> list[Asset]:
+        result = await self.db.scalars(
+            select(Asset)
+            .options(selectinload(Asset.transactions))
+            .where(
+                Asset.id.in_(
+                    select(Transaction.asset_id).where(
+                        Transaction.account_id == account_id
+                    )
+                )
+            )
+            .order_by(Asset.id)
+        )
+        return result.all()
+
+    async def create_asset(
+        self,
+        transaction_in: TransactionIn,
+        asset_to_buy: AssetToBuy,
+        account: Account,
+    ) -> Asset:
+        if transaction_in.type != "INVESTMENT":
+            raise ValueError("Invalid transaction type")
+        account.balance_investable_funds -= transaction_in.amount
+        new_asset = Asset(
+            asset_name=asset_to_buy.asset_name,
+            purchase_share_price=asset_to_buy.purchase_share_price,
+            share_quantity=asset_to_buy.share_quantity,
+            current_share_quantity=asset_to_buy.share_quantity,
+            transactions=[
+                Transaction(
+                    account_id=transaction_in.account_id,
+                    amount=transaction_in.amount,
+                    type=transaction_in.type,
+                    note=transaction_in.note,
+                )
+            ],
+        )
+        self.db.add(new_asset)
+        await self.position_repo.apply_trades(
+            [position_trade(transaction_in, asset_to_buy)]
+        )
+        await self.db.commit()
+        return new_asset
+
+    async def get_position(
+        self, account_id: int, asset_name: str, for_update: bool = False
+    ) -> tuple | None:
+        """
+        Get the shares of an asset held in an account.
+
+        Args:
+            account_id (int): id of the account
+            asset_name (str): name of the asset
+            for_update (bool): lock the position until the transaction ends
+
+        Returns:
+            tuple | None: (quantity, cost_basis), cost_basis is an integer number
+                of minor units; None if the account never held the asset
+        """
+        statement = select(Position.quantity, minor_units(Position.cost_basis)).where(
+            Position.account_id == account_id,
+            Position.instrument_type == INSTRUMENT_ASSET,
+            Position.instrument == asset_name,
+        )
+        if for_update:
+            statement = statement.with_for_update()
+        result = await self.db.execute(statement)
+        return result.first()
+
+    async def get_open_lots(
+        self, account_id: int, asset_name: str, quantity: float
+    ) -> list[tuple]:
+        """
+        Get the oldest purchases of an asset with shares left, only as many as
+        it takes to cover a quantity.
+
+        Args:
+            account_id (int): id of the account
+            asset_name (str): name of the asset
+            quantity (float): shares to cover
+
+        Returns:
+            list[tuple]: rows of (asset_id, share_quantity, current_share_quantity,
+                purchase_share_price), oldest first
+        """
+        shares_before = func.coalesce(
+            func.sum(Asset.current_share_quantity).over(
+                order_by=(Transaction.created_at, Asset.id), rows=(None, -1)
+            ),
+            0,
+        )
+        lots = (
+            select(
+                Asset.id,
+                Asset.share_quantity,
+                Asset.current_share_quantity,
+                Asset.purchase_share_price,
+                shares_before.label("shares_before"),
+            )
+            .join(Transaction, Transaction.asset_id == Asset.id)
+            .where(
+                Transaction.account_id == account_id,
+                Transaction.type == "INVESTMENT",
+                Asset.asset_name == asset_name,
+                Asset.current_share_quantity > 0,
+            )
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                lots.c.id,
+                lots.c.share_quantity,
+                lots.c.current_share_quantity,
+                lots.c.purchase_share_price,
+            )
+            .where(lots.c.shares_before < quantity)
+            .order_by(lots.c.shares_before)
+        )
+        return result.all()
+
+    async def add_sale(
+        self,
+        transaction_in: TransactionIn,
+        asset_to_sell: AssetToSell,
+        account: Account,
+        lots: list[tuple[int, float]],
+        cost_basis: Decimal,
+        realized_pnl: Decimal,
+    ) -> Asset:
+        """
+        Write a sale, the shares left in the purchases it was matched against
+        and the position it closes, and commit them.
+
+        Args:
+            transaction_in (TransactionIn): the sale, its amount is credited to the account
+            asset_to_sell (AssetToSell): asset, price and shares sold
+            account (Account): account selling the shares
+            lots (list[tuple]): (asset_id, shares left) of every purchase matched
+            cost_basis (Decimal): cost of the sold shares
+            realized_pnl (Decimal): profit or loss of the sale
+
+        Returns:
+            Asset: the sale
+        """
+        if transaction_in.type != "WITHDRAW":
+            raise ValueError("Invalid transaction type")
+        account.balance_investable_funds += transaction_in.amount
+        if lots:
+            await self.db.execute(
+                update(assets_table)
+                .where(assets_table.c.id == bindparam("lot_id"))
+                .values(current_share_quantity=bindparam("shares_left")),
+                [
+                    {"lot_id": lot_id, "shares_left": shares_left}
+                    for lot_id, shares_left in lots
+                ],
+            )
+        new_asset = Asset(
+            asset_name=asset_to_sell.asset_name,
+            purchase_share_price=asset_to_sell.share_price,
+            share_quantity=asset_to_sell.share_quantity,
+            current_share_quantity=0.0,
+            realized_pnl=realized_pnl,
+            transactions=[
+                Transaction(
+                    account_id=transaction_in.account_id,
+                    amount=transaction_in.amount,
+                    type=transaction_in.type,
+                    note=transaction_in.note,
+                )
+            ],
+        )
+        self.db.add(new_asset)
+        await self.position_repo.apply_trades(
+            [
+                (
+                    transaction_in.account_id,
+                    INSTRUMENT_ASSET,
+                    asset_to_sell.asset_name,
+                    -asset_to_sell.share_quantity,
+                    -cost_basis,
+                )
+            ]
+        )
+        await self.db.commit()
+        return new_asset
+
+    async def get_asset_trades(
+        self, account_id: int, for_update: bool = False
+    ) -> list[tuple]:
+        """
+        Get every purchase and sale of assets of an account, oldest first.
+
+        Args:
+            account_id (int): id of the account
+            for_update (bool): lock the account first, so no trade is written
+                until the transaction ends
+
+        Returns:
+            list[tuple]: rows of (asset_id, asset_name, type, share_quantity,
+                purchase_share_price)
+        """
+        if for_update:
+            await self.db.execute(
+                select(Account.id).where(Account.id == account_id).with_for_update()
+            )
+        result = await self.db.execute(
+            select(
+                Asset.id,
+                Asset.asset_name,
+                Transaction.type,
+                Asset.share_quantity,
+                Asset.purchase_share_price,
+            )
+            .join(Transaction, Transaction.asset_id == Asset.id)
+            .where(Transaction.account_id == account_id)
+            .order_by(Transaction.created_at, Asset.id)
+        )
+        return result.all()
+
+    async def replace_lots(self, account_id: int, lots: list[tuple]) -> int:
+        """
+        Write the shares left and the realized profit of many purchases and
+        sales with one UPDATE ... FROM (VALUES ...) statement, rebuild the
+        positions of the account and commit them.
+
+        Args:
+            account_id (int): id of the account
+            lots (list[tuple]): rows of (asset_id, current_share_quantity,
+                realized_pnl), realized_pnl is None for a purchase
+
+        Returns:
+            int: number of updated assets
+        """
+        updated = 0
+        if lots:
+            rows = values(
+                column("id", Integer),
+                column("current_share_quantity", Float),
+                column("realized_pnl", Numeric(MONEY_PRECISION, MONEY_SCALE)),
+                name="lots",
+            ).data(lots)
+            result = await self.db.execute(
+                update(Asset)
+                .where(Asset.id == rows.c.id)
+                .values(
+                    current_share_quantity=rows.c.current_share_quantity,
+                    realized_pnl=rows.c.realized_pnl,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            updated = result.rowcount
+        await self.position_repo.rebuild_positions([account_id])
+        return updated
@@ -1,57 +1,79 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.repositories.abstract import AbstractCurrencyInvestRepo
+from src.repositories.positions import PostgresPositionRepo, position_trade
+from src.database.db import DatabaseSession
 from src.database.models import CurrencyInvest, Transaction, Account
 from src.schemas.currency_invests import CurrencyInvestToBuy
+from src.schemas.money import apply_rate
 from src.schemas.transactions import TransactionIn
 
 
 class PostgresCurrencyInvestRepo(AbstractCurrencyInvestRepo):
 
-    def __init__(self, db: Session):
+    def __init__(self, db: DatabaseSession):
         self.db = db
+        self.position_repo = PostgresPositionRepo(db)
 
     async def get_currency_invest_by_id(
         self, currency_invest_id: int
-    ) -> CurrencyInvest:
-        return (
-            self.db.query(CurrencyInvest)
-            .filter(CurrencyInvest.id == currency_invest_id)
-            .first()
+    ) -> CurrencyInvest | None:
+        # a single row, its transactions come with it in one joined query
+        result = await self.db.scalars(
+            select(CurrencyInvest)
+            .options(joinedload(CurrencyInvest.transactions))
+            .where(CurrencyInvest.id == currency_invest_id)
+        )
+        return result.unique().first()
+
+    async def get_currency_invests(self, account_id: int) -> list[CurrencyInvest]:
+        # many rows, the transactions of all of them are loaded by one more
+        # query instead of one query per currency invest
+        result = await self.db.scalars(
+            select(CurrencyInvest)
+            .options(selectinload(CurrencyInvest.transactions))
+            .where(
+                CurrencyInvest.id.in_(
+                    select(Transaction.currency_invest_id).where(
+                        Transaction.account_id == account_id
+                    )
+                )
+            )
+            .order_by(CurrencyInvest.id)
         )
+        return result.all()
 
     async def create_currency_invest(
-        self, transaction_in: TransactionIn, currency_invest_to_buy: CurrencyInvestToBuy
+        self,
+        transaction_in: TransactionIn,
+        currency_invest_to_buy: CurrencyInvestToBuy,
+        account: Account,
     ) -> CurrencyInvest:
-        new_currency_invest = CurrencyInvest(
-            currency=currency_invest_to_buy.currency,
-            purchase_exchange_rate=currency_invest_to_buy.purchase_exchange_rate,
-            current_amount=currency_invest_to_buy.purchase_exchange_rate
-            * transaction_in.amount,
-        )
-        self.db.add(new_currency_invest)
-        self.db.commit()
-        self.db.refresh(new_currency_invest)
-        new_transaction = Transaction(
-            account_id=transaction_in.account_id,
-            currency_invest_id=new_currency_invest.id,
-            amount=transaction_in.amount,
-            type=transaction_in.type,
-            note=transaction_in.note,
-        )
-        self.db.add(new_transaction)
-        self.db.commit()
-        self.db.refresh(new_currency_invest)
-        account = (
-            self.db.query(Account)
-            .filter(Account.id == transaction_in.account_id)
-            .first()
-        )
         if transaction_in.type == "INVESTMENT":
             account.balance_investable_funds -= transaction_in.amount
         elif transaction_in.type == "WITHDRAW":
             account.balance_investable_funds += transaction_in.amount
         else:
             raise ValueError("Invalid transaction type")
-        self.db.commit()
+        new_currency_invest = CurrencyInvest(
+            currency=currency_invest_to_buy.currency,
+            purchase_exchange_rate=currency_invest_to_buy.purchase_exchange_rate,
+            current_amount=apply_rate(
+                transaction_in.amount, currency_invest_to_buy.purchase_exchange_rate
+            ),
+            transactions=[
+                Transaction(
+                    account_id=transaction_in.account_id,
+                    amount=transaction_in.amount,
+                    type=transaction_in.type,
+                    note=transaction_in.note,
+                )
+            ],
+        )
+        self.db.add(new_currency_invest)
+        await self.position_repo.apply_trades(
+            [position_trade(transaction_in, currency_invest_to_buy)]
+        )
+        await self.db.commit()
         return new_currency_invest
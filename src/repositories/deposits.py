@@ -0,0 +1,178 @@
+from datetime import date
+
+from sqlalchemy import (
+    select,
+    update,
+    values,
+    column,
+    case,
+    cast,
+    func,
+    or_,
+    and_,
+    Integer,
+    Numeric,
+    Date,
+)
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.config.constants import MONEY_PRECISION, MONEY_SCALE
+from src.repositories.abstract import AbstractDepositRepo
+from src.repositories.positions import (
+    PostgresPositionRepo,
+    position_trade,
+    minor_units,
+)
+from src.database.db import DatabaseSession
+from src.database.models import Deposit, Transaction, Account
+from src.schemas.deposits import DepositIn
+from src.schemas.transactions import TransactionIn
+
+
+class PostgresDepositRepo(AbstractDepositRepo):
+
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+        self.position_repo = PostgresPositionRepo(db)
+
+    async def get_deposit_by_id(self, deposit_id: int) -> Deposit | None:
+        result = await self.db.scalars(
+            select(Deposit)
+            .options(joinedload(Deposit.transactions))
+            .where(Deposit.id == deposit_id)
+        )
+        return result.unique().first()
+
+    async def get_deposits(self, account_id: int) -> list[Deposit]:
+        result = await self.db.scalars(
+            select(Deposit)
+            .options(selectinload(Deposit.transactions))
+            .where(
+                Deposit.id.in_(
+                    select(Transaction.deposit_id).where(
+                        Transaction.account_id == account_id
+                    )
+                )
+            )
+            .order_by(Deposit.id)
+        )
+        return result.all()
+
+    async def create_deposit(
+        self,
+        transaction_in: TransactionIn,
+        deposit_in: DepositIn,
+        account: Account,
+    ) -> Deposit:
+        if transaction_in.type != "INVESTMENT":
+            raise ValueError("Invalid transaction type")
+        account.balance_investable_funds -= transaction_in.amount
+        new_deposit = Deposit(
+            interest_rate=deposit_in.interest_rate,
+            maturity_date=deposit_in.maturity_date,
+            compounding=deposit_in.compounding.value,
+            transactions=[
+                Transaction(
+                    account_id=transaction_in.account_id,
+                    amount=transaction_in.amount,
+                    type=transaction_in.type,
+                    note=transaction_in.note,
+                )
+            ],
+        )
+        self.db.add(new_deposit)
+        # the position of a deposit is keyed by its id
+        await self.db.flush()
+        await self.position_repo.apply_trades(
+            [position_trade(transaction_in, new_deposit)]
+        )
+        await self.db.commit()
+        return new_deposit
+
+    async def get_accrual_terms(
+        self,
+        account_id: int | None = None,
+        after_id: int = 0,
+        limit: int | None = None,
+        due_on: date | None = None,
+    ) -> list[tuple]:
+        """
+        Get what the interest of deposits is computed from, in id order.
+
+        Args:
+            account_id (int | None): only the deposits of this account
+            after_id (int): id of the last deposit of the previous batch, 0 for the first
+            limit (int | None): maximum number of deposits
+            due_on (date | None): only the deposits not yet accrued up to this day
+                or their maturity, whichever comes first
+
+        Returns:
+            list[tuple]: rows of (deposit_id, principal, interest_rate, compounding,
+                opened_at, maturity_date); principal is an integer number of minor
+                units and opened_at is the time of the first transaction
+        """
+        sign = case((Transaction.type == "WITHDRAW", -1), else_=1)
+        statement = (
+            select(
+                Deposit.id,
+                func.sum(minor_units(Transaction.amount) * sign),
+                Deposit.interest_rate,
+                Deposit.compounding,
+                func.min(Transaction.created_at),
+                Deposit.maturity_date,
+            )
+            .join(Transaction, Transaction.deposit_id == Deposit.id)
+            .where(Deposit.id > after_id)
+            .group_by(Deposit.id)
+            .order_by(Deposit.id)
+        )
+        if account_id is not None:
+            statement = statement.where(Transaction.account_id == account_id)
+        if due_on is not None:
+            statement = statement.where(
+                or_(
+                    Deposit.accrued_on.is_(None),
+                    and_(
+                        Deposit.accrued_on < due_on,
+                        Deposit.accrued_on < cast(Deposit.maturity_date, Date),
+                    ),
+                )
+            )
+        if limit is not None:
+            statement = statement.limit(limit)
+        result = await self.db.execute(statement)
+        return result.all()
+
+    async def update_accruals(self, accruals: list[tuple]) -> int:
+        """
+        Write the accrued interest of many deposits with one
+        WITH ... AS (VALUES ...) UPDATE ... FROM statement and commit it.
+
+        Args:
+            accruals (list[tuple]): rows of (deposit_id, accrued_interest, accrued_on)
+
+        Returns:
+            int: number of written accruals
+        """
+        if not accruals:
+            return 0
+        rows = values(
+            column("id", Integer),
+            column("accrued_interest", Numeric(MONEY_PRECISION, MONEY_SCALE)),
+            column("accrued_on", Date),
+            name="accruals",
+        )
+        # a named VALUES list runs on SQLite too, unlike an aliased subquery
+        rows = rows.data(accruals).cte("accruals")
+        await self.db.execute(
+            update(Deposit)
+            .where(Deposit.id == rows.c.id)
+            .values(
+                accrued_interest=rows.c.accrued_interest,
+                accrued_on=rows.c.accrued_on,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        # SQLite does not count the rows of a statement starting with WITH
+        return len(accruals)
@@ -0,0 +1,38 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.repositories.abstract import AbstractExchangeRateRepo
+from src.database.db import DatabaseSession
+from src.database.models import ExchangeRate
+
+
+class PostgresExchangeRateRepo(AbstractExchangeRateRepo):
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+
+    async def get_rate(self, base: str, quote: str, day: date) -> float | None:
+        return await self.db.scalar(
+            select(ExchangeRate.rate).where(
+                ExchangeRate.base == base,
+                ExchangeRate.quote == quote,
+                ExchangeRate.day == day,
+            )
+        )
+
+    async def add_rate(self, base: str, quote: str, day: date, rate: float) -> None:
+        statement = insert(ExchangeRate).values(
+            base=base, quote=quote, day=day, rate=rate
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    ExchangeRate.base,
+                    ExchangeRate.quote,
+                    ExchangeRate.day,
+                ],
+                set_={"rate": statement.excluded.rate},
+            )
+        )
+        await self.db.commit()
@@ -0,0 +1,288 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    select,
+    delete,
+    union_all,
+    case,
+    cast,
+    and_,
+    literal,
+    func,
+    String,
+    Float,
+    Numeric,
+    BigInteger,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from src.repositories.abstract import AbstractPositionRepo
+from src.database.db import DatabaseSession
+from src.database.models import (
+    Account,
+    Transaction,
+    CurrencyInvest,
+    Asset,
+    Deposit,
+    Position,
+)
+from src.config.constants import (
+    INSTRUMENT_CURRENCY,
+    INSTRUMENT_ASSET,
+    INSTRUMENT_DEPOSIT,
+    MONEY_SCALE,
+    MINOR_UNITS,
+)
+from src.schemas.assets import AssetToBuy
+from src.schemas.currency_invests import CurrencyInvestToBuy
+from src.schemas.money import apply_rate, to_money
+from src.schemas.transactions import TransactionIn
+
+
+def minor_units(amount):
+    return cast(func.round(amount * MINOR_UNITS), BigInteger)
+
+
+def valued_positions():
+    """
+    Select positions with the interest accrued on deposits by the last accrual
+    run added to their quantity, so a deposit is valued at its balance.
+
+    Returns:
+        Select: rows of (account_id, instrument_type, instrument,
+            quantity, cost_basis); cost_basis is an integer number of minor units
+    """
+    return select(
+        Position.account_id,
+        Position.instrument_type,
+        Position.instrument,
+        Position.quantity + func.coalesce(cast(Deposit.accrued_interest, Float), 0),
+        minor_units(Position.cost_basis),
+    ).outerjoin(
+        Deposit,
+        and_(
+            Position.instrument_type == INSTRUMENT_DEPOSIT,
+            Position.instrument == cast(Deposit.id, String),
+        ),
+    )
+
+
+def position_trade(
+    transaction: TransactionIn, instrument: CurrencyInvestToBuy | AssetToBuy | Deposit
+) -> tuple:
+    """
+    Change of a position made by a currency trade, an asset purchase or a deposit;
+    asset sales are matched against lots and make their own change.
+
+    Args:
+        transaction (TransactionIn): the trade
+        instrument (CurrencyInvestToBuy | AssetToBuy | Deposit): currency or asset
+            traded, or the deposit opened, after it was given an id
+
+    Returns:
+        tuple: (account_id, instrument_type, instrument, quantity, cost_basis)
+            as taken by apply_trades
+    """
+    if isinstance(instrument, AssetToBuy):
+        return (
+            transaction.account_id,
+            INSTRUMENT_ASSET,
+            instrument.asset_name,
+            instrument.share_quantity,
+            to_money(
+                instrument.purchase_share_price
+                * Decimal(str(instrument.share_quantity))
+            ),
+        )
+    if isinstance(instrument, Deposit):
+        return (
+            transaction.account_id,
+            INSTRUMENT_DEPOSIT,
+            str(instrument.id),
+            float(transaction.amount),
+            transaction.amount,
+        )
+    sign = -1 if transaction.type == "WITHDRAW" else 1
+    return (
+        transaction.account_id,
+        INSTRUMENT_CURRENCY,
+        instrument.currency,
+        sign * float(apply_rate(transaction.amount, instrument.purchase_exchange_rate)),
+        sign * transaction.amount,
+    )
+
+
+class PostgresPositionRepo(AbstractPositionRepo):
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+
+    async def get_positions(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[tuple]:
+        """
+        Get every position held in the accounts.
+
+        Args:
+            account_ids (list[int]): ids of the accounts
+            for_update (bool): lock the positions until the transaction ends,
+                in key order like apply_trades
+
+        Returns:
+            list[tuple]: rows of (account_id, instrument_type, instrument, quantity,
+                cost_basis) as returned by valued_positions, one per position
+        """
+        statement = valued_positions().where(Position.account_id.in_(account_ids))
+        if for_update:
+            statement = statement.order_by(
+                Position.account_id, Position.instrument_type, Position.instrument
+            ).with_for_update(of=Position)
+        result = await self.db.execute(statement)
+        return result.all()
+
+    async def apply_trades(self, trades: list[tuple]) -> None:
+        """
+        Add trades to the positions they change, without committing, so the
+        positions are written in the same transaction as the trades.
+
+        Trades of the same position are added up first and the positions are
+        upserted in key order, so concurrent writers lock them in the same order.
+
+        Args:
+            trades (list[tuple]): rows of (account_id, instrument_type, instrument,
+                quantity, cost_basis), negative for sales
+        """
+        changes: dict[tuple[int, str, str], list] = {}
+        for account_id, instrument_type, instrument, quantity, cost_basis in trades:
+            change = changes.setdefault(
+                (account_id, instrument_type, instrument), [0.0, Decimal(0)]
+            )
+            change[0] += quantity
+            change[1] += cost_basis
+        if not changes:
+            return
+        statement = insert(Position).values(last_trade_at=func.now())
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    Position.account_id,
+                    Position.instrument_type,
+                    Position.instrument,
+                ],
+                set_={
+                    "quantity": Position.quantity + statement.excluded.quantity,
+                    "cost_basis": Position.cost_basis + statement.excluded.cost_basis,
+                    "last_trade_at": statement.excluded.last_trade_at,
+                },
+            ),
+            [
+                {
+                    "account_id": account_id,
+                    "instrument_type": instrument_type,
+                    "instrument": instrument,
+                    "quantity": quantity,
+                    "cost_basis": cost_basis,
+                }
+                for (account_id, instrument_type, instrument), (
+                    quantity,
+                    cost_basis,
+                ) in sorted(changes.items())
+            ],
+        )
+
+    @staticmethod
+    def __trades(account_ids: list[int] | None):
+        transactions = select(Transaction)
+        if account_ids is not None:
+            transactions = transactions.where(Transaction.account_id.in_(account_ids))
+        transactions = transactions.subquery()
+        sign = case((transactions.c.type == "WITHDRAW", -1), else_=1)
+        currency_trades = select(
+            transactions.c.account_id,
+            literal(INSTRUMENT_CURRENCY, String).label("instrument_type"),
+            CurrencyInvest.currency.label("instrument"),
+            cast(CurrencyInvest.current_amount * sign, Float).label("quantity"),
+            (transactions.c.amount * sign).label("cost_basis"),
+            transactions.c.created_at,
+        ).join(CurrencyInvest, CurrencyInvest.id == transactions.c.currency_invest_id)
+        trade_amount = func.round(
+            Asset.purchase_share_price * cast(Asset.share_quantity, Numeric),
+            MONEY_SCALE,
+        )
+        # a sale takes out the cost of the shares sold, its amount less its profit
+        asset_trades = select(
+            transactions.c.account_id,
+            literal(INSTRUMENT_ASSET, String),
+            Asset.asset_name,
+            Asset.share_quantity * sign,
+            case(
+                (
+                    transactions.c.type == "WITHDRAW",
+                    Asset.realized_pnl - trade_amount,
+                ),
+                else_=trade_amount,
+            ),
+            transactions.c.created_at,
+        ).join(Asset, Asset.id == transactions.c.asset_id)
+        deposit_trades = (
+            select(
+                transactions.c.account_id,
+                literal(INSTRUMENT_DEPOSIT, String),
+                cast(Deposit.id, String),
+                cast(transactions.c.amount, Float),
+                transactions.c.amount,
+                transactions.c.created_at,
+            )
+            .join(Deposit, Deposit.id == transactions.c.deposit_id)
+            .where(transactions.c.type == "INVESTMENT")
+        )
+        return union_all(currency_trades, asset_trades, deposit_trades).subquery()
+
+    async def rebuild_positions(self, account_ids: list[int] | None = None) -> int:
+        """
+        Recompute positions from the transactions and commit them.
+
+        The accounts are locked first. Every trade updates the balance of its
+        account, so no trade can be written between reading the transactions
+        and replacing the positions.
+
+        Args:
+            account_ids (list[int] | None): accounts to rebuild, all if None
+
+        Returns:
+            int: number of positions written
+        """
+        accounts = select(Account.id).with_for_update()
+        if account_ids is not None:
+            accounts = accounts.where(Account.id.in_(account_ids))
+        await self.db.execute(accounts)
+        positions = delete(Position)
+        if account_ids is not None:
+            positions = positions.where(Position.account_id.in_(account_ids))
+        await self.db.execute(positions)
+        trades = self.__trades(account_ids)
+        result = await self.db.execute(
+            insert(Position).from_select(
+                [
+                    Position.account_id,
+                    Position.instrument_type,
+                    Position.instrument,
+                    Position.quantity,
+                    Position.cost_basis,
+                    Position.last_trade_at,
+                ],
+                select(
+                    trades.c.account_id,
+                    trades.c.instrument_type,
+                    trades.c.instrument,
+                    func.sum(trades.c.quantity),
+                    func.sum(trades.c.cost_basis),
+                    func.max(trades.c.created_at),
+                ).group_by(
+                    trades.c.account_id,
+                    trades.c.instrument_type,
+                    trades.c.instrument,
+                ),
+            )
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,96 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.repositories.abstract import AbstractSnapshotRepo
+from src.database.db import DatabaseSession
+from src.database.models import Account, AccountSnapshot
+
+
+class PostgresSnapshotRepo(AbstractSnapshotRepo):
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+
+    async def get_accounts(self, after_id: int, limit: int) -> list[Account]:
+        """
+        Get a batch of accounts in id order.
+
+        Args:
+            after_id (int): id of the last account of the previous batch, 0 for the first
+            limit (int): maximum number of accounts
+
+        Returns:
+            list[Account]: accounts with an id greater than after_id
+        """
+        accounts = await self.db.scalars(
+            select(Account)
+            .where(Account.id > after_id)
+            .order_by(Account.id)
+            .limit(limit)
+        )
+        return accounts.all()
+
+    async def add_snapshots(self, snapshots: list[dict]) -> None:
+        """
+        Write snapshots with one statement and commit them.
+
+        A snapshot replaces the one of the same account, interval and period
+        only if it was taken on the same or a later day.
+
+        Args:
+            snapshots (list[dict]): values of the AccountSnapshot columns
+        """
+        if not snapshots:
+            return
+        statement = insert(AccountSnapshot)
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    AccountSnapshot.account_id,
+                    AccountSnapshot.interval,
+                    AccountSnapshot.period_start,
+                ],
+                set_={
+                    "day": statement.excluded.day,
+                    "cash": statement.excluded.cash,
+                    "cost_basis": statement.excluded.cost_basis,
+                    "positions_value": statement.excluded.positions_value,
+                },
+                where=AccountSnapshot.day <= statement.excluded.day,
+            ),
+            snapshots,
+        )
+        await self.db.commit()
+
+    async def get_snapshots(
+        self,
+        account_id: int,
+        interval: str,
+        period_from: date | None = None,
+        period_to: date | None = None,
+    ) -> list[AccountSnapshot]:
+        """
+        Get the snapshots of an account at one interval, oldest first.
+
+        Args:
+            account_id (int): id of the account
+            interval (str): day, week or month
+            period_from (date | None): first day of the first period
+            period_to (date | None): first day of the last period
+
+        Returns:
+            list[AccountSnapshot]: one snapshot per period
+        """
+        statement = select(AccountSnapshot).where(
+            AccountSnapshot.account_id == account_id,
+            AccountSnapshot.interval == interval,
+        )
+        if period_from is not None:
+            statement = statement.where(AccountSnapshot.period_start >= period_from)
+        if period_to is not None:
+            statement = statement.where(AccountSnapshot.period_start <= period_to)
+        snapshots = await self.db.scalars(
+            statement.order_by(AccountSnapshot.period_start)
+        )
+        return snapshots.all()
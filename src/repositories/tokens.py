@@ -1,71 +1,93 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import select, delete, insert, func, literal, String, DateTime, Integer
+
 from src.repositories.abstract import AbstractTokenRepo
-from src.database.models import RefreshToken
+from src.database.db import DatabaseSession
+from src.database.models import RefreshToken, User
 from src.config.constants import MAX_ACTIVE_SESSIONS
 
 
 class PostgresTokenRepo(AbstractTokenRepo):
-    def __init__(self, db):
+    def __init__(self, db: DatabaseSession):
         self.db = db
 
     async def add_refresh_token(
         self, refresh_token: str, user_id: int, session_id: str, expires_at: datetime
     ) -> bool:
-        await self.remove_expired_refresh_tokens(user_id)
+        # logins of the same user are serialized on the user row, otherwise two
+        # of them could both count the sessions before either inserts
+        await self.db.execute(
+            select(User.id).where(User.id == user_id).with_for_update()
+        )
         user_logged_sessions = (
-            self.db.query(RefreshToken).filter(RefreshToken.user_id == user_id).all()
+            select(func.count())
+            .select_from(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.expires_at >= datetime.now(timezone.utc),
+            )
+            .scalar_subquery()
         )
-        if (
-            len(user_logged_sessions) >= MAX_ACTIVE_SESSIONS
-        ):  # because user can have limited number of sessions
-            return False
-        new_refresh_token = RefreshToken(
-            token=refresh_token,
-            user_id=user_id,
-            session_id=session_id,
-            expires_at=expires_at,
+        # because user can have limited number of sessions, the row is inserted
+        # only if the limit is not reached - count and insert in one statement
+        result = await self.db.execute(
+            insert(RefreshToken).from_select(
+                ["token", "user_id", "session_id", "expires_at"],
+                select(
+                    literal(refresh_token, String),
+                    literal(user_id, Integer),
+                    literal(session_id, String),
+                    literal(expires_at, DateTime(timezone=True)),
+                ).where(user_logged_sessions < MAX_ACTIVE_SESSIONS),
+            )
         )
-        self.db.add(new_refresh_token)
-        self.db.commit()
-        return True
+        await self.db.commit()
+        return result.rowcount == 1
 
     async def get_refresh_token(self, refresh_token: str) -> RefreshToken | None:
-        return (
-            self.db.query(RefreshToken)
-            .filter(RefreshToken.token == refresh_token)
-            .first()
+        return await self.db.scalar(
+            select(RefreshToken).where(RefreshToken.token == refresh_token)
         )
-        
+
     async def get_refresh_tokens(self, user_id: int) -> list[RefreshToken]:
         return (
-            self.db.query(RefreshToken)
-            .filter(RefreshToken.user_id == user_id)
-            .all()
-        )
+            await self.db.scalars(
+                select(RefreshToken).where(RefreshToken.user_id == user_id)
+            )
+        ).all()
 
     async def delete_refresh_token(
         self, refresh_token: str = None, user_id: int = None, session_id: str = None
     ) -> None:
         if refresh_token:
-            self.db.query(RefreshToken).filter(
-                RefreshToken.token == refresh_token
-            ).delete()
+            await self.db.execute(
+                delete(RefreshToken).where(RefreshToken.token == refresh_token)
+            )
         elif user_id and session_id:
-            tokens_to_delete = self.db.query(RefreshToken).filter(
-                RefreshToken.user_id == user_id, RefreshToken.session_id == session_id
-            ).all()
-            if tokens_to_delete:
-                for token in tokens_to_delete:
-                    self.db.delete(token)
+            await self.db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.user_id == user_id,
+                    RefreshToken.session_id == session_id,
+                )
+            )
         else:
             raise ValueError(
                 "Either refresh_token or user_id and session_id must be provided"
             )
-        self.db.commit()
-        await self.remove_expired_refresh_tokens(user_id)
+        await self.db.commit()
 
-    async def remove_expired_refresh_tokens(self, user_id: int) -> None:
-        self.db.query(RefreshToken).filter(
-            RefreshToken.expires_at < datetime.now(timezone.utc)
-        ).delete()
+    async def remove_expired_refresh_tokens(self, batch_size: int) -> int:
+        expired_tokens = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < datetime.now(timezone.utc))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(expired_tokens))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
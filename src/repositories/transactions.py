@@ -0,0 +1,341 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator
+
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    bindparam,
+    tuple_,
+    or_,
+    case,
+    cast,
+    func,
+    String,
+)
+
+from src.repositories.abstract import AbstractTransactionRepo
+from src.repositories.positions import (
+    PostgresPositionRepo,
+    position_trade,
+    minor_units,
+)
+from src.database.db import DatabaseSession
+from src.database.models import Account, Asset, CurrencyInvest, Transaction
+from src.schemas.assets import AssetToBuy
+from src.schemas.currency_invests import CurrencyInvestToBuy
+from src.schemas.money import apply_rate
+from src.schemas.transactions import TransactionIn
+from src.config.constants import (
+    INSTRUMENT_CURRENCY,
+    INSTRUMENT_ASSET,
+    INSTRUMENT_DEPOSIT,
+)
+
+accounts_table = Account.__table__
+
+INSTRUMENT_COLUMNS = {
+    INSTRUMENT_CURRENCY: Transaction.currency_invest_id,
+    INSTRUMENT_ASSET: Transaction.asset_id,
+    INSTRUMENT_DEPOSIT: Transaction.deposit_id,
+}
+
+
+class PostgresTransactionRepo(AbstractTransactionRepo):
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+        self.position_repo = PostgresPositionRepo(db)
+
+    async def get_accounts(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[Account]:
+        statement = select(Account).where(Account.id.in_(account_ids))
+        if for_update:
+            # reload balances already in the session, they may have changed
+            # before the lock was taken
+            statement = statement.with_for_update().execution_options(
+                populate_existing=True
+            )
+        return (await self.db.scalars(statement)).all()
+
+    async def get_positions(
+        self, account_ids: list[int], for_update: bool = False
+    ) -> list[tuple]:
+        """
+        Get every position held in the accounts.
+
+        Args:
+            account_ids (list[int]): ids of the accounts
+            for_update (bool): lock the positions until the transaction ends
+
+        Returns:
+            list[tuple]: rows of (account_id, instrument_type, instrument, quantity,
+                cost_basis) as returned by PostgresPositionRepo.get_positions
+        """
+        return await self.position_repo.get_positions(account_ids, for_update)
+
+    async def __insert_returning_ids(self, model, rows: list[dict]) -> list[int]:
+        if not rows:
+            return []
+        return (
+            await self.db.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True), rows
+            )
+        ).all()
+
+    async def add_transactions(
+        self,
+        transactions: list[tuple[TransactionIn, CurrencyInvestToBuy | AssetToBuy]],
+    ) -> list[int]:
+        """
+        Create currency and asset transactions with one INSERT per table and one
+        balance UPDATE per account, committed together. Without transactions the
+        transaction is rolled back, so the locks taken to check them are released.
+
+        Args:
+            transactions (list[tuple]): transactions with the currency or asset they buy or sell
+
+        Returns:
+            list[int]: ids of the created transactions, in the order of the items
+        """
+        if not transactions:
+            await self.db.rollback()
+            return []
+        currency_invest_ids = iter(
+            await self.__insert_returning_ids(
+                CurrencyInvest,
+                [
+                    {
+                        "currency": instrument.currency,
+                        "purchase_exchange_rate": instrument.purchase_exchange_rate,
+                        "current_amount": apply_rate(
+                            transaction.amount, instrument.purchase_exchange_rate
+                        ),
+                    }
+                    for transaction, instrument in transactions
+                    if isinstance(instrument, CurrencyInvestToBuy)
+                ],
+            )
+        )
+        asset_ids = iter(
+            await self.__insert_returning_ids(
+                Asset,
+                [
+                    {
+                        "asset_name": instrument.asset_name,
+                        "purchase_share_price": instrument.purchase_share_price,
+                        "share_quantity": instrument.share_quantity,
+                        "current_share_quantity": instrument.share_quantity,
+                    }
+                    for _, instrument in transactions
+                    if isinstance(instrument, AssetToBuy)
+                ],
+            )
+        )
+        transaction_ids = await self.__insert_returning_ids(
+            Transaction,
+            [
+                {
+                    "account_id": transaction.account_id,
+                    "currency_invest_id": (
+                        next(currency_invest_ids)
+                        if isinstance(instrument, CurrencyInvestToBuy)
+                        else None
+                    ),
+                    "asset_id": (
+                        next(asset_ids) if isinstance(instrument, AssetToBuy) else None
+                    ),
+                    "amount": transaction.amount,
+                    "type": transaction.type.value,
+                    "note": transaction.note,
+                }
+                for transaction, instrument in transactions
+            ],
+        )
+        balance_changes: dict[int, Decimal] = {}
+        for transaction, _ in transactions:
+            change = (
+                -transaction.amount
+                if transaction.type == "INVESTMENT"
+                else transaction.amount
+            )
+            balance_changes[transaction.account_id] = (
+                balance_changes.get(transaction.account_id, Decimal(0)) + change
+            )
+        await self.db.execute(
+            update(accounts_table)
+            .where(accounts_table.c.id == bindparam("changed_account_id"))
+            .values(
+                balance_investable_funds=accounts_table.c.balance_investable_funds
+                + bindparam("balance_change")
+            ),
+            [
+                {"changed_account_id": account_id, "balance_change": change}
+                for account_id, change in balance_changes.items()
+            ],
+        )
+        await self.position_repo.apply_trades(
+            [
+                position_trade(transaction, instrument)
+                for transaction, instrument in transactions
+            ]
+        )
+        await self.db.commit()
+        return transaction_ids
+
+    async def get_transactions_page(
+        self,
+        account_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        transaction_type: str | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        instrument_type: str | None = None,
+        instrument: str | None = None,
+    ) -> list[Transaction]:
+        """
+        Get a page of an account's transactions, newest first.
+
+        The page starts right after the (created_at, id) of the last row of the
+        previous page, so every page is one range scan of the
+        (account_id, created_at, id) index, however deep it is.
+
+        Args:
+            account_id (int): id of the account
+            limit (int): maximum number of transactions
+            after (tuple[datetime, int] | None): created_at and id of the last transaction of the previous page
+            transaction_type (str | None): only transactions of this type
+            date_from (datetime | None): only transactions created at or after this time
+            date_to (datetime | None): only transactions created before this time
+            instrument_type (str | None): only transactions of this instrument type
+            instrument (str | None): only transactions of this currency code or asset name
+
+        Returns:
+            list[Transaction]: transactions on the page
+        """
+        statement = select(Transaction).where(Transaction.account_id == account_id)
+        if after is not None:
+            statement = statement.where(
+                tuple_(Transaction.created_at, Transaction.id) < tuple_(*after)
+            )
+        if transaction_type is not None:
+            statement = statement.where(Transaction.type == transaction_type)
+        if date_from is not None:
+            statement = statement.where(Transaction.created_at >= date_from)
+        if date_to is not None:
+            statement = statement.where(Transaction.created_at < date_to)
+        if instrument_type is not None:
+            statement = statement.where(
+                INSTRUMENT_COLUMNS[instrument_type].is_not(None)
+            )
+        if instrument is not None:
+            statement = (
+                statement.outerjoin(
+                    CurrencyInvest, CurrencyInvest.id == Transaction.currency_invest_id
+                )
+                .outerjoin(Asset, Asset.id == Transaction.asset_id)
+                .where(
+                    or_(
+                        CurrencyInvest.currency == instrument,
+                        Asset.asset_name == instrument,
+                    )
+                )
+            )
+        statement = statement.order_by(
+            Transaction.created_at.desc(), Transaction.id.desc()
+        ).limit(limit)
+        return (await self.db.scalars(statement)).all()
+
+    async def stream_transactions(
+        self, account_id: int, batch_size: int
+    ) -> AsyncIterator[list[tuple]]:
+        """
+        Read the transactions of an account through a server-side cursor.
+
+        Args:
+            account_id (int): id of the account
+            batch_size (int): rows fetched from the cursor at once
+
+        Yields:
+            list[tuple]: rows of TRANSACTION_EXPORT_COLUMNS, oldest first
+        """
+        result = await self.db.stream(
+            select(
+                Transaction.id,
+                Transaction.created_at,
+                Transaction.type,
+                Transaction.amount,
+                Transaction.note,
+                CurrencyInvest.currency,
+                Asset.asset_name,
+                Transaction.currency_invest_id,
+                Transaction.asset_id,
+                Transaction.deposit_id,
+            )
+            .outerjoin(
+                CurrencyInvest, CurrencyInvest.id == Transaction.currency_invest_id
+            )
+            .outerjoin(Asset, Asset.id == Transaction.asset_id)
+            .where(Transaction.account_id == account_id)
+            .order_by(Transaction.created_at, Transaction.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_latest_transaction_id(self, account_id: int) -> int | None:
+        """
+        Get the id of the newest transaction of an account, read from the end
+        of the (account_id, created_at, id) index.
+
+        Args:
+            account_id (int): id of the account
+
+        Returns:
+            int | None: id of the transaction, None if the account has none
+        """
+        return await self.db.scalar(
+            select(Transaction.id)
+            .where(Transaction.account_id == account_id)
+            .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            .limit(1)
+        )
+
+    async def get_cash_flows(self, account_id: int) -> list[tuple]:
+        """
+        Get the money moved into and out of the instruments of an account.
+
+        Args:
+            account_id (int): id of the account
+
+        Returns:
+            list[tuple]: rows of (instrument_type, instrument, invested, created_at),
+                oldest first; invested is an integer number of minor units,
+                positive for an investment and negative for a withdrawal
+        """
+        sign = case((Transaction.type == "WITHDRAW", -1), else_=1)
+        result = await self.db.execute(
+            select(
+                case(
+                    (Transaction.currency_invest_id.is_not(None), INSTRUMENT_CURRENCY),
+                    (Transaction.asset_id.is_not(None), INSTRUMENT_ASSET),
+                    else_=INSTRUMENT_DEPOSIT,
+                ),
+                func.coalesce(
+                    CurrencyInvest.currency,
+                    Asset.asset_name,
+                    cast(Transaction.deposit_id, String),
+                ),
+                minor_units(Transaction.amount) * sign,
+                Transaction.created_at,
+            )
+            .outerjoin(
+                CurrencyInvest, CurrencyInvest.id == Transaction.currency_invest_id
+            )
+            .outerjoin(Asset, Asset.id == Transaction.asset_id)
+            .where(Transaction.account_id == account_id)
+            .order_by(Transaction.created_at, Transaction.id)
+        )
+        return result.all()
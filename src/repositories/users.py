@@ -1,22 +1,23 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
 from src.repositories.abstract import AbstractUserRepo
+from src.database.db import DatabaseSession
 from src.database.models import User
 from src.schemas.users import UserIn
 
 
 class PostgresUserRepo(AbstractUserRepo):
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: DatabaseSession) -> None:
         self.db = db
 
     async def get_user_by_email(self, email: str) -> User | None:
-        return self.db.query(User).filter(User.email == email).first()
+        return await self.db.scalar(select(User).where(User.email == email))
 
     async def get_user_by_username(self, username: str) -> User | None:
-        return self.db.query(User).filter(User.username == username).first()
+        return await self.db.scalar(select(User).where(User.username == username))
 
     async def get_user_by_id(self, user_id: int) -> User | None:
-        return self.db.query(User).filter(User.id == user_id).first()
+        return await self.db.scalar(select(User).where(User.id == user_id))
 
     async def create_user(self, user: UserIn) -> User:
         new_user = User(
@@ -25,21 +26,21 @@ class PostgresUserRepo(AbstractUserRepo):
             password=user.password,
         )
         self.db.add(new_user)
-        self.db.commit()
-        self.db.refresh(new_user)
+        await self.db.commit()
+        await self.db.refresh(new_user)
         return new_user
 
     async def confirm_user_email(self, email: str) -> None:
         user = await self.get_user_by_email(email)
         if user:
             user.is_confirmed = True
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
 
     async def update_password(self, user: User) -> User:
         db_user = await self.get_user_by_email(user.email)
         if db_user:
             db_user.password = user.password
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return db_user
@@ -1,12 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import binascii
+from datetime import date, datetime
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 
-from src.config.constants import ACCOUNTS
-from src.schemas.accounts import AccountIn, AccountOut, AccountInfo, AccountFunds
-from src.database.models import User, Account
+from src.config.constants import ACCOUNTS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.schemas.accounts import (
+    AccountIn,
+    AccountOut,
+    AccountInfo,
+    AccountFunds,
+    CurrencyEnum,
+)
+from src.database.models import Account
+from src.schemas.users import CachedUser
+from src.schemas.valuations import (
+    AccountValuationOut,
+    AccountsSummaryOut,
+    InstrumentTypeEnum,
+    AccountHistoryOut,
+    AccountSnapshotOut,
+    SnapshotIntervalEnum,
+)
+from src.schemas.performance import AccountPerformanceOut
+from src.schemas.transactions import (
+    ExportFormatEnum,
+    TransactionOut,
+    TransactionPageOut,
+    TransactionTypeEnum,
+)
 from src.services.auth import auth_service
-from src.repositories.abstract import AbstractAccountRepo
-from src.database.dependencies import get_account_repo
+from src.repositories.abstract import (
+    AbstractAccountRepo,
+    AbstractTransactionRepo,
+    AbstractSnapshotRepo,
+)
+from src.database.dependencies import (
+    get_account_repo,
+    get_transaction_repo,
+    get_snapshot_repo,
+)
+from src.services.valuation import valuation_engine
+from src.services.cross_rates import cross_rate_matrix
+from src.services.transaction_export import transaction_exporter
+from src.services.snapshots import period_start
+from src.services.performance import performance_service
 
 
 router = APIRouter(prefix=ACCOUNTS, tags=["accounts"])
@@ -30,10 +71,27 @@ async def __check_authorization(account_user_id: int, current_user_id: int) -> N
         )
 
 
+def __encode_cursor(created_at: datetime, transaction_id: int) -> str:
+    return base64.urlsafe_b64encode(
+        orjson.dumps([created_at.isoformat(), transaction_id])
+    ).decode("ascii")
+
+
+def __decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, transaction_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
 @router.post("/", response_model=AccountInfo, status_code=status.HTTP_201_CREATED)
 async def create_account(
     account_info: AccountIn,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> AccountInfo:
     accounts = await account_repo.get_accounts(current_user.id)
@@ -53,33 +111,193 @@ async def create_account(
 
 @router.get("/", response_model=list[AccountOut])
 async def get_accounts(
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> list[AccountOut]:
     accounts = await account_repo.get_accounts(current_user.id)
     return [AccountOut.model_validate(account) for account in accounts]
 
 
+@router.get("/summary", response_model=AccountsSummaryOut)
+async def get_accounts_summary(
+    base: CurrencyEnum,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+) -> AccountsSummaryOut:
+    accounts = await account_repo.get_accounts(current_user.id)
+    positions = await account_repo.get_positions(current_user.id)
+    cross_rates = await cross_rate_matrix.get()
+    return valuation_engine.summarize(accounts, positions, cross_rates, base.value)
+
+
 @router.get("/{account_id}", response_model=AccountOut)
 async def get_account(
     account_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> AccountOut:
     account = await __get_account(account_id, account_repo)
-    __check_authorization(account.user_id, current_user.id)
+    await __check_authorization(account.user_id, current_user.id)
     return AccountOut.model_validate(account)
 
 
+@router.get("/{account_id}/valuation", response_model=AccountValuationOut)
+async def get_account_valuation(
+    account_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+) -> AccountValuationOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    positions = await account_repo.get_positions(current_user.id, account_id)
+    cross_rates = await cross_rate_matrix.get()
+    return valuation_engine.value_accounts(
+        [account], positions, cross_rates=cross_rates
+    )[0]
+
+
+@router.get("/{account_id}/history", response_model=AccountHistoryOut)
+async def get_account_history(
+    account_id: int,
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    interval: SnapshotIntervalEnum = SnapshotIntervalEnum.DAY,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    snapshot_repo: AbstractSnapshotRepo = Depends(get_snapshot_repo),
+) -> AccountHistoryOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from must not be later than to",
+        )
+    # the periods containing from and to are included
+    snapshots = await snapshot_repo.get_snapshots(
+        account_id,
+        interval.value,
+        period_from=(
+            period_start(date_from, interval.value) if date_from is not None else None
+        ),
+        period_to=(
+            period_start(date_to, interval.value) if date_to is not None else None
+        ),
+    )
+    return AccountHistoryOut(
+        account_id=account.id,
+        currency=account.currency,
+        interval=interval,
+        points=[
+            AccountSnapshotOut(
+                period_start=snapshot.period_start,
+                day=snapshot.day,
+                cash=snapshot.cash,
+                cost_basis=snapshot.cost_basis,
+                positions_value=snapshot.positions_value,
+                market_value=snapshot.cash + snapshot.positions_value,
+            )
+            for snapshot in snapshots
+        ],
+    )
+
+
+@router.get("/{account_id}/performance", response_model=AccountPerformanceOut)
+async def get_account_performance(
+    account_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    transaction_repo: AbstractTransactionRepo = Depends(get_transaction_repo),
+    snapshot_repo: AbstractSnapshotRepo = Depends(get_snapshot_repo),
+) -> AccountPerformanceOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    return await performance_service.get_account_performance(
+        account, account_repo, transaction_repo, snapshot_repo
+    )
+
+
+@router.get("/{account_id}/transactions", response_model=TransactionPageOut)
+async def get_transactions(
+    account_id: int,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    type: TransactionTypeEnum | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    instrument_type: InstrumentTypeEnum | None = None,
+    instrument: str | None = Query(default=None, max_length=10),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    transaction_repo: AbstractTransactionRepo = Depends(get_transaction_repo),
+) -> TransactionPageOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    transactions = await transaction_repo.get_transactions_page(
+        account_id,
+        limit + 1,
+        after=__decode_cursor(cursor) if cursor is not None else None,
+        transaction_type=type.value if type is not None else None,
+        date_from=date_from,
+        date_to=date_to,
+        instrument_type=instrument_type.value if instrument_type is not None else None,
+        instrument=instrument,
+    )
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = __encode_cursor(transactions[-1].created_at, transactions[-1].id)
+    return TransactionPageOut(
+        items=[
+            TransactionOut.model_validate(transaction) for transaction in transactions
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{account_id}/transactions/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                media_type: {}
+                for media_type in transaction_exporter.MEDIA_TYPES.values()
+            }
+        }
+    },
+)
+async def export_transactions(
+    account_id: int,
+    format: ExportFormatEnum = ExportFormatEnum.CSV,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+) -> StreamingResponse:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    if not transaction_exporter.is_available(format):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Export to {format.value} is not available on this server",
+        )
+    return StreamingResponse(
+        transaction_exporter.export(account_id, format),
+        media_type=transaction_exporter.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="account_{account_id}_transactions.{format.value}"'
+        },
+    )
+
+
 @router.post("/{account_id}/deposit", response_model=AccountInfo)
 async def deposit_funds(
     amount_funds: AccountFunds,
     account_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> AccountInfo:
     account = await __get_account(account_id, account_repo)
-    __check_authorization(account.user_id, current_user.id)
+    await __check_authorization(account.user_id, current_user.id)
     account = await account_repo.update_funds(
         account_id, amount_funds.balance_investable_funds
     )
@@ -93,11 +311,11 @@ async def deposit_funds(
 async def withdraw_funds(
     amount_funds: AccountFunds,
     account_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> AccountInfo:
     account = await __get_account(account_id, account_repo)
-    __check_authorization(account.user_id, current_user.id)
+    await __check_authorization(account.user_id, current_user.id)
     if account.balance_investable_funds < amount_funds.balance_investable_funds:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -115,11 +333,11 @@ async def withdraw_funds(
 @router.delete("/{account_id}", response_model=AccountInfo)
 async def delete_account(
     account_id: int,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
 ) -> AccountInfo:
     account = await __get_account(account_id, account_repo)
-    __check_authorization(account.user_id, current_user.id)
+    await __check_authorization(account.user_id, current_user.id)
     if account.balance_investable_funds != 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,157 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.config.constants import ASSETS
+from src.schemas.assets import (
+    AssetToBuy,
+    AssetToSell,
+    AssetOut,
+    AssetInfo,
+    AssetSaleInfo,
+    CostMethodEnum,
+    LotsRecomputeOut,
+)
+from src.schemas.money import to_money
+from src.schemas.transactions import TransactionIn
+from src.services.auth import auth_service
+from src.services.lots import lot_service
+from src.database.models import Account
+from src.schemas.users import CachedUser
+from src.repositories.abstract import AbstractAccountRepo, AbstractAssetRepo
+from src.database.dependencies import get_account_repo, get_asset_repo
+
+router = APIRouter(prefix=ASSETS, tags=["assets"])
+
+
+async def __get_account(account_id: int, account_repo: AbstractAccountRepo) -> Account:
+    account = await account_repo.get_account_by_id(account_id)
+    if account is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found",
+        )
+    return account
+
+
+async def __check_authorization(account_user_id: int, current_user_id: int) -> None:
+    if account_user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action",
+        )
+
+
+async def __check_amount(
+    amount: Decimal, share_price: Decimal, share_quantity: float
+) -> None:
+    # lots, positions and profits are all computed from price times quantity
+    if amount != to_money(share_price * Decimal(str(share_quantity))):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Amount must equal share price times share quantity",
+        )
+
+
+@router.post(
+    "/",
+    response_model=AssetInfo,
+    status_code=status.HTTP_201_CREATED,
+)
+async def buy_asset(
+    transaction_in: TransactionIn,
+    asset: AssetToBuy,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    asset_repo: AbstractAssetRepo = Depends(get_asset_repo),
+) -> AssetInfo:
+    account = await __get_account(transaction_in.account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    if transaction_in.type != "INVESTMENT":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A purchase must be an investment",
+        )
+    await __check_amount(
+        transaction_in.amount, asset.purchase_share_price, asset.share_quantity
+    )
+    if account.balance_investable_funds < transaction_in.amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient funds",
+        )
+    new_asset = await asset_repo.create_asset(transaction_in, asset, account)
+    return AssetInfo(
+        asset=AssetOut.model_validate(new_asset),
+        detail="Asset bought successfully",
+    )
+
+
+@router.post(
+    "/sell",
+    response_model=AssetSaleInfo,
+    status_code=status.HTTP_201_CREATED,
+)
+async def sell_asset(
+    transaction_in: TransactionIn,
+    asset: AssetToSell,
+    method: CostMethodEnum = Query(default=CostMethodEnum.FIFO),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    asset_repo: AbstractAssetRepo = Depends(get_asset_repo),
+) -> AssetSaleInfo:
+    account = await __get_account(transaction_in.account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    if transaction_in.type != "WITHDRAW":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A sale must be a withdrawal",
+        )
+    await __check_amount(transaction_in.amount, asset.share_price, asset.share_quantity)
+    return await lot_service.sell_asset(
+        transaction_in, asset, account, method, asset_repo
+    )
+
+
+@router.post("/recompute", response_model=LotsRecomputeOut)
+async def recompute_lots(
+    account_id: int,
+    method: CostMethodEnum = Query(default=CostMethodEnum.FIFO),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    asset_repo: AbstractAssetRepo = Depends(get_asset_repo),
+) -> LotsRecomputeOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    return await lot_service.recompute_lots(account_id, method, asset_repo)
+
+
+@router.get("/", response_model=list[AssetOut])
+async def get_assets(
+    account_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    asset_repo: AbstractAssetRepo = Depends(get_asset_repo),
+) -> list[AssetOut]:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    assets = await asset_repo.get_assets(account_id)
+    return [AssetOut.model_validate(asset) for asset in assets]
+
+
+@router.get("/{asset_id}", response_model=AssetOut)
+async def get_asset(
+    asset_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    asset_repo: AbstractAssetRepo = Depends(get_asset_repo),
+) -> AssetOut:
+    asset = await asset_repo.get_asset_by_id(asset_id)
+    if asset is None or not asset.transactions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Asset not found",
+        )
+    account = await __get_account(asset.transactions[0].account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    return AssetOut.model_validate(asset)
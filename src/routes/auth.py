@@ -18,7 +18,7 @@ from src.repositories.abstract import AbstractUserRepo, AbstractTokenRepo
 from src.database.dependencies import get_user_repo, get_token_repo
 from src.services.dependencies import get_password_handler, get_email_handler
 from src.services.auth import auth_service
-from src.schemas.users import UserIn, UserOut, UserInfo, ResetPassword
+from src.schemas.users import UserIn, UserOut, UserInfo, ResetPassword, CachedUser
 from src.schemas.email import RequestEmail
 from src.schemas.tokens import TokenOut
 from src.config.constants import AUTH, MAX_ACTIVE_SESSIONS
@@ -195,6 +195,9 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
+    if password_handler.needs_rehash(user.password):
+        user.password = await password_handler.hash_password(form_data.password)
+        user = await user_repo.update_password(user)
     parsed_user_agent = str(httpagentparser.detect(request.headers.get('user-agent')))
     await token_repo.delete_refresh_token(user_id=user.id, session_id=parsed_user_agent)
     return await __set_tokens(user, parsed_user_agent, token_repo)
@@ -227,7 +230,7 @@ async def refresh_token(
 
 @router.post("/logout", response_model=UserInfo)
 async def logout(
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     credentials: HTTPAuthorizationCredentials = Security(security),
     token_repo: AbstractTokenRepo = Depends(get_token_repo),
 ):
@@ -10,7 +10,9 @@ from src.schemas.currency_invests import (
 )
 from src.schemas.transactions import TransactionIn
 from src.services.auth import auth_service
-from src.database.models import User, Account
+from src.services.rates import rate_service
+from src.database.models import Account
+from src.schemas.users import CachedUser
 from src.repositories.abstract import AbstractAccountRepo, AbstractCurrencyInvestRepo
 from src.database.dependencies import get_account_repo, get_currency_invest_repo
 
@@ -43,7 +45,7 @@ async def __check_authorization(account_user_id: int, current_user_id: int) -> N
 async def create_currency_invest(
     transaction_in: TransactionIn,
     currency_invest: CurrencyInvestIn,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
     account_repo: AbstractAccountRepo = Depends(get_account_repo),
     currency_invest_repo: AbstractCurrencyInvestRepo = Depends(
         get_currency_invest_repo
@@ -56,14 +58,64 @@ async def create_currency_invest(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient funds",
         )
+    purchase_exchange_rate = await rate_service.get_rate(
+        account.currency, currency_invest.currency
+    )
+    if purchase_exchange_rate is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Exchange rate is not available, please try again later",
+        )
     currency_invest_to_buy = CurrencyInvestToBuy(
         currency=currency_invest.currency,
-        purchase_exchange_rate=2,
+        purchase_exchange_rate=purchase_exchange_rate,
     )
     new_currency_invest = await currency_invest_repo.create_currency_invest(
-        transaction_in, currency_invest_to_buy
+        transaction_in, currency_invest_to_buy, account
     )
     return CurrencyInvestInfo(
         currency_invest=CurrencyInvestOut.model_validate(new_currency_invest),
         detail="Currency invest created successfully",
     )
+
+
+@router.get("/", response_model=list[CurrencyInvestOut])
+async def get_currency_invests(
+    account_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    currency_invest_repo: AbstractCurrencyInvestRepo = Depends(
+        get_currency_invest_repo
+    ),
+) -> list[CurrencyInvestOut]:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    currency_invests = await currency_invest_repo.get_currency_invests(account_id)
+    return [
+        CurrencyInvestOut.model_validate(currency_invest)
+        for currency_invest in currency_invests
+    ]
+
+
+@router.get("/{currency_invest_id}", response_model=CurrencyInvestOut)
+async def get_currency_invest(
+    currency_invest_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    currency_invest_repo: AbstractCurrencyInvestRepo = Depends(
+        get_currency_invest_repo
+    ),
+) -> CurrencyInvestOut:
+    currency_invest = await currency_invest_repo.get_currency_invest_by_id(
+        currency_invest_id
+    )
+    if currency_invest is None or not currency_invest.transactions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Currency invest not found",
+        )
+    account = await __get_account(
+        currency_invest.transactions[0].account_id, account_repo
+    )
+    await __check_authorization(account.user_id, current_user.id)
+    return CurrencyInvestOut.model_validate(currency_invest)
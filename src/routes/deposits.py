@@ -0,0 +1,119 @@
+from datetime import date, datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.config.constants import DEPOSITS
+from src.schemas.deposits import DepositIn, DepositOut, DepositInfo, DepositsValueOut
+from src.schemas.transactions import TransactionIn
+from src.services.auth import auth_service
+from src.services.deposits import accrual_engine
+from src.database.models import Account
+from src.schemas.users import CachedUser
+from src.repositories.abstract import AbstractAccountRepo, AbstractDepositRepo
+from src.database.dependencies import get_account_repo, get_deposit_repo
+
+router = APIRouter(prefix=DEPOSITS, tags=["deposits"])
+
+
+async def __get_account(account_id: int, account_repo: AbstractAccountRepo) -> Account:
+    account = await account_repo.get_account_by_id(account_id)
+    if account is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found",
+        )
+    return account
+
+
+async def __check_authorization(account_user_id: int, current_user_id: int) -> None:
+    if account_user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action",
+        )
+
+
+@router.post(
+    "/",
+    response_model=DepositInfo,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_deposit(
+    transaction_in: TransactionIn,
+    deposit: DepositIn,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    deposit_repo: AbstractDepositRepo = Depends(get_deposit_repo),
+) -> DepositInfo:
+    account = await __get_account(transaction_in.account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    if transaction_in.type != "INVESTMENT":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A deposit can only be opened with an investment",
+        )
+    maturity_date = deposit.maturity_date
+    if maturity_date.tzinfo is None:
+        maturity_date = maturity_date.replace(tzinfo=timezone.utc)
+    if maturity_date <= datetime.now(timezone.utc):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maturity date must be in the future",
+        )
+    if account.balance_investable_funds < transaction_in.amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient funds",
+        )
+    new_deposit = await deposit_repo.create_deposit(transaction_in, deposit, account)
+    return DepositInfo(
+        deposit=DepositOut.model_validate(new_deposit),
+        detail="Deposit created successfully",
+    )
+
+
+@router.get("/", response_model=list[DepositOut])
+async def get_deposits(
+    account_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    deposit_repo: AbstractDepositRepo = Depends(get_deposit_repo),
+) -> list[DepositOut]:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    deposits = await deposit_repo.get_deposits(account_id)
+    return [DepositOut.model_validate(deposit) for deposit in deposits]
+
+
+@router.get("/value", response_model=DepositsValueOut)
+async def get_deposits_value(
+    account_id: int,
+    day: date | None = Query(default=None),
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    deposit_repo: AbstractDepositRepo = Depends(get_deposit_repo),
+) -> DepositsValueOut:
+    account = await __get_account(account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    terms = await deposit_repo.get_accrual_terms(account_id=account_id)
+    return accrual_engine.value_deposits(
+        account_id, terms, day or datetime.now(timezone.utc).date()
+    )
+
+
+@router.get("/{deposit_id}", response_model=DepositOut)
+async def get_deposit(
+    deposit_id: int,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    account_repo: AbstractAccountRepo = Depends(get_account_repo),
+    deposit_repo: AbstractDepositRepo = Depends(get_deposit_repo),
+) -> DepositOut:
+    deposit = await deposit_repo.get_deposit_by_id(deposit_id)
+    if deposit is None or not deposit.transactions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deposit not found",
+        )
+    account = await __get_account(deposit.transactions[0].account_id, account_repo)
+    await __check_authorization(account.user_id, current_user.id)
+    return DepositOut.model_validate(deposit)
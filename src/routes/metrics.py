@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.config.config import settings
+from src.config.constants import METRICS
+from src.schemas.metrics import (
+    PoolMetricsOut,
+    CacheMetricsOut,
+    TokenReaperMetricsOut,
+    RateMetricsOut,
+    SnapshotMetricsOut,
+    AccrualMetricsOut,
+)
+from src.schemas.users import CachedUser
+from src.database.db import get_pool
+from src.database.pool_metrics import pool_metrics
+from src.database.dependencies import cache
+from src.services.auth import auth_service
+from src.services.token_reaper import token_reaper
+from src.services.rates import rate_service
+from src.services.snapshots import snapshot_writer
+from src.services.deposits import accrual_writer
+
+router = APIRouter(prefix=METRICS, tags=["metrics"])
+
+
+async def __get_ops_user(
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+) -> CachedUser:
+    if current_user.email not in settings.metrics_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action",
+        )
+    return current_user
+
+
+@router.get("/pool", response_model=PoolMetricsOut)
+async def get_pool_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> PoolMetricsOut:
+    return PoolMetricsOut(**pool_metrics.snapshot(get_pool()))
+
+
+@router.get("/cache", response_model=CacheMetricsOut)
+async def get_cache_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> CacheMetricsOut:
+    return CacheMetricsOut(**cache.stats())
+
+
+@router.get("/token_reaper", response_model=TokenReaperMetricsOut)
+async def get_token_reaper_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> TokenReaperMetricsOut:
+    return TokenReaperMetricsOut(**token_reaper.stats())
+
+
+@router.get("/rates", response_model=RateMetricsOut)
+async def get_rate_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> RateMetricsOut:
+    return RateMetricsOut(**rate_service.stats())
+
+
+@router.get("/snapshots", response_model=SnapshotMetricsOut)
+async def get_snapshot_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> SnapshotMetricsOut:
+    return SnapshotMetricsOut(**snapshot_writer.stats())
+
+
+@router.get("/accruals", response_model=AccrualMetricsOut)
+async def get_accrual_metrics(
+    current_user: CachedUser = Depends(__get_ops_user),
+) -> AccrualMetricsOut:
+    return AccrualMetricsOut(**accrual_writer.stats())
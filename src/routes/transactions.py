@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from src.config.constants import TRANSACTIONS
+from src.schemas.transactions import (
+    BulkTransactionsIn,
+    BulkTransactionsOut,
+    ImportFormatEnum,
+    ImportJobOut,
+)
+from src.schemas.users import CachedUser
+from src.services.auth import auth_service
+from src.services.transaction_import import transaction_importer, import_jobs
+from src.repositories.abstract import AbstractTransactionRepo
+from src.database.dependencies import get_transaction_repo
+
+router = APIRouter(prefix=TRANSACTIONS, tags=["transactions"])
+
+
+@router.post("/bulk", response_model=BulkTransactionsOut)
+async def create_transactions_bulk(
+    bulk_transactions: BulkTransactionsIn,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+    transaction_repo: AbstractTransactionRepo = Depends(get_transaction_repo),
+) -> BulkTransactionsOut:
+    return await transaction_importer.import_transactions(
+        bulk_transactions.transactions, current_user.id, transaction_repo
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ImportJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_transactions(
+    request: Request,
+    format: ImportFormatEnum = ImportFormatEnum.CSV,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+) -> ImportJobOut:
+    job = await import_jobs.start(current_user.id, format, request.stream())
+    return ImportJobOut.model_validate(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobOut)
+async def get_import_job(
+    job_id: str,
+    current_user: CachedUser = Depends(auth_service.get_current_user),
+) -> ImportJobOut:
+    job = await import_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+    return job
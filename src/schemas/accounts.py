@@ -1,8 +1,11 @@
 from enum import Enum
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+from src.schemas.money import Money
+
 class CurrencyEnum(str, Enum):
     PLN = "PLN"
     EUR = "EUR"
@@ -10,21 +13,19 @@ class CurrencyEnum(str, Enum):
 
 class AccountIn(BaseModel):
     currency: CurrencyEnum
-    balance_investable_funds: float = Field(default=0.00, ge=0, description="Balance of investable funds in the account must be greater than or equal to 0.00")
+    balance_investable_funds: Money = Field(default=Decimal("0.00"), ge=0, description="Balance of investable funds in the account must be greater than or equal to 0.00")
     
     @field_validator("balance_investable_funds")
     def validate_balance_investable_funds(cls, value):
         if value < 0.00:
             raise ValueError("Balance of investable funds in the account must be greater than or equal to 0.00")
-        if round(value, 2) != value:
-            raise ValueError("Balance of investable funds in the account must be a float with 2 decimal places")
         return value
     
 
 class AccountOut(BaseModel):
     id: int
     user_id: int
-    balance_investable_funds: float
+    balance_investable_funds: Money
     currency: CurrencyEnum
     created_at: datetime
     # TODO add transactions 
@@ -39,12 +40,10 @@ class AccountInfo(BaseModel):
     
     
 class AccountFunds(BaseModel):
-    balance_investable_funds: float = Field(default=0.00, ge=0, description="Balance of investable funds in the account must be greater than or equal to 0.00")
+    balance_investable_funds: Money = Field(default=Decimal("0.00"), ge=0, description="Balance of investable funds in the account must be greater than or equal to 0.00")
     
     @field_validator("balance_investable_funds")
     def validate_balance_investable_funds(cls, value):
         if value < 0.00:
             raise ValueError("Balance of investable funds in the account must be greater than or equal to 0.00")
-        if round(value, 2) != value:
-            raise ValueError("Balance of investable funds in the account must be a float with 2 decimal places")
         return value
\ No newline at end of file
@@ -1,24 +1,45 @@
 from datetime import datetime
+from enum import Enum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
+from src.schemas.money import Money, Price
 from src.schemas.transactions import TransactionOut
 
 
+class CostMethodEnum(str, Enum):
+    FIFO = "fifo"
+    AVERAGE = "average"
+
+
 class AssetIn(BaseModel):
-    asset_name: str
+    asset_name: str = Field(max_length=10)
 
 
 class AssetToBuy(AssetIn):
-    purchase_share_price: float
-    share_quantity: float
+    purchase_share_price: Price = Field(gt=0)
+    share_quantity: float = Field(gt=0)
+
+
+class AssetToSell(AssetIn):
+    """
+    Schema for a sale of shares
+
+    Attributes:
+        asset_name (str): name of the asset
+        share_price (Decimal): price of one share
+        share_quantity (float): number of shares sold
+    """
+
+    share_price: Price = Field(gt=0)
+    share_quantity: float = Field(gt=0)
 
 
 class AssetOut(AssetToBuy):
     id: int
-    account_id: int
     purchase_date: datetime
     current_share_quantity: float
+    realized_pnl: Money | None
     transactions: list[TransactionOut]
 
     model_config = ConfigDict(from_attributes=True)
@@ -27,3 +48,60 @@ class AssetOut(AssetToBuy):
 class AssetInfo(BaseModel):
     asset: AssetOut
     detail: str
+
+
+class LotMatchOut(BaseModel):
+    """
+    Schema for the part of a purchase matched by a sale
+
+    Attributes:
+        asset_id (int): id of the purchase
+        share_quantity (float): shares of the purchase sold
+        current_share_quantity (float): shares of the purchase left after the sale
+    """
+
+    asset_id: int
+    share_quantity: float
+    current_share_quantity: float
+
+
+class AssetSaleInfo(BaseModel):
+    """
+    Schema for a sale of shares, all amounts in the account currency
+
+    Attributes:
+        asset (AssetOut): the sale
+        method (CostMethodEnum): how the cost of the sold shares was computed
+        cost_basis (Decimal): cost of the sold shares
+        realized_pnl (Decimal): proceeds of the sale minus cost_basis
+        lots (list[LotMatchOut]): purchases the shares were taken from, oldest first
+        detail (str): message
+    """
+
+    asset: AssetOut
+    method: CostMethodEnum
+    cost_basis: Money
+    realized_pnl: Money
+    lots: list[LotMatchOut]
+    detail: str
+
+
+class LotsRecomputeOut(BaseModel):
+    """
+    Schema for the result of recomputing the lots of an account
+
+    Attributes:
+        account_id (int): id of the account
+        method (CostMethodEnum): how the cost of sold shares was computed
+        purchases (int): purchases replayed
+        sales (int): sales replayed
+        open_lots (int): purchases with shares left
+        realized_pnl (Decimal): profit or loss of all sales
+    """
+
+    account_id: int
+    method: CostMethodEnum
+    purchases: int
+    sales: int
+    open_lots: int
+    realized_pnl: Money
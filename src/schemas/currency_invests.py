@@ -2,6 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from src.schemas.money import Money
 from src.schemas.transactions import TransactionOut
 
 
@@ -16,7 +17,7 @@ class CurrencyInvestToBuy(CurrencyInvestIn):
 class CurrencyInvestOut(CurrencyInvestToBuy):
     id: int
     purchase_date: datetime
-    current_amount: float
+    current_amount: Money
     transactions: list[TransactionOut]
 
     model_config = ConfigDict(from_attributes=True)
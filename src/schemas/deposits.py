@@ -1,18 +1,30 @@
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
+from src.schemas.money import Money
 from src.schemas.transactions import TransactionOut
 
 
+class CompoundingEnum(str, Enum):
+    SIMPLE = "simple"
+    DAILY = "daily"
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+    ANNUALLY = "annually"
+
+
 class DepositIn(BaseModel):
-    interest_rate: float
+    interest_rate: float = Field(ge=0)
     maturity_date: datetime
+    compounding: CompoundingEnum = CompoundingEnum.SIMPLE
 
 
 class DepositOut(DepositIn):
     id: int
-    account_id: int
+    accrued_interest: Money
+    accrued_on: date | None
     transactions: list[TransactionOut]
 
     model_config = ConfigDict(from_attributes=True)
@@ -21,3 +33,43 @@ class DepositOut(DepositIn):
 class DepositInfo(BaseModel):
     deposit: DepositOut
     detail: str
+
+
+class DepositValueOut(BaseModel):
+    """
+    Schema for the value of one deposit on a day, all amounts in the account currency
+
+    Attributes:
+        deposit_id (int): id of the deposit
+        principal (Decimal): money put into the deposit
+        accrued_interest (Decimal): interest accrued from the opening up to the day or the maturity
+        value (Decimal): principal with the accrued interest
+        matured (bool): whether the deposit matured on or before the day
+    """
+
+    deposit_id: int
+    principal: Money
+    accrued_interest: Money
+    value: Money
+    matured: bool
+
+
+class DepositsValueOut(BaseModel):
+    """
+    Schema for the value of the deposits of an account on a day
+
+    Attributes:
+        account_id (int): id of the account
+        day (date): day the deposits are valued on
+        principal (Decimal): money put into all deposits
+        accrued_interest (Decimal): interest accrued on all deposits
+        value (Decimal): principal with the accrued interest
+        deposits (list[DepositValueOut]): value of every deposit
+    """
+
+    account_id: int
+    day: date
+    principal: Money
+    accrued_interest: Money
+    value: Money
+    deposits: list[DepositValueOut]
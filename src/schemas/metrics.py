@@ -0,0 +1,152 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class PoolMetricsOut(BaseModel):
+    """
+    Schema for the database connection pool metrics
+
+    Attributes:
+        pool_size (int): configured number of pooled connections
+        checked_out (int): connections currently in use
+        checked_in (int): idle connections in the pool
+        overflow (int): connections open above pool size (negative while the pool is not full)
+        checkouts (int): successful checkouts since start
+        failures (int): failed checkouts since start
+        wait_time_avg (float): average wait for a connection in seconds
+        wait_time_max (float): longest wait for a connection in seconds
+    """
+
+    pool_size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    failures: int
+    wait_time_avg: float
+    wait_time_max: float
+
+
+class LocalCacheMetricsOut(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class RedisCacheMetricsOut(BaseModel):
+    hits: int
+    misses: int
+
+
+class PrefilterMetricsOut(BaseModel):
+    """
+    Schema for the Bloom prefilter metrics
+
+    Attributes:
+        prefix (str): key prefix covered by the filter
+        ready (bool): whether the filter is in sync with Redis
+        keys (int): keys added to the filter
+        size_bytes (int): memory used by the filter
+        bytes_per_key (float): memory per key added to the filter
+        skipped_lookups (int): lookups answered without the cache tiers
+        checked_lookups (int): lookups passed on to the cache tiers
+    """
+
+    prefix: str
+    ready: bool
+    keys: int
+    size_bytes: int
+    bytes_per_key: float
+    skipped_lookups: int
+    checked_lookups: int
+
+
+class CacheMetricsOut(BaseModel):
+    """
+    Schema for the cache metrics, one entry per cache tier
+
+    Attributes:
+        local (LocalCacheMetricsOut): in-process tier counters
+        redis (RedisCacheMetricsOut): Redis tier counters
+        prefilters (list[PrefilterMetricsOut]): Bloom prefilter counters and memory use
+    """
+
+    local: LocalCacheMetricsOut
+    redis: RedisCacheMetricsOut
+    prefilters: list[PrefilterMetricsOut]
+
+
+class TokenReaperMetricsOut(BaseModel):
+    """
+    Schema for the expired refresh token cleanup metrics
+
+    Attributes:
+        runs (int): number of finished runs
+        rows_purged (int): rows deleted since start
+        last_rows_purged (int): rows deleted in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    runs: int
+    rows_purged: int
+    last_rows_purged: int
+    last_duration: float
+    total_duration: float
+
+
+class SnapshotMetricsOut(BaseModel):
+    """
+    Schema for the account value snapshot job metrics
+
+    Attributes:
+        runs (int): number of finished runs
+        last_day (date | None): day of the last run
+        last_accounts (int): accounts snapshotted in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    runs: int
+    last_day: date | None
+    last_accounts: int
+    last_duration: float
+    total_duration: float
+
+
+class AccrualMetricsOut(BaseModel):
+    """
+    Schema for the deposit interest accrual job metrics
+
+    Attributes:
+        runs (int): number of finished runs
+        last_day (date | None): day of the last run
+        last_deposits (int): deposits accrued in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    runs: int
+    last_day: date | None
+    last_deposits: int
+    last_duration: float
+    total_duration: float
+
+
+class RateMetricsOut(BaseModel):
+    """
+    Schema for the exchange rate lookup metrics
+
+    Attributes:
+        lookups (int): number of rate lookups
+        coalesced_lookups (int): lookups served by a fetch already in flight
+        provider_calls (int): lookups passed on to the rate provider
+        in_flight (int): rate fetches currently running
+    """
+
+    lookups: int
+    coalesced_lookups: int
+    provider_calls: int
+    in_flight: int
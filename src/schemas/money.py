@@ -0,0 +1,73 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Annotated
+
+from pydantic import Field, PlainSerializer
+
+from src.config.constants import MONEY_PRECISION, MONEY_SCALE, PRICE_SCALE
+
+MINOR_UNIT = Decimal(1).scaleb(-MONEY_SCALE)
+
+# exact in validation and storage, a JSON number in responses
+Money = Annotated[
+    Decimal,
+    Field(max_digits=MONEY_PRECISION, decimal_places=MONEY_SCALE),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+Price = Annotated[
+    Decimal,
+    Field(max_digits=MONEY_PRECISION, decimal_places=PRICE_SCALE),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+
+def to_money(amount: Decimal | float | int) -> Decimal:
+    """
+    Round an amount to whole minor units, half to even.
+
+    Args:
+        amount (Decimal | float | int): amount to round
+
+    Returns:
+        Decimal: amount with MONEY_SCALE decimal places
+    """
+    return Decimal(str(amount)).quantize(MINOR_UNIT, rounding=ROUND_HALF_EVEN)
+
+
+def apply_rate(amount: Decimal, rate: float) -> Decimal:
+    """
+    Convert an amount with an exchange rate.
+
+    Args:
+        amount (Decimal): amount to convert
+        rate (float): exchange rate
+
+    Returns:
+        Decimal: converted amount rounded to whole minor units
+    """
+    return to_money(amount * Decimal(str(rate)))
+
+
+def to_minor_units(amount: Decimal | float | int) -> int:
+    """
+    Express an amount as an integer number of minor units.
+
+    Args:
+        amount (Decimal | float | int): amount in major units
+
+    Returns:
+        int: amount in minor units, e.g. cents
+    """
+    return int(to_money(amount).scaleb(MONEY_SCALE))
+
+
+def from_minor_units(amount: int) -> Decimal:
+    """
+    Express an integer number of minor units as an amount.
+
+    Args:
+        amount (int): amount in minor units
+
+    Returns:
+        Decimal: amount in major units with MONEY_SCALE decimal places
+    """
+    return Decimal(int(amount)).scaleb(-MONEY_SCALE)
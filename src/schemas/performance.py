@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+
+from src.schemas.accounts import CurrencyEnum
+from src.schemas.money import Money
+from src.schemas.valuations import InstrumentTypeEnum
+
+
+class InstrumentPerformanceOut(BaseModel):
+    """
+    Schema for the performance of one instrument, all amounts in the account currency
+
+    Attributes:
+        instrument_type (InstrumentTypeEnum): type of the instrument
+        instrument (str): currency code, asset name or deposit id
+        invested (Decimal): money put into the instrument minus money taken out
+        market_value (Decimal): current value of the held quantity
+        xirr (float | None): annualized money-weighted return, None if it has no solution
+    """
+
+    instrument_type: InstrumentTypeEnum
+    instrument: str
+    invested: Money
+    market_value: Money
+    xirr: float | None
+
+
+class AccountPerformanceOut(BaseModel):
+    """
+    Schema for the performance of the positions of an account, all amounts in
+    the account currency; returns are fractions, 0.05 is 5%
+
+    Attributes:
+        account_id (int): id of the account
+        currency (CurrencyEnum): currency of the account
+        invested (Decimal): money put into positions minus money taken out
+        positions_value (Decimal): current value of all positions
+        xirr (float | None): annualized money-weighted return, None if it has no solution
+        twr (float | None): time-weighted return over the daily snapshots, None with fewer than two
+        volatility (float | None): annualized standard deviation of the daily returns
+        max_drawdown (float | None): largest fall from a peak of the time-weighted return, 0 or negative
+        days (int): number of daily returns used by twr, volatility and max_drawdown
+        instruments (list[InstrumentPerformanceOut]): performance of every traded instrument
+    """
+
+    account_id: int
+    currency: CurrencyEnum
+    invested: Money
+    positions_value: Money
+    xirr: float | None
+    twr: float | None
+    volatility: float | None
+    max_drawdown: float | None
+    days: int
+    instruments: list[InstrumentPerformanceOut]
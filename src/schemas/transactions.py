@@ -1,10 +1,12 @@
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
 
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
-from src.config.constants import MAX_NOTE_LENGTH
+from src.config.constants import MAX_NOTE_LENGTH, MAX_BULK_TRANSACTIONS
+from src.schemas.money import Money, Price, to_money
 
 
 class TransactionTypeEnum(str, Enum):
@@ -14,7 +16,7 @@ class TransactionTypeEnum(str, Enum):
 
 class TransactionIn(BaseModel):
     account_id: int
-    amount: float
+    amount: Money = Field(gt=0)
     note: str | None = None
     type: TransactionTypeEnum
 
@@ -26,6 +28,7 @@ class TransactionIn(BaseModel):
 
 
 class TransactionOut(TransactionIn):
+    amount: Money  # stored rows are returned as they are
     id: int
     deposit_id: int | None
     asset_id: int | None
@@ -34,3 +37,145 @@ class TransactionOut(TransactionIn):
     updated_at: datetime | None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TransactionPageOut(BaseModel):
+    """
+    Schema for a page of transactions, newest first
+
+    Attributes:
+        items (list[TransactionOut]): transactions on the page
+        next_cursor (str | None): cursor of the next page, None on the last page
+    """
+
+    items: list[TransactionOut]
+    next_cursor: str | None
+
+
+class BulkTransactionIn(TransactionIn):
+    """
+    Schema for one currency purchase or sale in a bulk import
+
+    Attributes:
+        amount (Decimal): money paid or received, in the account currency
+        currency (str): currency bought or sold
+        purchase_exchange_rate (float | None): rate of the trade, the current rate if not given
+    """
+
+    amount: Money = Field(gt=0)
+    currency: str
+    purchase_exchange_rate: float | None = Field(default=None, gt=0)
+
+
+class BulkAssetTransactionIn(TransactionIn):
+    """
+    Schema for one asset purchase in a bulk import
+
+    Attributes:
+        amount (Decimal): money paid, in the account currency
+        asset_name (str): name of the asset
+        purchase_share_price (Decimal): price of one share
+        share_quantity (float): number of shares bought
+    """
+
+    amount: Money = Field(gt=0)
+    asset_name: str = Field(max_length=10)
+    purchase_share_price: Price = Field(gt=0)
+    share_quantity: float = Field(gt=0)
+
+    @field_validator("type")
+    def validate_type(cls, value):
+        if value != TransactionTypeEnum.INVESTMENT:
+            raise ValueError("Only asset purchases can be imported")
+        return value
+
+    @model_validator(mode="after")
+    def check_amount(self) -> "BulkAssetTransactionIn":
+        if self.amount != to_money(
+            self.purchase_share_price * Decimal(str(self.share_quantity))
+        ):
+            raise ValueError("Amount must equal share price times share quantity")
+        return self
+
+
+class BulkTransactionsIn(BaseModel):
+    """
+    Schema for a bulk import, every item is validated on its own as
+    BulkAssetTransactionIn if it has an asset_name, as BulkTransactionIn otherwise,
+    so one invalid item does not reject the others
+
+    Attributes:
+        transactions (list[dict]): items to import
+    """
+
+    transactions: list[dict] = Field(max_length=MAX_BULK_TRANSACTIONS)
+
+
+class BulkTransactionError(BaseModel):
+    """
+    Schema for an item rejected by a bulk import
+
+    Attributes:
+        index (int): position of the item in the request
+        detail (str): reason of the rejection
+    """
+
+    index: int
+    detail: str
+
+
+class BulkTransactionsOut(BaseModel):
+    """
+    Schema for the result of a bulk import
+
+    Attributes:
+        created (int): number of created transactions
+        transaction_ids (list[int | None]): id of the transaction created from every item, None for rejected items
+        errors (list[BulkTransactionError]): rejected items
+    """
+
+    created: int
+    transaction_ids: list[int | None]
+    errors: list[BulkTransactionError]
+
+
+class ImportFormatEnum(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportFormatEnum(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ImportJobOut(BaseModel):
+    """
+    Schema for the progress of a file import
+
+    Attributes:
+        id (str): id of the import job
+        format (ImportFormatEnum): format of the imported file
+        status (str): pending, running, finished or failed
+        rows_read (int): rows read from the file so far
+        rows_imported (int): rows written to the database so far
+        rows_rejected (int): rows rejected so far
+        errors (list[BulkTransactionError]): first rejected rows, index is the row number in the file
+        detail (str | None): reason of a failed import
+        created_at (datetime): date and time when the file was uploaded
+        finished_at (datetime | None): date and time when the import ended
+    """
+
+    id: str
+    format: ImportFormatEnum
+    status: str
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    errors: list[BulkTransactionError]
+    detail: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
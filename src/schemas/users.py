@@ -67,6 +67,24 @@ class UserOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CachedUser(BaseModel):
+    """
+    Authenticated user as kept in cache.
+
+    Same fields as UserOut, but the email is a plain string: it was validated
+    when the user signed up and is not validated again on every request.
+    """
+
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+    updated_at: datetime | None
+    is_confirmed: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserInfo(BaseModel):
     user: UserOut
     detail: str
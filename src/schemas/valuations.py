@@ -0,0 +1,132 @@
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+from src.schemas.accounts import CurrencyEnum
+from src.schemas.money import Money
+
+
+class InstrumentTypeEnum(str, Enum):
+    CURRENCY = "CURRENCY"
+    ASSET = "ASSET"
+    DEPOSIT = "DEPOSIT"
+
+
+class PositionValuationOut(BaseModel):
+    """
+    Schema for the valuation of one position, all amounts in the account currency
+
+    Attributes:
+        instrument_type (InstrumentTypeEnum): type of the instrument
+        instrument (str): currency code, asset name or deposit id
+        quantity (float): held quantity of the instrument
+        cost_basis (Decimal): purchase cost of the held quantity
+        market_value (Decimal): value of the held quantity at the current price
+        unrealized_pnl (Decimal): market value minus cost basis
+        priced (bool): whether a current price was available, if not the position is valued at cost
+    """
+
+    instrument_type: InstrumentTypeEnum
+    instrument: str
+    quantity: float
+    cost_basis: Money
+    market_value: Money
+    unrealized_pnl: Money
+    priced: bool
+
+
+class AccountValuationOut(BaseModel):
+    """
+    Schema for the valuation of an account, all amounts in the account currency
+
+    Attributes:
+        account_id (int): id of the account
+        currency (CurrencyEnum): currency of the account
+        cash (Decimal): balance of investable funds
+        cost_basis (Decimal): purchase cost of all positions
+        positions_value (Decimal): market value of all positions
+        unrealized_pnl (Decimal): positions value minus cost basis
+        market_value (Decimal): cash plus positions value
+        positions (list[PositionValuationOut]): valuation of every position
+    """
+
+    account_id: int
+    currency: CurrencyEnum
+    cash: Money
+    cost_basis: Money
+    positions_value: Money
+    unrealized_pnl: Money
+    market_value: Money
+    positions: list[PositionValuationOut]
+
+
+class AccountsSummaryOut(BaseModel):
+    """
+    Schema for the total of all accounts of a user in one currency
+
+    Attributes:
+        base (CurrencyEnum): currency of the totals
+        cash (Decimal): balance of investable funds of all accounts
+        cost_basis (Decimal): purchase cost of all positions
+        positions_value (Decimal): market value of all positions
+        unrealized_pnl (Decimal): positions value minus cost basis
+        market_value (Decimal): cash plus positions value
+        unconverted_account_ids (list[int]): accounts left out of the totals for lack of an exchange rate
+        accounts (list[AccountValuationOut]): valuation of every account in its own currency
+    """
+
+    base: CurrencyEnum
+    cash: Money
+    cost_basis: Money
+    positions_value: Money
+    unrealized_pnl: Money
+    market_value: Money
+    unconverted_account_ids: list[int]
+    accounts: list[AccountValuationOut]
+
+
+class SnapshotIntervalEnum(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AccountSnapshotOut(BaseModel):
+    """
+    Schema for one point of an account's history, all amounts in the account currency
+
+    Attributes:
+        period_start (date): first day of the day, week or month
+        day (date): day the values were taken on, the last snapshotted day of the period
+        cash (Decimal): balance of investable funds
+        cost_basis (Decimal): purchase cost of all positions
+        positions_value (Decimal): market value of all positions
+        market_value (Decimal): cash plus positions value
+    """
+
+    period_start: date
+    day: date
+    cash: Money
+    cost_basis: Money
+    positions_value: Money
+    market_value: Money
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AccountHistoryOut(BaseModel):
+    """
+    Schema for the value of an account over time
+
+    Attributes:
+        account_id (int): id of the account
+        currency (CurrencyEnum): currency of the account
+        interval (SnapshotIntervalEnum): length of the period of every point
+        points (list[AccountSnapshotOut]): one point per period, oldest first
+    """
+
+    account_id: int
+    currency: CurrencyEnum
+    interval: SnapshotIntervalEnum
+    points: list[AccountSnapshotOut]
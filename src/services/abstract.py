@@ -1,7 +1,8 @@
 import abc
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, date
 
 from src.database.models import User
+from src.schemas.users import CachedUser
 from src.repositories.abstract import AbstractUserRepo
 
 
@@ -36,6 +37,40 @@ class AbstractPasswordHandler(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check if hash was made with weaker parameters than the current ones
+
+        Args:
+            hashed_password (str): stored hashed password
+
+        Returns:
+            bool: True if password should be hashed again, False otherwise
+        """
+        pass
+
+
+class AbstractRateProvider(abc.ABC):
+    """
+    Abstract class for exchange rate provider
+    """
+
+    @abc.abstractmethod
+    async def get_rate(self, base: str, quote: str, day: date) -> float | None:
+        """
+        Get exchange rate
+
+        Args:
+            base (str): currency being priced
+            quote (str): currency the rate is expressed in
+            day (date): day of the rate, the last rate known on that day is used
+
+        Returns:
+            float | None: amount of quote currency for one unit of base currency, None if unknown
+        """
+        pass
+
 
 class AbstractEmailService(abc.ABC):
     """
@@ -90,12 +125,12 @@ class AbstractAuthService(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def update_user_in_cache(self, user: User) -> None:
+    async def update_user_in_cache(self, user: User | CachedUser) -> None:
         """
         Method to update user in cache
 
         Args:
-            user (User): user to update
+            user (User | CachedUser): user to update
         """
         pass
 
@@ -145,7 +180,9 @@ class AbstractAuthService(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def get_current_user(self, token: str, user_repo: AbstractUserRepo) -> User:
+    async def get_current_user(
+        self, token: str, user_repo: AbstractUserRepo
+    ) -> CachedUser:
         """
         Method to get current user
 
@@ -154,7 +191,7 @@ class AbstractAuthService(abc.ABC):
             user_repo (AbstractUserRepo): user repository
 
         Returns:
-            User: user
+            CachedUser: user
         """
         pass
 
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import time
 import uuid
-import pickle
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,7 +10,10 @@ import jwt
 from src.config.config import settings
 from src.repositories.abstract import AbstractUserRepo
 from src.database.dependencies import get_cache, get_user_repo
+from src.database.cache import LocalCache
+from src.database.cache_keys import user_key, blacklist_key
 from src.database.models import User
+from src.schemas.users import CachedUser
 from src.services.abstract import AbstractAuthService
 from src.config.constants import API, AUTH, EMAIL_TOKEN_HOURS_TO_EXPIRE
 
@@ -27,6 +31,7 @@ class AuthService(AbstractAuthService):
         REFRESH_TOKEN (str): name of refresh token scope
         oauth2_scheme (OAuth2PasswordBearer): OAuth2PasswordBearer instance
         cache (Cache): cache instance
+        claims_cache (LocalCache): verified token claims by token hash, kept until the token expires
     """
 
     SECRET_KEY = settings.secret_key
@@ -38,8 +43,36 @@ class AuthService(AbstractAuthService):
 
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{API}{AUTH}/login")
 
-    def __init__(self, cache=get_cache()):
+    def __init__(
+        self,
+        cache=get_cache(),
+        claims_cache=LocalCache(settings.token_claims_cache_size),
+    ):
         self.cache = cache
+        self.claims_cache = claims_cache
+
+    def __decode_token(self, token: str) -> dict:
+        """
+        Helper method to verify and decode token, verified claims are cached until the token expires.
+
+        Args:
+            token (str): token to decode
+
+        Returns:
+            dict: token claims
+
+        Raises:
+            jwt.exceptions.PyJWTError: if token is invalid or expired
+        """
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        found, payload = self.claims_cache.get(key)
+        if found:
+            return payload
+        payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+        expire = payload.get("exp", 0) - time.time()
+        if expire > 0:
+            self.claims_cache.set(key, payload, expire)
+        return payload
 
     async def create_email_token(self, data: dict) -> str:
         """
@@ -83,15 +116,17 @@ class AuthService(AbstractAuthService):
                 detail="Invalid token for email verification",
             )
 
-    async def update_user_in_cache(self, user: User) -> None:
+    async def update_user_in_cache(self, user: User | CachedUser) -> None:
         """
         Update user in cache.
 
         Args:
-            user (User): user to update
+            user (User | CachedUser): user to update
         """
         await self.cache.set_to_cache(
-            key=user.email, value=user, expire=self.EXPIRE_IN_SECONDS
+            key=user_key(user.email),
+            value=CachedUser.model_validate(user),
+            expire=self.EXPIRE_IN_SECONDS,
         )
 
     async def __prepare_token_to_encode(
@@ -111,7 +146,7 @@ class AuthService(AbstractAuthService):
         
         to_encode = data.copy()
         if scope == self.ACCESS_TOKEN:
-            to_encode.update({"session_id": session_id})
+            to_encode.update({"session_id": session_id, "jti": uuid.uuid4().hex})
         expire = datetime.now(timezone.utc) + expires_delta
         to_encode.update(
             {
@@ -184,7 +219,7 @@ class AuthService(AbstractAuthService):
             HTTPException: 401 if token is invalid
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.__decode_token(token)
             if payload.get("scope") == self.REFRESH_TOKEN:
                 email = payload.get("sub")
                 return email
@@ -203,7 +238,7 @@ class AuthService(AbstractAuthService):
         self,
         token: str = Depends(oauth2_scheme),
         user_repo: AbstractUserRepo = Depends(get_user_repo),
-    ) -> User:
+    ) -> CachedUser:
         """
         Get current user from token.
 
@@ -212,7 +247,7 @@ class AuthService(AbstractAuthService):
             user_repo (AbstractUserRepo): user repository
 
         Returns:
-            User: user object
+            CachedUser: user data
 
         Raises:
             HTTPException: if token is invalid or user is not found
@@ -222,10 +257,8 @@ class AuthService(AbstractAuthService):
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-        if await self.cache.get_from_cache(token): # check if token is in blacklisted (logout)
-            raise credentials_exception
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.__decode_token(token)
             if payload.get("scope") == self.ACCESS_TOKEN:
                 email = payload.get("sub")
                 if email is None:
@@ -235,15 +268,19 @@ class AuthService(AbstractAuthService):
         except jwt.exceptions.PyJWTError as e:
             print(e)  # TODO: log error
             raise credentials_exception
+        if await self.cache.get_from_cache(
+            blacklist_key(self.__get_token_id(token, payload))
+        ):  # check if token is in blacklisted (logout)
+            raise credentials_exception
 
-        user = await self.cache.get_from_cache(f"user:{email}")
+        cached_user = await self.cache.get_from_cache(user_key(email))
+        if cached_user is not None:
+            return CachedUser.model_validate(cached_user)
+        user = await user_repo.get_user_by_email(email)
         if user is None:
-            user = await user_repo.get_user_by_email(email)
-            if user is None:
-                raise credentials_exception
-            await self.cache.set_to_cache(email, user, self.EXPIRE_IN_SECONDS)
-        else:
-            user = pickle.loads(user)
+            raise credentials_exception
+        user = CachedUser.model_validate(user)
+        await self.update_user_in_cache(user)
         return user
 
     async def get_session_id_from_token(self, token: str, user_email: str) -> str:
@@ -261,7 +298,7 @@ class AuthService(AbstractAuthService):
                 HTTPException: if token is invalid or user email is not the same as the one in the token
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.__decode_token(token)
             if payload.get("scope") == self.ACCESS_TOKEN:
                 email = payload.get("sub")
                 session_id = payload.get("session_id")
@@ -290,16 +327,37 @@ class AuthService(AbstractAuthService):
         Args:
             user_email (str): user email
         """
-        await self.cache.delete_from_cache(f"user:{user_email}")
+        await self.cache.delete_from_cache(user_key(user_email))
+
+    @staticmethod
+    def __get_token_id(token: str, payload: dict) -> str:
+        """
+        Helper method to get id of the access token used in the blacklist.
+
+        Args:
+            token (str): encoded access token
+            payload (dict): decoded access token
+
+        Returns:
+            str: jti claim, or hash of the token for tokens issued without jti
+        """
+        return payload.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
 
     async def add_token_to_blacklist(self, token: str) -> None:
         """
-        Adds token to blacklist.
+        Adds token to blacklist until the token expires.
 
         Args:
             token: logout access token
         """
-        await self.cache.set_to_cache(token, "blacklisted", self.EXPIRE_IN_SECONDS)
+        try:
+            payload = self.__decode_token(token)
+        except jwt.exceptions.PyJWTError:
+            return  # invalid or expired token is rejected anyway
+        expire = int(payload["exp"] - datetime.now(timezone.utc).timestamp()) + 1
+        await self.cache.set_to_cache(
+            blacklist_key(self.__get_token_id(token, payload)), "blacklisted", expire
+        )
 
 
 auth_service = AuthService()
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from src.config.config import settings
+from src.schemas.accounts import CurrencyEnum
+from src.services.rates import RateService, rate_service
+
+
+class CrossRates:
+    """
+    Immutable NxN matrix of exchange rates between the supported currencies.
+
+    Attributes:
+        currencies (tuple[str]): currency of every row and column
+        index (dict[str, int]): row and column of every currency
+        to_pivot (np.ndarray): rate of every currency to the first one
+        matrix (np.ndarray): matrix[i, j] is the amount of currency j for one unit of currency i,
+            NaN where a rate is unknown
+        day (date): day of the rates
+    """
+
+    def __init__(self, currencies: tuple[str], to_pivot: np.ndarray, day: date) -> None:
+        self.currencies = currencies
+        self.index = {currency: i for i, currency in enumerate(currencies)}
+        self.to_pivot = to_pivot
+        self.matrix = to_pivot[:, None] / to_pivot[None, :]
+        self.matrix.flags.writeable = False
+        self.day = day
+
+    def indices(self, currencies) -> np.ndarray:
+        """
+        Rows of many currencies.
+
+        Args:
+            currencies (Iterable[str]): currency codes
+
+        Returns:
+            np.ndarray: row of every currency, -1 for unsupported currencies
+        """
+        return np.fromiter(
+            (self.index.get(currency, -1) for currency in currencies), dtype=np.int64
+        )
+
+    def convert(
+        self, amounts: np.ndarray, base: np.ndarray, quote: np.ndarray
+    ) -> np.ndarray:
+        """
+        Convert amounts between currencies in one vectorized operation.
+
+        Args:
+            amounts (np.ndarray): amounts in the base currencies
+            base (np.ndarray): row of the currency of every amount
+            quote (np.ndarray | int): row of the target currency of every amount
+
+        Returns:
+            np.ndarray: converted amounts, NaN where a rate or a currency is unknown
+        """
+        known = (base >= 0) & (quote >= 0)
+        rates = np.where(known, self.matrix[base, quote], np.nan)
+        return amounts * rates
+
+
+class CrossRateMatrix:
+    """
+    Shared cross-rate matrix, rebuilt when it gets older than the rate cache TTL.
+
+    A rebuild fetches the rate of every currency to the first one and derives
+    the rest of the matrix from them. Readers always get a complete matrix:
+    a new one is built aside and swapped in with a single reference
+    assignment, and only when the rates have changed.
+
+    Attributes:
+        rate_service (RateService): source of the rates
+        currencies (tuple[str]): supported currencies, the first one is the pivot
+        ttl (int): seconds after which the rates are fetched again
+        rebuilds (int): number of times a new matrix was swapped in
+    """
+
+    def __init__(
+        self,
+        rate_service: RateService = rate_service,
+        currencies: tuple[str] = tuple(currency.value for currency in CurrencyEnum),
+        ttl: int = settings.exchange_rate_cache_ttl,
+    ) -> None:
+        self.rate_service = rate_service
+        self.currencies = currencies
+        self.ttl = ttl
+        self.rebuilds = 0
+        self._cross_rates: CrossRates | None = None
+        self._checked_at = 0.0
+        self._refresh: asyncio.Task | None = None
+
+    async def __rebuild(self) -> CrossRates:
+        day = datetime.now(timezone.utc).date()
+        pivot = self.currencies[0]
+        rates = await self.rate_service.get_rates(
+            [(currency, pivot) for currency in self.currencies[1:]], day
+        )
+        to_pivot = np.array(
+            [1.0]
+            + [rates.get((currency, pivot), np.nan) for currency in self.currencies[1:]]
+        )
+        cross_rates = self._cross_rates
+        if (
+            cross_rates is None
+            or cross_rates.day != day
+            or not np.array_equal(cross_rates.to_pivot, to_pivot, equal_nan=True)
+        ):
+            cross_rates = CrossRates(self.currencies, to_pivot, day)
+            self._cross_rates = cross_rates
+            self.rebuilds += 1
+        self._checked_at = time.monotonic()
+        return cross_rates
+
+    async def get(self) -> CrossRates:
+        """
+        Current cross-rate matrix.
+
+        Returns:
+            CrossRates: matrix no older than ttl seconds
+        """
+        if (
+            self._cross_rates is not None
+            and time.monotonic() - self._checked_at < self.ttl
+        ):
+            return self._cross_rates
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self.__rebuild())
+        return await asyncio.shield(self._refresh)
+
+
+cross_rate_matrix = CrossRateMatrix()
@@ -5,9 +5,11 @@ from src.services.abstract import (
 from src.services.password import BcryptPasswordHandler
 from src.services.email import FastApiEmailService
 
+password_handler = BcryptPasswordHandler()
+
 
 def get_password_handler() -> AbstractPasswordHandler:
-    return BcryptPasswordHandler()
+    return password_handler
 
 
 def get_email_handler() -> AbstractEmailService:
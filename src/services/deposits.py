@@ -0,0 +1,278 @@
+import asyncio
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from src.config.config import settings
+from src.database.db import session_scope
+from src.repositories.deposits import PostgresDepositRepo
+from src.schemas.deposits import CompoundingEnum, DepositValueOut, DepositsValueOut
+from src.schemas.money import from_minor_units
+
+
+class AccrualEngine:
+    """
+    Computes the interest accrued on deposits.
+
+    The interest of all deposits is computed in one closed-form expression
+    over NumPy arrays, so valuing thousands of deposits costs a handful of
+    array operations instead of a loop over days or periods. Interest accrues
+    from the day of the first transaction of a deposit up to the valuation
+    day or the maturity, whichever comes first, on an actual/365 basis.
+    Compounded deposits grow by (1 + r / n) over every whole period, the year
+    being split into n periods of equal length, and earn simple interest over
+    the started period; simple deposits never compound. Amounts are int64
+    minor units and the interest is rounded to a minor unit.
+    """
+
+    DAYS_PER_YEAR = 365
+    PERIODS_PER_YEAR = {
+        CompoundingEnum.SIMPLE: 0,
+        CompoundingEnum.DAILY: 365,
+        CompoundingEnum.MONTHLY: 12,
+        CompoundingEnum.QUARTERLY: 4,
+        CompoundingEnum.ANNUALLY: 1,
+    }
+
+    def interest(
+        self,
+        principal: np.ndarray,
+        rates: np.ndarray,
+        periods: np.ndarray,
+        days: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Interest accrued on deposits.
+
+        Args:
+            principal (np.ndarray): int64 minor units put into every deposit
+            rates (np.ndarray): annual interest rates as fractions, 0.05 is 5%
+            periods (np.ndarray): compounding periods per year, 0 for simple interest
+            days (np.ndarray): int64 days of accrual
+
+        Returns:
+            np.ndarray: int64 minor units of interest
+        """
+        compounded = periods > 0
+        per_year = np.where(compounded, periods, 1)
+        # whole periods and the days of the started one, in exact integers
+        whole, rest = np.divmod(days * per_year, self.DAYS_PER_YEAR)
+        period_rates = rates / per_year
+        growth = whole * np.log1p(period_rates)
+        started = period_rates * rest / self.DAYS_PER_YEAR
+        factor = np.where(
+            compounded,
+            np.expm1(growth) + np.exp(growth) * started,
+            rates * days / self.DAYS_PER_YEAR,
+        )
+        return np.rint(principal * factor).astype(np.int64)
+
+    @staticmethod
+    def __day(value: datetime) -> int:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date().toordinal()
+
+    def accrue(self, terms: list[tuple], day: date) -> dict[str, np.ndarray]:
+        """
+        Accrue the interest of deposits up to a day.
+
+        Args:
+            terms (list[tuple]): rows as returned by the deposit repository get_accrual_terms
+            day (date): day to accrue to
+
+        Returns:
+            dict[str, np.ndarray]: deposit_id, principal and interest in int64 minor
+                units, accrued_on as the ordinal of the day accrued to and matured,
+                one entry per deposit in the order of terms
+        """
+        if terms:
+            ids, principal, rates, compounding, opened_at, maturity = zip(*terms)
+        else:
+            ids, principal, rates, compounding, opened_at, maturity = [[]] * 6
+        count = len(ids)
+        principal = np.asarray(principal, dtype=np.int64)
+        opened = np.fromiter(map(self.__day, opened_at), dtype=np.int64, count=count)
+        maturity = np.fromiter(map(self.__day, maturity), dtype=np.int64, count=count)
+        accrued_on = np.minimum(maturity, day.toordinal())
+        interest = self.interest(
+            principal,
+            np.asarray(rates, dtype=np.float64) / 100,
+            np.fromiter(
+                (
+                    self.PERIODS_PER_YEAR[CompoundingEnum(value)]
+                    for value in compounding
+                ),
+                dtype=np.int64,
+                count=count,
+            ),
+            np.maximum(accrued_on - opened, 0),
+        )
+        return {
+            "deposit_id": np.asarray(ids, dtype=np.int64),
+            "principal": principal,
+            "interest": interest,
+            "accrued_on": accrued_on,
+            "matured": maturity <= day.toordinal(),
+        }
+
+    def value_deposits(
+        self, account_id: int, terms: list[tuple], day: date
+    ) -> DepositsValueOut:
+        """
+        Value the deposits of an account on a day.
+
+        Args:
+            account_id (int): id of the account
+            terms (list[tuple]): rows as returned by the deposit repository get_accrual_terms
+            day (date): day to value the deposits on
+
+        Returns:
+            DepositsValueOut: value of every deposit and their totals
+        """
+        accrual = self.accrue(terms, day)
+        principal = accrual["principal"]
+        interest = accrual["interest"]
+        return DepositsValueOut(
+            account_id=account_id,
+            day=day,
+            principal=from_minor_units(principal.sum()),
+            accrued_interest=from_minor_units(interest.sum()),
+            value=from_minor_units(principal.sum() + interest.sum()),
+            deposits=[
+                DepositValueOut(
+                    deposit_id=accrual["deposit_id"][i],
+                    principal=from_minor_units(principal[i]),
+                    accrued_interest=from_minor_units(interest[i]),
+                    value=from_minor_units(principal[i] + interest[i]),
+                    matured=accrual["matured"][i],
+                )
+                for i in range(len(principal))
+            ],
+        )
+
+
+accrual_engine = AccrualEngine()
+
+
+class AccrualWriter:
+    """
+    Background task storing the accrued interest of every deposit once a day.
+
+    A run reads only the deposits not yet accrued up to the current day or
+    their maturity, in id order one batch at a time, so after the first run
+    of a day the later ones find nothing to do, and matured deposits are not
+    read again. Each batch is accrued in one call of the accrual engine and
+    written with one UPDATE ... FROM a VALUES list.
+
+    Attributes:
+        interval (int): seconds between runs
+        batch_size (int): deposits accrued and written per transaction
+        runs (int): number of finished runs
+        last_day (date | None): day of the last run
+        last_deposits (int): deposits accrued in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    def __init__(
+        self,
+        interval: int = settings.accrual_interval,
+        batch_size: int = settings.accrual_batch_size,
+        engine: AccrualEngine = accrual_engine,
+        repo_class=PostgresDepositRepo,
+    ) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.engine = engine
+        self.repo_class = repo_class
+        self.runs = 0
+        self.last_day: date | None = None
+        self.last_deposits = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """
+        Accrue the interest of every deposit up to the current day.
+
+        Returns:
+            int: number of accrued deposits
+        """
+        start = time.perf_counter()
+        day = datetime.now(timezone.utc).date()
+        accrued = 0
+        async with session_scope() as db:
+            deposit_repo = self.repo_class(db)
+            after_id = 0
+            while True:
+                terms = await deposit_repo.get_accrual_terms(
+                    after_id=after_id, limit=self.batch_size, due_on=day
+                )
+                if not terms:
+                    break
+                accrual = self.engine.accrue(terms, day)
+                accrued += await deposit_repo.update_accruals(
+                    [
+                        (
+                            int(deposit_id),
+                            from_minor_units(interest),
+                            date.fromordinal(int(accrued_on)),
+                        )
+                        for deposit_id, interest, accrued_on in zip(
+                            accrual["deposit_id"],
+                            accrual["interest"],
+                            accrual["accrued_on"],
+                        )
+                    ]
+                )
+                after_id = terms[-1][0]
+                await asyncio.sleep(0)
+        duration = time.perf_counter() - start
+        self.runs += 1
+        self.last_day = day
+        self.last_deposits = accrued
+        self.last_duration = duration
+        self.total_duration += duration
+        return accrued
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(e)  # TODO: log error
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """
+        Start the periodic accruals.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """
+        Stop the periodic accruals.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_day": self.last_day,
+            "last_deposits": self.last_deposits,
+            "last_duration": self.last_duration,
+            "total_duration": self.total_duration,
+        }
+
+
+accrual_writer = AccrualWriter()
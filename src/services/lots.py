@@ -0,0 +1,397 @@
+from decimal import Decimal
+from typing import Iterator, NamedTuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from src.database.models import Account
+from src.repositories.abstract import AbstractAssetRepo
+from src.schemas.assets import (
+    CostMethodEnum,
+    AssetToSell,
+    AssetOut,
+    AssetSaleInfo,
+    LotMatchOut,
+    LotsRecomputeOut,
+)
+from src.schemas.money import to_money, to_minor_units, from_minor_units
+from src.schemas.transactions import TransactionIn
+
+# shares left below this are a rounding error, the lot is closed
+QUANTITY_EPSILON = 1e-9
+
+
+class LotSale(NamedTuple):
+    """
+    Result of matching a sale against open lots.
+
+    Attributes:
+        cost_basis (int): cost of the sold shares in minor units
+        realized_pnl (int): proceeds minus cost_basis in minor units
+        matches (list[tuple]): (lot_id, shares sold, shares left) of every lot
+            the shares were taken from, oldest first
+    """
+
+    cost_basis: int
+    realized_pnl: int
+    matches: list[tuple[int, float, float]]
+
+
+class LotQueue:
+    """
+    Open lots of one instrument in purchase order, an array-backed deque.
+
+    Lots are kept in parallel NumPy arrays between a head and a tail index.
+    A purchase is appended at the tail, a sale takes shares from the head, so
+    it touches only the lots it consumes, however many are open. Consumed
+    lots are dropped by moving the head; the arrays double when full and the
+    live part is moved to the front once half of them are consumed lots.
+
+    The cost of shares taken from a lot is the difference of its remaining
+    cost before and after, the remaining cost being its purchase cost times
+    the share of it left, rounded to a minor unit. Costs of the parts of a lot
+    add up to its purchase cost exactly, whatever the order of the sales.
+
+    Attributes:
+        quantity (float): shares in the open lots
+        cost (int): cost of the open lots in minor units
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._bought = np.empty(capacity, dtype=np.float64)
+        self._left = np.empty(capacity, dtype=np.float64)
+        self._cost = np.empty(capacity, dtype=np.int64)
+        self._head = 0
+        self._tail = 0
+        self.quantity = 0.0
+        self.cost = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __grow(self) -> None:
+        live = slice(self._head, self._tail)
+        size = len(self)
+        capacity = len(self._ids)
+        if size > capacity // 2:
+            capacity *= 2
+        for name in ("_ids", "_bought", "_left", "_cost"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:size] = old[live]
+            setattr(self, name, new)
+        self._head = 0
+        self._tail = size
+
+    @staticmethod
+    def __remaining_cost(cost: int, bought: float, left: float) -> int:
+        return int(np.rint(cost * left / bought))
+
+    def push(self, lot_id: int, bought: float, left: float, cost: int) -> None:
+        """
+        Add a lot after the open ones.
+
+        Args:
+            lot_id (int): id of the purchase
+            bought (float): shares bought
+            left (float): shares of the purchase not sold yet
+            cost (int): cost of the purchase in minor units
+        """
+        if left <= QUANTITY_EPSILON:
+            return
+        if self._tail == len(self._ids):
+            self.__grow()
+        i = self._tail
+        self._ids[i] = lot_id
+        self._bought[i] = bought
+        self._left[i] = left
+        self._cost[i] = cost
+        self._tail += 1
+        self.quantity += left
+        self.cost += self.__remaining_cost(cost, bought, left)
+
+    def take(self, quantity: float) -> tuple[int, list[tuple[int, float, float]]]:
+        """
+        Take shares from the oldest lots.
+
+        Args:
+            quantity (float): shares to take, at most quantity of the queue is taken
+
+        Returns:
+            tuple (int, list[tuple]): cost of the shares taken in minor units,
+                (lot_id, shares taken, shares left) of every lot touched
+        """
+        cost = 0
+        matches = []
+        while quantity > QUANTITY_EPSILON and self._head < self._tail:
+            i = self._head
+            left = float(self._left[i])
+            taken = min(left, quantity)
+            rest = left - taken if left - taken > QUANTITY_EPSILON else 0.0
+            lot_cost = int(self._cost[i])
+            bought = float(self._bought[i])
+            cost += self.__remaining_cost(
+                lot_cost, bought, left
+            ) - self.__remaining_cost(lot_cost, bought, rest)
+            matches.append((int(self._ids[i]), taken, rest))
+            quantity -= taken
+            self._left[i] = rest
+            if rest == 0.0:
+                self._head += 1
+        self.quantity = max(self.quantity - sum(match[1] for match in matches), 0.0)
+        self.cost -= cost
+        if self._head == self._tail:
+            self._head = self._tail = 0
+            self.quantity = 0.0
+        return cost, matches
+
+    def open_lots(self) -> Iterator[tuple[int, float]]:
+        """
+        Iterate over the open lots, oldest first.
+
+        Yields:
+            tuple (int, float): lot_id, shares left
+        """
+        for i in range(self._head, self._tail):
+            yield int(self._ids[i]), float(self._left[i])
+
+
+class LotMatcher:
+    """
+    Matches sales against the open lots of every instrument.
+
+    With FIFO the cost of the sold shares is the cost of the lots they are
+    taken from. With average cost it is the share sold of the cost of the
+    whole position, and the shares are still taken from the oldest lots, so
+    the lots track what is left either way. The position totals are those
+    of the pushed lots unless set from the positions table, which lets a
+    sale load only the lots it consumes.
+
+    Attributes:
+        method (CostMethodEnum): how the cost of sold shares is computed
+    """
+
+    def __init__(self, method: CostMethodEnum = CostMethodEnum.FIFO) -> None:
+        self.method = method
+        self._queues: dict[str, LotQueue] = {}
+        self._positions: dict[str, list] = {}
+
+    def __queue(self, instrument: str) -> LotQueue:
+        queue = self._queues.get(instrument)
+        if queue is None:
+            queue = self._queues[instrument] = LotQueue()
+        return queue
+
+    def buy(
+        self,
+        instrument: str,
+        lot_id: int,
+        bought: float,
+        cost: int,
+        left: float | None = None,
+    ) -> None:
+        """
+        Open a lot.
+
+        Args:
+            instrument (str): name of the asset
+            lot_id (int): id of the purchase
+            bought (float): shares bought
+            cost (int): cost of the purchase in minor units
+            left (float | None): shares not sold yet, all if None
+        """
+        queue = self.__queue(instrument)
+        quantity, open_cost = queue.quantity, queue.cost
+        queue.push(lot_id, bought, bought if left is None else left, cost)
+        position = self._positions.setdefault(instrument, [0.0, 0])
+        position[0] += queue.quantity - quantity
+        position[1] += queue.cost - open_cost
+
+    def set_position(self, instrument: str, quantity: float, cost: int) -> None:
+        """
+        Set the shares and cost of a position when not all its lots are pushed.
+
+        Args:
+            instrument (str): name of the asset
+            quantity (float): shares held
+            cost (int): cost of the position in minor units
+        """
+        self.__queue(instrument)
+        self._positions[instrument] = [quantity, cost]
+
+    def sell(self, instrument: str, quantity: float, proceeds: int) -> LotSale:
+        """
+        Close shares of a position.
+
+        Args:
+            instrument (str): name of the asset
+            quantity (float): shares sold
+            proceeds (int): money received in minor units
+
+        Returns:
+            LotSale: cost, profit and lots of the sale
+        """
+        queue = self.__queue(instrument)
+        position = self._positions.setdefault(instrument, [0.0, 0])
+        fifo_cost, matches = queue.take(quantity)
+        if self.method == CostMethodEnum.FIFO:
+            cost = fifo_cost
+        elif quantity >= position[0] - QUANTITY_EPSILON:
+            cost = position[1]
+        else:
+            cost = int(np.rint(position[1] * quantity / position[0]))
+        position[0] = max(position[0] - quantity, 0.0)
+        position[1] -= cost
+        return LotSale(cost, proceeds - cost, matches)
+
+    def open_lots(self) -> Iterator[tuple[int, float]]:
+        """
+        Iterate over the open lots of every instrument.
+
+        Yields:
+            tuple (int, float): lot_id, shares left
+        """
+        for queue in self._queues.values():
+            yield from queue.open_lots()
+
+
+class LotService:
+    """
+    Sells assets and recomputes lots through a LotMatcher.
+
+    A sale locks the position, checks the shares held under the lock, loads
+    only the purchases it consumes and takes the position totals from the
+    positions table, so its cost does not depend on how many lots are open.
+    A recompute replays every trade
+    of an account in one pass and writes all purchases and sales with one
+    statement, for example after switching the cost method.
+    """
+
+    @staticmethod
+    def __trade_cost(share_price: Decimal, share_quantity: float) -> int:
+        return to_minor_units(to_money(share_price * Decimal(str(share_quantity))))
+
+    async def sell_asset(
+        self,
+        transaction_in: TransactionIn,
+        asset_to_sell: AssetToSell,
+        account: Account,
+        method: CostMethodEnum,
+        asset_repo: AbstractAssetRepo,
+    ) -> AssetSaleInfo:
+        """
+        Sell shares of an asset.
+
+        Args:
+            transaction_in (TransactionIn): the sale, its amount is credited to the account
+            asset_to_sell (AssetToSell): asset, price and shares sold
+            account (Account): account selling the shares
+            method (CostMethodEnum): how the cost of the sold shares is computed
+            asset_repo (AbstractAssetRepo): asset repository
+
+        Returns:
+            AssetSaleInfo: the sale with its cost and profit
+
+        Raises:
+            HTTPException: 400 if the account holds fewer shares than sold
+        """
+        asset_name = asset_to_sell.asset_name
+        # checked under the lock, so concurrent sales cannot oversell the position
+        quantity, cost = await asset_repo.get_position(
+            account.id, asset_name, for_update=True
+        ) or (0.0, 0)
+        if quantity < asset_to_sell.share_quantity - QUANTITY_EPSILON:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Insufficient shares",
+            )
+        matcher = LotMatcher(method)
+        for asset_id, bought, left, share_price in await asset_repo.get_open_lots(
+            account.id, asset_name, asset_to_sell.share_quantity
+        ):
+            matcher.buy(
+                asset_name,
+                asset_id,
+                bought,
+                self.__trade_cost(share_price, bought),
+                left,
+            )
+        matcher.set_position(asset_name, quantity, cost)
+        sale = matcher.sell(
+            asset_name,
+            asset_to_sell.share_quantity,
+            self.__trade_cost(asset_to_sell.share_price, asset_to_sell.share_quantity),
+        )
+        new_asset = await asset_repo.add_sale(
+            transaction_in,
+            asset_to_sell,
+            account,
+            [(asset_id, left) for asset_id, _, left in sale.matches],
+            from_minor_units(sale.cost_basis),
+            from_minor_units(sale.realized_pnl),
+        )
+        return AssetSaleInfo(
+            asset=AssetOut.model_validate(new_asset),
+            method=method,
+            cost_basis=from_minor_units(sale.cost_basis),
+            realized_pnl=from_minor_units(sale.realized_pnl),
+            lots=[
+                LotMatchOut(
+                    asset_id=asset_id,
+                    share_quantity=taken,
+                    current_share_quantity=left,
+                )
+                for asset_id, taken, left in sale.matches
+            ],
+            detail="Asset sold successfully",
+        )
+
+    async def recompute_lots(
+        self,
+        account_id: int,
+        method: CostMethodEnum,
+        asset_repo: AbstractAssetRepo,
+    ) -> LotsRecomputeOut:
+        """
+        Replay every asset trade of an account and rewrite its lots and positions.
+
+        Args:
+            account_id (int): id of the account
+            method (CostMethodEnum): how the cost of sold shares is computed
+            asset_repo (AbstractAssetRepo): asset repository
+
+        Returns:
+            LotsRecomputeOut: counts and total profit of the replayed trades
+        """
+        trades = await asset_repo.get_asset_trades(account_id, for_update=True)
+        matcher = LotMatcher(method)
+        purchases: list[int] = []
+        sales: list[tuple[int, float, Decimal]] = []
+        realized_pnl = 0
+        for asset_id, asset_name, type, share_quantity, share_price in trades:
+            cost = self.__trade_cost(share_price, share_quantity)
+            if type == "WITHDRAW":
+                sale = matcher.sell(asset_name, share_quantity, cost)
+                sales.append((asset_id, 0.0, from_minor_units(sale.realized_pnl)))
+                realized_pnl += sale.realized_pnl
+            else:
+                matcher.buy(asset_name, asset_id, share_quantity, cost)
+                purchases.append(asset_id)
+        shares_left = dict.fromkeys(purchases, 0.0)
+        shares_left.update(matcher.open_lots())
+        await asset_repo.replace_lots(
+            account_id,
+            [(asset_id, left, None) for asset_id, left in shares_left.items()] + sales,
+        )
+        return LotsRecomputeOut(
+            account_id=account_id,
+            method=method,
+            purchases=len(purchases),
+            sales=len(sales),
+            open_lots=sum(1 for left in shares_left.values() if left > 0),
+            realized_pnl=from_minor_units(realized_pnl),
+        )
+
+
+lot_service = LotService()
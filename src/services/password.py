@@ -1,11 +1,87 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 import bcrypt
+from fastapi import HTTPException, status
 
 from src.services.abstract import AbstractPasswordHandler
+from src.config.config import settings
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _verify_password(password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed_password)
 
 
 class BcryptPasswordHandler(AbstractPasswordHandler):
+    """
+    Password handler running bcrypt in a bounded worker pool.
+
+    bcrypt is CPU bound, so it never runs on the event loop thread. At most
+    `workers` hashes run at once and at most `max_queue` wait for a worker;
+    further requests are rejected with 503 instead of piling up.
+
+    Attributes:
+        rounds (int): bcrypt cost factor used for new hashes
+        max_pending (int): running plus waiting hash requests allowed
+        pending (int): running plus waiting hash requests
+    """
+
+    def __init__(
+        self,
+        rounds: int = settings.bcrypt_rounds,
+        executor_type: str = settings.password_hash_executor,
+        workers: int = settings.password_hash_workers,
+        max_queue: int = settings.password_hash_max_queue,
+    ) -> None:
+        self.rounds = rounds
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        if executor_type == "process":
+            self._executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        elif executor_type == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="bcrypt"
+            )
+        else:
+            raise ValueError(f"Invalid password hash executor: {executor_type}")
+
+    async def __run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again later",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
     async def hash_password(self, password: str) -> str:
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        hashed_password = await self.__run(
+            _hash_password, password.encode("utf-8"), self.rounds
+        )
+        return hashed_password.decode("utf-8")
 
     async def verify_password(self, password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+        return await self.__run(
+            _verify_password,
+            password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # a hash stronger than the configured cost is kept
+        try:
+            return int(hashed_password.split("$")[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,381 @@
+import math
+from datetime import date, datetime, timezone
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from src.config.config import settings
+from src.config.constants import MINOR_UNITS, SNAPSHOT_DAY
+from src.database.abstract import AbstractCache
+from src.database.cache_keys import performance_key
+from src.database.dependencies import get_cache
+from src.database.models import Account, AccountSnapshot
+from src.repositories.abstract import (
+    AbstractAccountRepo,
+    AbstractTransactionRepo,
+    AbstractSnapshotRepo,
+)
+from src.schemas.money import to_minor_units, from_minor_units
+from src.schemas.performance import AccountPerformanceOut, InstrumentPerformanceOut
+from src.schemas.valuations import AccountValuationOut
+from src.services.cross_rates import CrossRateMatrix, cross_rate_matrix
+from src.services.valuation import ValuationEngine, valuation_engine
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_YEAR = 365.25 * SECONDS_PER_DAY
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class PerformanceEngine:
+    """
+    Computes time-weighted and money-weighted returns, volatility and drawdown.
+
+    Cash flows are loaded once into arrays of group, time and amount. The
+    money-weighted return (XIRR) of every instrument and of the whole account
+    is found in one vectorized solve: Newton steps run on all groups at once,
+    with the net present values summed per group by bincount, and groups where
+    Newton does not converge are bisected, again all at once. Time-weighted
+    returns come from the daily snapshots, with the money invested between
+    two snapshots taken out of the change in value.
+
+    Attributes:
+        tolerance (float): precision of the XIRR solutions
+        max_iterations (int): Newton steps before a group falls back to bisection
+        periods_per_year (int): daily snapshots per year, used to annualize volatility
+    """
+
+    LOWEST_RATE = -0.99
+    HIGHEST_RATE = 100.0
+
+    def __init__(
+        self,
+        tolerance: float = 1e-9,
+        max_iterations: int = 50,
+        periods_per_year: int = 365,
+    ) -> None:
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.periods_per_year = periods_per_year
+
+    @staticmethod
+    def __discounted(
+        rates: np.ndarray, groups: np.ndarray, years: np.ndarray, amounts: np.ndarray
+    ) -> np.ndarray:
+        with np.errstate(over="ignore", invalid="ignore"):
+            return amounts * np.exp(-years * np.log1p(rates)[groups])
+
+    def __bisect(
+        self,
+        pending: np.ndarray,
+        groups: np.ndarray,
+        years: np.ndarray,
+        amounts: np.ndarray,
+    ) -> np.ndarray:
+        size = len(pending)
+        rows = pending[groups]
+        groups, years, amounts = groups[rows], years[rows], amounts[rows]
+
+        def npv(rates: np.ndarray) -> np.ndarray:
+            return np.bincount(
+                groups,
+                weights=self.__discounted(rates, groups, years, amounts),
+                minlength=size,
+            )
+
+        low = np.full(size, self.LOWEST_RATE)
+        high = np.full(size, self.HIGHEST_RATE)
+        npv_low = npv(low)
+        bracketed = pending & (np.sign(npv_low) * np.sign(npv(high)) < 0)
+        while np.any((high - low)[bracketed] > self.tolerance):
+            middle = (low + high) / 2
+            npv_middle = npv(middle)
+            right = np.sign(npv_middle) == np.sign(npv_low)
+            low = np.where(right, middle, low)
+            npv_low = np.where(right, npv_middle, npv_low)
+            high = np.where(right, high, middle)
+        return np.where(bracketed, (low + high) / 2, np.nan)
+
+    def xirr(
+        self, groups: np.ndarray, years: np.ndarray, amounts: np.ndarray, size: int
+    ) -> np.ndarray:
+        """
+        Solve the annualized internal rate of return of many cash flow series.
+
+        Args:
+            groups (np.ndarray): series of every cash flow, 0 to size - 1
+            years (np.ndarray): time of every cash flow in years from the first one of its series
+            amounts (np.ndarray): cash flows, negative when money is put in
+
+        Returns:
+            np.ndarray: rate of every series, NaN where there is no solution
+        """
+        has_inflow = np.bincount(groups, weights=amounts > 0, minlength=size) > 0
+        has_outflow = np.bincount(groups, weights=amounts < 0, minlength=size) > 0
+        solvable = has_inflow & has_outflow
+        rates = np.full(size, np.nan)
+        guess = np.full(size, 0.1)
+        newton = solvable.copy()
+        for _ in range(self.max_iterations):
+            if not newton.any():
+                break
+            # only the rows of the series still being solved
+            rows = newton[groups]
+            row_groups, row_years = groups[rows], years[rows]
+            discounted = self.__discounted(guess, row_groups, row_years, amounts[rows])
+            npv = np.bincount(row_groups, weights=discounted, minlength=size)
+            slope = -np.bincount(
+                row_groups, weights=row_years * discounted, minlength=size
+            ) / (1 + guess)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                next_guess = guess - npv / slope
+            valid = newton & np.isfinite(next_guess) & (next_guess > -1)
+            done = valid & (np.abs(next_guess - guess) <= self.tolerance)
+            rates[done] = next_guess[done]
+            guess = np.where(valid, next_guess, guess)
+            newton &= valid & ~done
+        pending = solvable & np.isnan(rates)
+        if pending.any():
+            rates = np.where(
+                pending, self.__bisect(pending, groups, years, amounts), rates
+            )
+        return rates
+
+    @staticmethod
+    def time_weighted_returns(
+        days: np.ndarray,
+        values: np.ndarray,
+        flow_days: np.ndarray,
+        flows: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Returns between consecutive snapshots, net of the money invested in between.
+
+        Args:
+            days (np.ndarray): ordinal of every snapshot day, ascending
+            values (np.ndarray): value at every snapshot
+            flow_days (np.ndarray): ordinal of the day of every cash flow, ascending
+            flows (np.ndarray): money invested, negative when taken out
+
+        Returns:
+            np.ndarray: return of every period starting with a positive value
+        """
+        if len(days) < 2:
+            return np.empty(0)
+        invested = np.concatenate(([0], np.cumsum(flows)))
+        # money invested after one snapshot day, up to and including the next
+        period_flows = np.diff(invested[np.searchsorted(flow_days, days, "right")])
+        start = values[:-1].astype(np.float64)
+        end = values[1:].astype(np.float64)
+        valid = start > 0
+        return (end[valid] - period_flows[valid]) / start[valid] - 1
+
+    @staticmethod
+    def __epoch(created_at: datetime) -> float:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.timestamp()
+
+    @staticmethod
+    def __optional(value: float) -> float | None:
+        return None if math.isnan(value) else float(value)
+
+    def account_performance(
+        self,
+        account: Account,
+        cash_flows: list[tuple],
+        snapshots: list[AccountSnapshot],
+        valuation: AccountValuationOut,
+        now: datetime,
+    ) -> AccountPerformanceOut:
+        """
+        Compute the performance of an account and of every instrument it traded.
+
+        Args:
+            account (Account): the account
+            cash_flows (list[tuple]): rows as returned by the transaction repository get_cash_flows
+            snapshots (list[AccountSnapshot]): daily snapshots of the account, oldest first
+            valuation (AccountValuationOut): current valuation of the account
+            now (datetime): time of the current valuation
+
+        Returns:
+            AccountPerformanceOut: performance of the account
+        """
+        if cash_flows:
+            types, instruments, invested, created_at = zip(*cash_flows)
+        else:
+            types, instruments, invested, created_at = [], [], [], []
+        keys: dict[tuple[str, str], int] = {}
+        codes = np.fromiter(
+            (keys.setdefault(key, len(keys)) for key in zip(types, instruments)),
+            dtype=np.int64,
+            count=len(types),
+        )
+        invested = np.asarray(invested, dtype=np.int64)
+        times = np.fromiter(
+            (self.__epoch(value) for value in created_at),
+            dtype=np.float64,
+            count=len(created_at),
+        )
+        size = len(keys)
+        market_values = {
+            (position.instrument_type.value, position.instrument): position.market_value
+            for position in valuation.positions
+        }
+        instrument_values = np.fromiter(
+            (to_minor_units(market_values.get(key, 0)) for key in keys),
+            dtype=np.int64,
+            count=size,
+        )
+        instrument_invested = np.zeros(size, dtype=np.int64)
+        np.add.at(instrument_invested, codes, invested)
+
+        # series 0 .. size - 1 are the instruments, series size is the account;
+        # every series ends with its current value as if it was sold now
+        groups = np.concatenate((codes, np.arange(size), np.full(len(codes) + 1, size)))
+        flow_times = np.concatenate(
+            (times, np.full(size, now.timestamp()), times, [now.timestamp()])
+        )
+        amounts = (
+            np.concatenate(
+                (
+                    -invested,
+                    instrument_values,
+                    -invested,
+                    [to_minor_units(valuation.positions_value)],
+                )
+            )
+            / MINOR_UNITS
+        )
+        first_times = np.full(size + 1, np.inf)
+        np.minimum.at(first_times, groups, flow_times)
+        years = (flow_times - first_times[groups]) / SECONDS_PER_YEAR
+        rates = self.xirr(groups, years, amounts, size + 1)
+
+        returns = self.time_weighted_returns(
+            np.fromiter(
+                (snapshot.day.toordinal() for snapshot in snapshots),
+                dtype=np.int64,
+                count=len(snapshots),
+            ),
+            np.fromiter(
+                (to_minor_units(snapshot.positions_value) for snapshot in snapshots),
+                dtype=np.int64,
+                count=len(snapshots),
+            ),
+            (times // SECONDS_PER_DAY).astype(np.int64) + EPOCH_ORDINAL,
+            invested,
+        )
+        wealth = np.cumprod(np.concatenate(([1.0], 1 + returns)))
+        return AccountPerformanceOut(
+            account_id=account.id,
+            currency=account.currency,
+            invested=from_minor_units(invested.sum()),
+            positions_value=valuation.positions_value,
+            xirr=self.__optional(rates[size]),
+            twr=float(wealth[-1] - 1) if len(returns) else None,
+            volatility=(
+                float(np.std(returns, ddof=1) * math.sqrt(self.periods_per_year))
+                if len(returns) > 1
+                else None
+            ),
+            max_drawdown=(
+                float(np.min(wealth / np.maximum.accumulate(wealth) - 1))
+                if len(returns)
+                else None
+            ),
+            days=len(returns),
+            instruments=[
+                InstrumentPerformanceOut(
+                    instrument_type=instrument_type,
+                    instrument=instrument,
+                    invested=from_minor_units(instrument_invested[code]),
+                    market_value=from_minor_units(instrument_values[code]),
+                    xirr=self.__optional(rates[code]),
+                )
+                for (instrument_type, instrument), code in keys.items()
+            ],
+        )
+
+
+performance_engine = PerformanceEngine()
+
+
+class PerformanceService:
+    """
+    Performance metrics of accounts, cached per account.
+
+    The cache key holds the id of the newest transaction of the account, read
+    from the end of an index, so a new transaction makes the next request
+    compute fresh metrics and the old entry expires on its own. The key also
+    holds the day, for the daily snapshots and rates.
+
+    Attributes:
+        engine (PerformanceEngine): computes the metrics
+        cache (AbstractCache): cache shared with the other workers
+        ttl (int): seconds the metrics of an account are kept in the cache
+    """
+
+    def __init__(
+        self,
+        engine: PerformanceEngine = performance_engine,
+        cache: AbstractCache = get_cache(),
+        ttl: int = settings.performance_cache_ttl,
+        cross_rate_matrix: CrossRateMatrix = cross_rate_matrix,
+        valuation_engine: ValuationEngine = valuation_engine,
+    ) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.ttl = ttl
+        self.cross_rate_matrix = cross_rate_matrix
+        self.valuation_engine = valuation_engine
+
+    async def get_account_performance(
+        self,
+        account: Account,
+        account_repo: AbstractAccountRepo,
+        transaction_repo: AbstractTransactionRepo,
+        snapshot_repo: AbstractSnapshotRepo,
+    ) -> AccountPerformanceOut:
+        """
+        Get the performance of an account.
+
+        Args:
+            account (Account): the account
+            account_repo (AbstractAccountRepo): account repository
+            transaction_repo (AbstractTransactionRepo): transaction repository
+            snapshot_repo (AbstractSnapshotRepo): snapshot repository
+
+        Returns:
+            AccountPerformanceOut: performance of the account
+        """
+        now = datetime.now(timezone.utc)
+        last_transaction_id = await transaction_repo.get_latest_transaction_id(
+            account.id
+        )
+        key = performance_key(account.id, last_transaction_id or 0, now.date())
+        cached = await self.cache.get_from_cache(key)
+        if cached is not None:
+            return AccountPerformanceOut.model_validate(cached)
+        cash_flows = await transaction_repo.get_cash_flows(account.id)
+        snapshots = await snapshot_repo.get_snapshots(account.id, SNAPSHOT_DAY)
+        positions = await account_repo.get_positions(account.user_id, account.id)
+        cross_rates = await self.cross_rate_matrix.get()
+        valuation = self.valuation_engine.value_accounts(
+            [account], positions, cross_rates=cross_rates
+        )[0]
+        # CPU bound for long histories, kept off the event loop
+        performance = await run_in_threadpool(
+            self.engine.account_performance,
+            account,
+            cash_flows,
+            snapshots,
+            valuation,
+            now,
+        )
+        await self.cache.set_to_cache(
+            key, performance.model_dump(mode="json"), self.ttl
+        )
+        return performance
+
+
+performance_service = PerformanceService()
@@ -0,0 +1,168 @@
+import asyncio
+import csv
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.config.config import settings
+from src.database.abstract import AbstractCache
+from src.database.cache_keys import exchange_rate_key
+from src.database.db import session_scope
+from src.database.dependencies import get_cache
+from src.repositories.exchange_rates import PostgresExchangeRateRepo
+from src.services.abstract import AbstractRateProvider
+
+
+class CsvRateProvider(AbstractRateProvider):
+    """
+    Rate provider reading rates from a local CSV file.
+
+    The file has the columns day, base, quote and rate. It is read once, on the
+    first lookup. A pair missing from the file is answered with the inverse of
+    the opposite pair.
+
+    Attributes:
+        path (str): path to the CSV file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._rates: dict[tuple[str, str], tuple[list[date], list[float]]] | None = None
+
+    def __load(self) -> dict[tuple[str, str], tuple[list[date], list[float]]]:
+        history: dict[tuple[str, str], list[tuple[date, float]]] = {}
+        try:
+            with open(self.path, newline="") as file:
+                for row in csv.DictReader(file):
+                    history.setdefault((row["base"], row["quote"]), []).append(
+                        (date.fromisoformat(row["day"]), float(row["rate"]))
+                    )
+        except (OSError, KeyError, ValueError) as e:
+            print(e)  # TODO: log error
+        rates = {}
+        for pair, rows in history.items():
+            rows.sort()
+            rates[pair] = ([day for day, _ in rows], [rate for _, rate in rows])
+        return rates
+
+    async def get_rate(self, base: str, quote: str, day: date) -> float | None:
+        if self._rates is None:
+            self._rates = await run_in_threadpool(self.__load)
+        for pair, inverse in (((base, quote), False), ((quote, base), True)):
+            if pair not in self._rates:
+                continue
+            days, rates = self._rates[pair]
+            index = bisect_right(days, day) - 1
+            if index >= 0:
+                return 1 / rates[index] if inverse else rates[index]
+        return None
+
+
+class RateService:
+    """
+    Exchange rates shared by all requests.
+
+    Lookups go through the tiered cache, so most are answered from memory and
+    the rest from Redis. On a cache miss a rate of a past day is read from the
+    exchange_rates table, and only rates not stored there are fetched from the
+    provider. Every fetched rate is stored, so past valuations never fetch it
+    again. Concurrent lookups of the same rate share one fetch.
+
+    Attributes:
+        provider (AbstractRateProvider): source of the rates
+        cache (AbstractCache): cache shared with the other workers
+        ttl (int): seconds a rate is kept in the cache
+        lookups (int): number of rate lookups
+        coalesced_lookups (int): lookups served by a fetch already in flight
+        provider_calls (int): lookups passed on to the provider
+    """
+
+    def __init__(
+        self,
+        provider: AbstractRateProvider,
+        cache: AbstractCache = get_cache(),
+        ttl: int = settings.exchange_rate_cache_ttl,
+        repo_class=PostgresExchangeRateRepo,
+    ) -> None:
+        self.provider = provider
+        self.cache = cache
+        self.ttl = ttl
+        self.repo_class = repo_class
+        self.lookups = 0
+        self.coalesced_lookups = 0
+        self.provider_calls = 0
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    async def __fetch(self, key: str, base: str, quote: str, day: date) -> float | None:
+        rate = await self.cache.get_from_cache(key)
+        if rate is not None:
+            return rate
+        async with session_scope() as db:
+            rate_repo = self.repo_class(db)
+            if day < datetime.now(timezone.utc).date():
+                rate = await rate_repo.get_rate(base, quote, day)
+            if rate is None:
+                self.provider_calls += 1
+                rate = await self.provider.get_rate(base, quote, day)
+                if rate is None:
+                    return None
+                await rate_repo.add_rate(base, quote, day, rate)
+        await self.cache.set_to_cache(key, rate, self.ttl)
+        return rate
+
+    async def get_rate(
+        self, base: str, quote: str, day: date | None = None
+    ) -> float | None:
+        """
+        Get exchange rate.
+
+        Args:
+            base (str): currency being priced
+            quote (str): currency the rate is expressed in
+            day (date | None): day of the rate, today if not given
+
+        Returns:
+            float | None: amount of quote currency for one unit of base currency, None if unknown
+        """
+        if base == quote:
+            return 1.0
+        self.lookups += 1
+        day = day or datetime.now(timezone.utc).date()
+        key = exchange_rate_key(base, quote, day)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.__fetch(key, base, quote, day))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced_lookups += 1
+        # shielded, so a cancelled request does not cancel the fetch of the others
+        return await asyncio.shield(task)
+
+    async def get_rates(
+        self, pairs: list[tuple[str, str]], day: date | None = None
+    ) -> dict[tuple[str, str], float]:
+        """
+        Get exchange rates of many currency pairs concurrently.
+
+        Args:
+            pairs (list[tuple[str, str]]): (base, quote) pairs
+            day (date | None): day of the rates, today if not given
+
+        Returns:
+            dict: rate by (base, quote), unknown rates are left out
+        """
+        rates = await asyncio.gather(*(self.get_rate(*pair, day) for pair in pairs))
+        return {pair: rate for pair, rate in zip(pairs, rates) if rate is not None}
+
+    def stats(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "coalesced_lookups": self.coalesced_lookups,
+            "provider_calls": self.provider_calls,
+            "in_flight": len(self._in_flight),
+        }
+
+
+rate_service = RateService(CsvRateProvider(settings.exchange_rates_file))
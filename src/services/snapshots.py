@@ -0,0 +1,170 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from src.config.config import settings
+from src.config.constants import SNAPSHOT_DAY, SNAPSHOT_WEEK, SNAPSHOT_MONTH
+from src.database.db import session_scope
+from src.repositories.positions import PostgresPositionRepo
+from src.repositories.snapshots import PostgresSnapshotRepo
+from src.schemas.money import from_minor_units
+from src.services.cross_rates import CrossRateMatrix, cross_rate_matrix
+from src.services.valuation import ValuationEngine, valuation_engine
+
+
+def period_start(day: date, interval: str) -> date:
+    """
+    First day of the period of an interval containing a day.
+
+    Args:
+        day (date): day in the period
+        interval (str): day, week or month; weeks start on Monday
+
+    Returns:
+        date: first day of the period
+    """
+    if interval == SNAPSHOT_WEEK:
+        return day - timedelta(days=day.weekday())
+    if interval == SNAPSHOT_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+class SnapshotWriter:
+    """
+    Background task writing the value of every account once per run.
+
+    Accounts are read in id order one batch at a time. The holdings of a batch
+    come from the positions table, which already includes every trade since
+    the previous run, so a run costs one valuation per account however long
+    its history is. Each batch is valued in one pass of the valuation engine
+    and written with one statement: the day row and the week and month
+    rollups containing the day. Runs later in the same day overwrite the
+    rows, so the last run of a day leaves its closing values.
+
+    Attributes:
+        interval (int): seconds between runs
+        batch_size (int): accounts valued and written per transaction
+        runs (int): number of finished runs
+        last_day (date | None): day of the last run
+        last_accounts (int): accounts snapshotted in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    INTERVALS = (SNAPSHOT_DAY, SNAPSHOT_WEEK, SNAPSHOT_MONTH)
+
+    def __init__(
+        self,
+        interval: int = settings.snapshot_interval,
+        batch_size: int = settings.snapshot_batch_size,
+        cross_rate_matrix: CrossRateMatrix = cross_rate_matrix,
+        valuation_engine: ValuationEngine = valuation_engine,
+        repo_class=PostgresSnapshotRepo,
+        position_repo_class=PostgresPositionRepo,
+    ) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.cross_rate_matrix = cross_rate_matrix
+        self.valuation_engine = valuation_engine
+        self.repo_class = repo_class
+        self.position_repo_class = position_repo_class
+        self.runs = 0
+        self.last_day: date | None = None
+        self.last_accounts = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self._task: asyncio.Task | None = None
+
+    def __snapshots(self, accounts: list, totals: dict, day: date) -> list[dict]:
+        return [
+            {
+                "account_id": account.id,
+                "interval": interval,
+                "period_start": period_start(day, interval),
+                "day": day,
+                "cash": from_minor_units(totals["cash"][i]),
+                "cost_basis": from_minor_units(totals["cost_basis"][i]),
+                "positions_value": from_minor_units(totals["positions_value"][i]),
+            }
+            for i, account in enumerate(accounts)
+            for interval in self.INTERVALS
+        ]
+
+    async def run_once(self) -> int:
+        """
+        Snapshot every account at its current value.
+
+        Returns:
+            int: number of snapshotted accounts
+        """
+        start = time.perf_counter()
+        day = datetime.now(timezone.utc).date()
+        cross_rates = await self.cross_rate_matrix.get()
+        snapshotted = 0
+        async with session_scope() as db:
+            snapshot_repo = self.repo_class(db)
+            position_repo = self.position_repo_class(db)
+            after_id = 0
+            while True:
+                accounts = await snapshot_repo.get_accounts(after_id, self.batch_size)
+                if not accounts:
+                    break
+                positions = await position_repo.get_positions(
+                    [account.id for account in accounts]
+                )
+                totals = self.valuation_engine.account_totals(
+                    accounts, positions, cross_rates
+                )
+                await snapshot_repo.add_snapshots(
+                    self.__snapshots(accounts, totals, day)
+                )
+                snapshotted += len(accounts)
+                after_id = accounts[-1].id
+                await asyncio.sleep(0)
+        duration = time.perf_counter() - start
+        self.runs += 1
+        self.last_day = day
+        self.last_accounts = snapshotted
+        self.last_duration = duration
+        self.total_duration += duration
+        return snapshotted
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(e)  # TODO: log error
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """
+        Start the periodic snapshots.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """
+        Stop the periodic snapshots.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_day": self.last_day,
+            "last_accounts": self.last_accounts,
+            "last_duration": self.last_duration,
+            "total_duration": self.total_duration,
+        }
+
+
+snapshot_writer = SnapshotWriter()
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+from src.config.config import settings
+from src.database.db import session_scope
+from src.repositories.tokens import PostgresTokenRepo
+
+
+class TokenReaper:
+    """
+    Background task deleting expired refresh tokens.
+
+    Expired tokens are deleted in batches, each in its own short transaction.
+    Rows locked by another worker are skipped, so several workers can run the
+    reaper at once without waiting on each other or on logins.
+
+    Attributes:
+        interval (int): seconds between runs
+        batch_size (int): rows deleted per transaction
+        runs (int): number of finished runs
+        rows_purged (int): rows deleted since start
+        last_rows_purged (int): rows deleted in the last run
+        last_duration (float): duration of the last run in seconds
+        total_duration (float): time spent in all runs in seconds
+    """
+
+    def __init__(
+        self,
+        interval: int = settings.token_reaper_interval,
+        batch_size: int = settings.token_reaper_batch_size,
+        repo_class=PostgresTokenRepo,
+    ) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.repo_class = repo_class
+        self.runs = 0
+        self.rows_purged = 0
+        self.last_rows_purged = 0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """
+        Delete all currently expired refresh tokens.
+
+        Returns:
+            int: number of deleted rows
+        """
+        start = time.perf_counter()
+        purged = 0
+        async with session_scope() as db:
+            token_repo = self.repo_class(db)
+            while True:
+                deleted = await token_repo.remove_expired_refresh_tokens(
+                    self.batch_size
+                )
+                purged += deleted
+                if deleted < self.batch_size:
+                    break
+                await asyncio.sleep(0)
+        duration = time.perf_counter() - start
+        self.runs += 1
+        self.rows_purged += purged
+        self.last_rows_purged = purged
+        self.last_duration = duration
+        self.total_duration += duration
+        return purged
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(e)  # TODO: log error
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """
+        Start the periodic cleanup.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """
+        Stop the periodic cleanup.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "rows_purged": self.rows_purged,
+            "last_rows_purged": self.last_rows_purged,
+            "last_duration": self.last_duration,
+            "total_duration": self.total_duration,
+        }
+
+
+token_reaper = TokenReaper()
@@ -0,0 +1,172 @@
+import csv
+import importlib.util
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from src.config.config import settings
+from src.config.constants import (
+    TRANSACTION_EXPORT_COLUMNS,
+    MONEY_PRECISION,
+    MONEY_SCALE,
+)
+from src.database.db import session_scope
+from src.repositories.transactions import PostgresTransactionRepo
+from src.schemas.transactions import ExportFormatEnum
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file collecting what the Parquet writer produces until it is drained.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class TransactionExporter:
+    """
+    Streams the transaction history of an account as CSV, NDJSON or Parquet.
+
+    Rows are read through a server-side cursor one batch at a time and every
+    batch is encoded and sent before the next one is fetched, so memory use
+    does not depend on the number of transactions. The export opens its own
+    database session, because the response outlives the request dependencies.
+
+    Attributes:
+        batch_size (int): rows fetched and encoded at once
+        repo_class (type): transaction repository used by the export
+    """
+
+    MEDIA_TYPES = {
+        ExportFormatEnum.CSV: "text/csv",
+        ExportFormatEnum.NDJSON: "application/x-ndjson",
+        ExportFormatEnum.PARQUET: "application/vnd.apache.parquet",
+    }
+
+    def __init__(
+        self,
+        batch_size: int = settings.export_batch_size,
+        repo_class=PostgresTransactionRepo,
+    ) -> None:
+        self.batch_size = batch_size
+        self.repo_class = repo_class
+
+    @staticmethod
+    def is_available(format: ExportFormatEnum) -> bool:
+        """
+        Check if the optional dependency of a format is installed.
+
+        Args:
+            format (ExportFormatEnum): export format
+
+        Returns:
+            bool: True if the format can be exported, False otherwise
+        """
+        if format == ExportFormatEnum.PARQUET:
+            return importlib.util.find_spec("pyarrow") is not None
+        return True
+
+    async def __partitions(self, account_id: int) -> AsyncIterator[list[tuple]]:
+        async with session_scope() as db:
+            transaction_repo = self.repo_class(db)
+            async for partition in transaction_repo.stream_transactions(
+                account_id, self.batch_size
+            ):
+                yield partition
+
+    async def __csv(self, account_id: int) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(TRANSACTION_EXPORT_COLUMNS)
+        # the header goes out before the query runs
+        yield buffer.getvalue().encode("utf-8")
+        async for partition in self.__partitions(account_id):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(partition)
+            yield buffer.getvalue().encode("utf-8")
+
+    async def __ndjson(self, account_id: int) -> AsyncIterator[bytes]:
+        async for partition in self.__partitions(account_id):
+            yield b"".join(
+                orjson.dumps(
+                    dict(zip(TRANSACTION_EXPORT_COLUMNS, row)),
+                    # amounts are numbers in JSON, as in the API responses
+                    default=float,
+                    option=orjson.OPT_APPEND_NEWLINE,
+                )
+                for row in partition
+            )
+
+    async def __parquet(self, account_id: int) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("created_at", pa.timestamp("us", tz="UTC")),
+                ("type", pa.string()),
+                ("amount", pa.decimal128(MONEY_PRECISION, MONEY_SCALE)),
+                ("note", pa.string()),
+                ("currency", pa.string()),
+                ("asset_name", pa.string()),
+                ("currency_invest_id", pa.int64()),
+                ("asset_id", pa.int64()),
+                ("deposit_id", pa.int64()),
+            ]
+        )
+        sink = _ChunkSink()
+        # one row group per batch, sent as soon as it is written
+        with pq.ParquetWriter(sink, schema) as writer:
+            async for partition in self.__partitions(account_id):
+                writer.write_table(
+                    pa.Table.from_pylist(
+                        [
+                            dict(zip(TRANSACTION_EXPORT_COLUMNS, row))
+                            for row in partition
+                        ],
+                        schema=schema,
+                    )
+                )
+                yield sink.drain()
+        yield sink.drain()
+
+    def export(self, account_id: int, format: ExportFormatEnum) -> AsyncIterator[bytes]:
+        """
+        Encode the transactions of an account.
+
+        Args:
+            account_id (int): id of the account
+            format (ExportFormatEnum): export format
+
+        Returns:
+            AsyncIterator[bytes]: encoded file, chunk by chunk
+        """
+        if format == ExportFormatEnum.CSV:
+            return self.__csv(account_id)
+        if format == ExportFormatEnum.NDJSON:
+            return self.__ndjson(account_id)
+        return self.__parquet(account_id)
+
+
+transaction_exporter = TransactionExporter()
@@ -0,0 +1,435 @@
+import asyncio
+import csv
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Iterator
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from src.config.config import settings
+from src.config.constants import INSTRUMENT_CURRENCY
+from src.database.abstract import AbstractCache
+from src.database.cache_keys import import_job_key
+from src.database.db import session_scope
+from src.database.dependencies import get_cache
+from src.repositories.abstract import AbstractTransactionRepo
+from src.repositories.transactions import PostgresTransactionRepo
+from src.schemas.assets import AssetToBuy
+from src.schemas.currency_invests import CurrencyInvestToBuy
+from src.schemas.transactions import (
+    TransactionIn,
+    BulkTransactionIn,
+    BulkAssetTransactionIn,
+    BulkTransactionError,
+    BulkTransactionsOut,
+    ImportFormatEnum,
+    ImportJobOut,
+)
+from src.schemas.money import apply_rate
+from src.services.lots import QUANTITY_EPSILON
+from src.services.rates import RateService, rate_service
+
+
+class TransactionImporter:
+    """
+    Validates and writes bulk imports of currency and asset transactions.
+
+    Every item is checked on its own and rejected items are reported by their
+    position, the rest is written in a single transaction. The accounts and
+    their positions are locked for the duration of the write, the funds check
+    runs against a running balance and a sale against the running quantity of
+    the currency held, so items are accepted in the order they were sent.
+
+    Attributes:
+        rate_service (RateService): source of the rates of currency items sent without one
+    """
+
+    def __init__(self, rate_service: RateService = rate_service) -> None:
+        self.rate_service = rate_service
+
+    @staticmethod
+    def __validation_detail(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+
+    @staticmethod
+    def __instrument(
+        transaction: BulkTransactionIn | BulkAssetTransactionIn, rate: float | None
+    ) -> CurrencyInvestToBuy | AssetToBuy:
+        if isinstance(transaction, BulkAssetTransactionIn):
+            return AssetToBuy(
+                asset_name=transaction.asset_name,
+                purchase_share_price=transaction.purchase_share_price,
+                share_quantity=transaction.share_quantity,
+            )
+        return CurrencyInvestToBuy(
+            currency=transaction.currency, purchase_exchange_rate=rate
+        )
+
+    async def import_transactions(
+        self,
+        items: list[dict],
+        user_id: int,
+        transaction_repo: AbstractTransactionRepo,
+    ) -> BulkTransactionsOut:
+        """
+        Import transactions.
+
+        Args:
+            items (list[dict]): items to validate as BulkAssetTransactionIn or BulkTransactionIn
+            user_id (int): id of the user owning the accounts
+            transaction_repo (AbstractTransactionRepo): transaction repository
+
+        Returns:
+            BulkTransactionsOut: ids of the created transactions and the rejected items
+        """
+        transaction_ids: list[int | None] = [None] * len(items)
+        errors: list[BulkTransactionError] = []
+        valid: list[tuple[int, BulkTransactionIn | BulkAssetTransactionIn]] = []
+        for index, item in enumerate(items):
+            schema = (
+                BulkAssetTransactionIn
+                if isinstance(item, dict) and "asset_name" in item
+                else BulkTransactionIn
+            )
+            try:
+                valid.append((index, schema.model_validate(item)))
+            except ValidationError as e:
+                errors.append(
+                    BulkTransactionError(
+                        index=index, detail=self.__validation_detail(e)
+                    )
+                )
+
+        account_ids = list({transaction.account_id for _, transaction in valid})
+        accounts = {
+            account.id: account
+            for account in await transaction_repo.get_accounts(account_ids)
+            if account.user_id == user_id
+        }
+        # rates are fetched before the accounts are locked
+        rates = await self.rate_service.get_rates(
+            list(
+                {
+                    (accounts[transaction.account_id].currency, transaction.currency)
+                    for _, transaction in valid
+                    if isinstance(transaction, BulkTransactionIn)
+                    and transaction.purchase_exchange_rate is None
+                    and transaction.account_id in accounts
+                }
+            )
+        )
+        locked_accounts = await transaction_repo.get_accounts(
+            account_ids, for_update=True
+        )
+        balances = {
+            account.id: account.balance_investable_funds for account in locked_accounts
+        }
+        holdings = {
+            (account_id, instrument): quantity
+            for account_id, instrument_type, instrument, quantity, _ in (
+                await transaction_repo.get_positions(list(balances), for_update=True)
+            )
+            if instrument_type == INSTRUMENT_CURRENCY
+        }
+
+        accepted: list[tuple[TransactionIn, CurrencyInvestToBuy | AssetToBuy]] = []
+        accepted_indexes: list[int] = []
+        for index, transaction in valid:
+            account = accounts.get(transaction.account_id)
+            rate = None
+            holding = None
+            if transaction.account_id not in balances:
+                detail = "Account not found"
+            elif account is None:
+                detail = "You are not authorized to perform this action"
+            else:
+                if isinstance(transaction, BulkTransactionIn):
+                    rate = transaction.purchase_exchange_rate or rates.get(
+                        (account.currency, transaction.currency)
+                    )
+                    holding = (account.id, transaction.currency)
+                if isinstance(transaction, BulkTransactionIn) and rate is None:
+                    detail = "Exchange rate is not available"
+                elif transaction.type == "WITHDRAW" and holding is None:
+                    # shares are sold through the assets endpoint, matched against lots
+                    detail = "Asset sales cannot be imported"
+                elif (
+                    transaction.type == "WITHDRAW"
+                    and holdings.get(holding, 0.0)
+                    < float(apply_rate(transaction.amount, rate)) - QUANTITY_EPSILON
+                ):
+                    detail = "Insufficient holdings"
+                elif (
+                    transaction.type == "INVESTMENT"
+                    and balances[account.id] < transaction.amount
+                ):
+                    detail = "Insufficient funds"
+                else:
+                    detail = None
+            if detail is not None:
+                errors.append(BulkTransactionError(index=index, detail=detail))
+                continue
+            if transaction.type == "INVESTMENT":
+                balances[account.id] -= transaction.amount
+            else:
+                balances[account.id] += transaction.amount
+            if holding is not None:
+                quantity = float(apply_rate(transaction.amount, rate))
+                holdings[holding] = holdings.get(holding, 0.0) + (
+                    quantity if transaction.type == "INVESTMENT" else -quantity
+                )
+            accepted.append((transaction, self.__instrument(transaction, rate)))
+            accepted_indexes.append(index)
+
+        created_ids = await transaction_repo.add_transactions(accepted)
+        for index, transaction_id in zip(accepted_indexes, created_ids):
+            transaction_ids[index] = transaction_id
+        errors.sort(key=lambda error: error.index)
+        return BulkTransactionsOut(
+            created=len(created_ids),
+            transaction_ids=transaction_ids,
+            errors=errors,
+        )
+
+
+transaction_importer = TransactionImporter()
+
+
+class ImportJob:
+    """
+    Progress of a file import running in the background.
+
+    Attributes:
+        id (str): id of the job
+        user_id (int): id of the user who uploaded the file
+        format (ImportFormatEnum): format of the file
+        path (str): temporary file holding the upload
+        status (str): pending, running, finished or failed
+        rows_read (int): rows read from the file so far
+        rows_imported (int): rows written to the database so far
+        rows_rejected (int): rows rejected so far
+        errors (list[BulkTransactionError]): first rejected rows
+        detail (str | None): reason of a failed import
+        created_at (datetime): date and time when the file was uploaded
+        finished_at (datetime | None): date and time when the import ended
+    """
+
+    def __init__(self, user_id: int, format: ImportFormatEnum, path: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.format = format
+        self.path = path
+        self.status = "pending"
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rows_rejected = 0
+        self.errors: list[BulkTransactionError] = []
+        self.detail: str | None = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: datetime | None = None
+
+
+class ImportJobs:
+    """
+    File imports, each running as a background task of the worker it was
+    uploaded to.
+
+    The upload is streamed to a temporary file in chunks and the file is read
+    back one batch of rows at a time, so memory use does not depend on the
+    size of the file. Each batch is validated and written by
+    TransactionImporter in its own transaction. The progress of a job is
+    written to the cache after every batch, so any worker can report it and
+    it survives a restart until it expires.
+
+    Attributes:
+        batch_size (int): rows validated and written together
+        max_errors (int): rejected rows kept per job
+        cache (AbstractCache): shared store of the progress of the jobs
+        ttl (int): seconds the progress of a job is kept after its last change
+        repo_class (type): transaction repository used by the jobs
+    """
+
+    def __init__(
+        self,
+        importer: TransactionImporter = transaction_importer,
+        batch_size: int = settings.import_batch_size,
+        max_errors: int = settings.import_max_errors,
+        cache: AbstractCache = get_cache(),
+        ttl: int = settings.import_job_ttl,
+        repo_class=PostgresTransactionRepo,
+    ) -> None:
+        self.importer = importer
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.cache = cache
+        self.ttl = ttl
+        self.repo_class = repo_class
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def __read_rows(
+        path: str, format: ImportFormatEnum
+    ) -> Iterator[tuple[int, dict | None, str | None]]:
+        with open(path, newline="", encoding="utf-8") as file:
+            if format == ImportFormatEnum.CSV:
+                # the header is line 1, rows are numbered from 1 after it
+                for number, row in enumerate(csv.DictReader(file), start=1):
+                    yield number, {
+                        key: value
+                        for key, value in row.items()
+                        if key is not None and value not in ("", None)
+                    }, None
+                return
+            number = 0
+            for line in file:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    yield number, orjson.loads(line), None
+                except orjson.JSONDecodeError as e:
+                    yield number, None, f"Invalid JSON: {e}"
+
+    def __record_errors(self, job: ImportJob, errors: list[BulkTransactionError]):
+        job.rows_rejected += len(errors)
+        free = self.max_errors - len(job.errors)
+        if free > 0:
+            job.errors.extend(errors[:free])
+
+    async def __save(self, job: ImportJob) -> None:
+        await self.cache.set_to_cache(
+            import_job_key(job.id),
+            {
+                **ImportJobOut.model_validate(job).model_dump(mode="json"),
+                "user_id": job.user_id,
+            },
+            self.ttl,
+        )
+
+    async def __run(self, job: ImportJob) -> None:
+        job.status = "running"
+        rows = self.__read_rows(job.path, job.format)
+        try:
+            await self.__save(job)
+            async with session_scope() as db:
+                transaction_repo = self.repo_class(db)
+                while True:
+                    batch = await run_in_threadpool(
+                        lambda: list(islice(rows, self.batch_size))
+                    )
+                    if not batch:
+                        break
+                    job.rows_read += len(batch)
+                    self.__record_errors(
+                        job,
+                        [
+                            BulkTransactionError(index=number, detail=detail)
+                            for number, _, detail in batch
+                            if detail is not None
+                        ],
+                    )
+                    parsed = [
+                        (number, row) for number, row, _ in batch if row is not None
+                    ]
+                    result = await self.importer.import_transactions(
+                        [row for _, row in parsed], job.user_id, transaction_repo
+                    )
+                    job.rows_imported += result.created
+                    self.__record_errors(
+                        job,
+                        [
+                            BulkTransactionError(
+                                index=parsed[error.index][0], detail=error.detail
+                            )
+                            for error in result.errors
+                        ],
+                    )
+                    await self.__save(job)
+            job.status = "finished"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.detail = "Import was interrupted"
+            raise
+        except Exception as e:
+            print(e)  # TODO: log error
+            job.status = "failed"
+            job.detail = str(e)
+        finally:
+            rows.close()
+            job.finished_at = datetime.now(timezone.utc)
+            await run_in_threadpool(os.remove, job.path)
+            try:
+                await self.__save(job)
+            except Exception as e:
+                print(e)  # TODO: log error
+
+    async def start(
+        self, user_id: int, format: ImportFormatEnum, chunks: AsyncIterator[bytes]
+    ) -> ImportJob:
+        """
+        Store an upload and start importing it in the background.
+
+        Args:
+            user_id (int): id of the user who uploads the file
+            format (ImportFormatEnum): format of the file
+            chunks (AsyncIterator[bytes]): body of the upload
+
+        Returns:
+            ImportJob: the started job
+        """
+        file = await run_in_threadpool(
+            tempfile.NamedTemporaryFile, suffix=f".{format.value}", delete=False
+        )
+        try:
+            async for chunk in chunks:
+                await run_in_threadpool(file.write, chunk)
+        except Exception:
+            await run_in_threadpool(file.close)
+            await run_in_threadpool(os.remove, file.name)
+            raise
+        await run_in_threadpool(file.close)
+        job = ImportJob(user_id, format, file.name)
+        try:
+            await self.__save(job)
+        except Exception:
+            await run_in_threadpool(os.remove, file.name)
+            raise
+        task = asyncio.create_task(self.__run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str, user_id: int) -> ImportJobOut | None:
+        """
+        Get the progress of an import, whichever worker runs it.
+
+        Args:
+            job_id (str): id of the job
+            user_id (int): id of the user asking, only their own jobs are found
+
+        Returns:
+            ImportJobOut | None: progress of the job, None if not found or expired
+        """
+        state = await self.cache.get_from_cache(import_job_key(job_id))
+        if state is None or state.get("user_id") != user_id:
+            return None
+        return ImportJobOut.model_validate(state)
+
+    async def stop(self) -> None:
+        """
+        Cancel the running imports.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+import_jobs = ImportJobs()
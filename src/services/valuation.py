@@ -0,0 +1,291 @@
+import numpy as np
+
+from src.config.constants import INSTRUMENT_CURRENCY, INSTRUMENT_DEPOSIT, MINOR_UNITS
+from src.database.models import Account
+from src.schemas.valuations import (
+    AccountValuationOut,
+    PositionValuationOut,
+    AccountsSummaryOut,
+)
+from src.schemas.money import to_minor_units, from_minor_units
+from src.services.cross_rates import CrossRates
+
+
+class ValuationEngine:
+    """
+    Computes market value, cost basis and unrealized P&L of accounts.
+
+    All positions of a user are valued in one pass over NumPy arrays: rows are
+    grouped into positions with integer keys and summed with bincount, prices
+    are looked up once per position, not once per row. Currency positions are
+    priced from the cross-rate matrix with a single fancy-indexing operation,
+    deposits at their principal plus the interest accrued by the accrual job.
+    Money is summed as int64 minor units, so totals are exact; a market value
+    or a converted amount is rounded to a minor unit once, before it is summed.
+    """
+
+    @staticmethod
+    def __codes(values: list) -> tuple[np.ndarray, np.ndarray]:
+        uniques, codes = np.unique(
+            np.asarray(values, dtype=object), return_inverse=True
+        )
+        return uniques, codes.reshape(-1)
+
+    @staticmethod
+    def __sum(groups: np.ndarray, amounts: np.ndarray, size: int) -> np.ndarray:
+        # bincount would sum in float64, which is not exact past 2**53
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, groups, amounts)
+        return totals
+
+    def __value(
+        self,
+        accounts: list[Account],
+        positions: list[tuple],
+        prices: dict[tuple[str, str, str], float],
+        cross_rates: CrossRates | None,
+    ) -> dict:
+        account_index = {account.id: i for i, account in enumerate(accounts)}
+        positions = [row for row in positions if row[0] in account_index]
+        if positions:
+            account_ids, types, instruments, quantities, costs = zip(*positions)
+        else:
+            account_ids, types, instruments, quantities, costs = [], [], [], [], []
+        account_codes = np.fromiter(
+            (account_index[account_id] for account_id in account_ids),
+            dtype=np.int64,
+            count=len(account_ids),
+        )
+        quantity = np.asarray(quantities, dtype=np.float64)
+        cost = np.asarray(costs, dtype=np.int64)
+        type_values, type_codes = self.__codes(types)
+        instrument_values, instrument_codes = self.__codes(instruments)
+
+        # one integer key per (account, instrument type, instrument)
+        row_keys = (account_codes * len(type_values) + type_codes) * len(
+            instrument_values
+        ) + instrument_codes
+        group_keys, first_rows, groups = np.unique(
+            row_keys, return_index=True, return_inverse=True
+        )
+        groups = groups.reshape(-1)
+        group_quantity = np.bincount(
+            groups, weights=quantity, minlength=len(group_keys)
+        )
+        group_cost = self.__sum(groups, cost, len(group_keys))
+        group_account = account_codes[first_rows]
+        group_type = type_codes[first_rows]
+        group_instrument = instrument_codes[first_rows]
+
+        group_price = np.array(
+            [
+                prices.get(
+                    (
+                        accounts[account_code].currency,
+                        type_values[type_code],
+                        instrument_values[instrument_code],
+                    ),
+                    np.nan,
+                )
+                for account_code, type_code, instrument_code in zip(
+                    group_account, group_type, group_instrument
+                )
+            ],
+            dtype=np.float64,
+        )
+        account_currencies = None
+        if cross_rates is not None:
+            account_currencies = cross_rates.indices(
+                account.currency for account in accounts
+            )
+            is_currency = type_values[group_type] == INSTRUMENT_CURRENCY
+            currency_prices = cross_rates.convert(
+                np.ones(len(group_keys)),
+                cross_rates.indices(instrument_values)[group_instrument],
+                account_currencies[group_account],
+            )
+            group_price = np.where(
+                is_currency & np.isnan(group_price), currency_prices, group_price
+            )
+        # the quantity of a deposit is its balance with the accrued interest
+        group_price = np.where(
+            (type_values[group_type] == INSTRUMENT_DEPOSIT) & np.isnan(group_price),
+            1.0,
+            group_price,
+        )
+        priced = ~np.isnan(group_price)
+        group_value = np.where(
+            priced,
+            np.rint(
+                np.where(priced, group_quantity * group_price * MINOR_UNITS, 0)
+            ).astype(np.int64),
+            group_cost,
+        )
+
+        return {
+            "account_currencies": account_currencies,
+            "cash": np.fromiter(
+                (
+                    to_minor_units(account.balance_investable_funds)
+                    for account in accounts
+                ),
+                dtype=np.int64,
+                count=len(accounts),
+            ),
+            "cost_basis": self.__sum(group_account, group_cost, len(accounts)),
+            "positions_value": self.__sum(group_account, group_value, len(accounts)),
+            "group_account": group_account,
+            "group_type": type_values[group_type],
+            "group_instrument": instrument_values[group_instrument],
+            "group_quantity": group_quantity,
+            "group_cost": group_cost,
+            "group_value": group_value,
+            "priced": priced,
+        }
+
+    @staticmethod
+    def __account_outs(
+        accounts: list[Account], valuation: dict
+    ) -> list[AccountValuationOut]:
+        account_positions = [[] for _ in accounts]
+        for i, account_code in enumerate(valuation["group_account"]):
+            account_positions[account_code].append(
+                PositionValuationOut(
+                    instrument_type=valuation["group_type"][i],
+                    instrument=valuation["group_instrument"][i],
+                    quantity=valuation["group_quantity"][i],
+                    cost_basis=from_minor_units(valuation["group_cost"][i]),
+                    market_value=from_minor_units(valuation["group_value"][i]),
+                    unrealized_pnl=from_minor_units(
+                        valuation["group_value"][i] - valuation["group_cost"][i]
+                    ),
+                    priced=valuation["priced"][i],
+                )
+            )
+        cash = valuation["cash"]
+        cost_basis = valuation["cost_basis"]
+        positions_value = valuation["positions_value"]
+        return [
+            AccountValuationOut(
+                account_id=account.id,
+                currency=account.currency,
+                cash=from_minor_units(cash[i]),
+                cost_basis=from_minor_units(cost_basis[i]),
+                positions_value=from_minor_units(positions_value[i]),
+                unrealized_pnl=from_minor_units(positions_value[i] - cost_basis[i]),
+                market_value=from_minor_units(cash[i] + positions_value[i]),
+                positions=account_positions[i],
+            )
+            for i, account in enumerate(accounts)
+        ]
+
+    def value_accounts(
+        self,
+        accounts: list[Account],
+        positions: list[tuple],
+        prices: dict[tuple[str, str, str], float] | None = None,
+        cross_rates: CrossRates | None = None,
+    ) -> list[AccountValuationOut]:
+        """
+        Value accounts.
+
+        Args:
+            accounts (list[Account]): accounts to value
+            positions (list[tuple]): rows of (account_id, instrument_type, instrument,
+                quantity, cost_basis in minor units) as returned by the account repository
+            prices (dict): current unit price in the account currency by
+                (account currency, instrument type, instrument)
+            cross_rates (CrossRates | None): prices currency positions missing from prices;
+                deposits are valued at their balance, other positions without a price
+                at cost
+
+        Returns:
+            list[AccountValuationOut]: valuation of every account, in the order of accounts
+        """
+        valuation = self.__value(accounts, positions, prices or {}, cross_rates)
+        return self.__account_outs(accounts, valuation)
+
+    def account_totals(
+        self,
+        accounts: list[Account],
+        positions: list[tuple],
+        cross_rates: CrossRates | None = None,
+        prices: dict[tuple[str, str, str], float] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Value accounts without building the valuation of every position.
+
+        Args:
+            accounts (list[Account]): accounts to value
+            positions (list[tuple]): rows as in value_accounts
+            cross_rates (CrossRates | None): rates as in value_accounts
+            prices (dict): prices as in value_accounts
+
+        Returns:
+            dict[str, np.ndarray]: cash, cost_basis and positions_value of every
+                account in int64 minor units, in the order of accounts
+        """
+        valuation = self.__value(accounts, positions, prices or {}, cross_rates)
+        return {
+            "cash": valuation["cash"],
+            "cost_basis": valuation["cost_basis"],
+            "positions_value": valuation["positions_value"],
+        }
+
+    def summarize(
+        self,
+        accounts: list[Account],
+        positions: list[tuple],
+        cross_rates: CrossRates,
+        base: str,
+        prices: dict[tuple[str, str, str], float] | None = None,
+    ) -> AccountsSummaryOut:
+        """
+        Value accounts and total them in one currency.
+
+        Args:
+            accounts (list[Account]): accounts to value
+            positions (list[tuple]): rows as in value_accounts
+            cross_rates (CrossRates): rates used for the currency positions and the totals
+            base (str): currency of the totals
+            prices (dict): prices as in value_accounts
+
+        Returns:
+            AccountsSummaryOut: totals in the base currency and valuation of every account
+        """
+        valuation = self.__value(accounts, positions, prices or {}, cross_rates)
+        # accounts x (cash, cost basis, positions value), converted in one operation
+        amounts = np.column_stack(
+            (
+                valuation["cash"],
+                valuation["cost_basis"],
+                valuation["positions_value"],
+            )
+        )
+        base_index = cross_rates.indices([base])[0]
+        converted = cross_rates.convert(
+            amounts,
+            valuation["account_currencies"][:, None],
+            np.full((len(accounts), 1), base_index),
+        )
+        converted_accounts = ~np.isnan(converted).any(axis=1)
+        cash, cost_basis, positions_value = (
+            np.rint(converted[converted_accounts]).astype(np.int64).sum(axis=0)
+        )
+        return AccountsSummaryOut(
+            base=base,
+            cash=from_minor_units(cash),
+            cost_basis=from_minor_units(cost_basis),
+            positions_value=from_minor_units(positions_value),
+            unrealized_pnl=from_minor_units(positions_value - cost_basis),
+            market_value=from_minor_units(cash + positions_value),
+            unconverted_account_ids=[
+                account.id
+                for account, converted in zip(accounts, converted_accounts)
+                if not converted
+            ],
+            accounts=self.__account_outs(accounts, valuation),
+        )
+
+
+valuation_engine = ValuationEngine()
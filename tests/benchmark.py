@@ -0,0 +1,39 @@
+import time
+from typing import Callable
+
+import numpy as np
+
+
+def measure(func: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    """
+    Time a function the way timeit does, keeping the best of the repeats.
+
+    Args:
+        func (Callable[[], object]): function to time
+        number (int): calls per repeat
+        repeat (int): repeats
+
+    Returns:
+        float: seconds per call
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def latency_summary(latencies: list[float]) -> str:
+    """
+    Format the median and tail of request latencies.
+
+    Args:
+        latencies (list[float]): seconds per request
+
+    Returns:
+        str: p50, p95 and p99 in milliseconds
+    """
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
@@ -0,0 +1,62 @@
+"""
+Throughput and latency of GET /accounts/ under concurrent clients.
+
+The requests go through the ASGI app on its own event loop, so they compete
+for the loop the way requests to one uvicorn worker do. Run once as is for
+the async driver and once with DATABASE_ASYNC=false for sessions run in the
+threadpool:
+
+    pytest tests/benchmarks/test_accounts_benchmark.py --benchmark
+    DATABASE_ASYNC=false pytest tests/benchmarks/test_accounts_benchmark.py --benchmark
+
+The numbers depend on the database; the test settings use SQLite.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import main
+from src.config.config import settings
+from src.config.constants import API
+from tests.benchmark import latency_summary
+
+pytestmark = pytest.mark.benchmark
+
+CLIENTS = 50
+REQUESTS = 2000
+
+
+def test_list_accounts_under_concurrent_clients(
+    client, headers, create_account, run, report
+):
+    for currency in ("PLN", "USD", "EUR"):
+        create_account(currency=currency)
+
+    async def load() -> tuple[float, list[float]]:
+        latencies: list[float] = []
+        requests = iter(range(REQUESTS))
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test", headers=headers
+        ) as http:
+
+            async def client_loop() -> None:
+                for _ in requests:
+                    start = time.perf_counter()
+                    response = await http.get(f"{API}/accounts/")
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop() for _ in range(CLIENTS)))
+            return time.perf_counter() - start, latencies
+
+    elapsed, latencies = run(load)
+    mode = "async" if settings.database_async else "threaded"
+    report(
+        f"GET /accounts/ [{mode} sessions] {CLIENTS} clients: "
+        f"{REQUESTS / elapsed:.0f} req/s, {latency_summary(latencies)}"
+    )
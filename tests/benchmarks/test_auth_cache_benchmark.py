@@ -0,0 +1,48 @@
+"""
+Cost of authenticating a request with the user cache cold and warm.
+
+A warm request must not touch the database at all; the benchmark fails if
+any of the warm requests runs a statement.
+"""
+
+import time
+
+import pytest
+
+from src.config.constants import API
+from src.services.auth import auth_service
+from tests.conftest import login
+from tests.query_count import query_count
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 500
+
+
+def test_authenticated_requests_cold_and_warm(client, run, report):
+    email = "auth-cache-benchmark@example.com"
+    headers = login(client, email)
+
+    def authenticated_requests(cold: bool) -> tuple[float, int]:
+        queries = 0
+        elapsed = 0.0
+        for _ in range(REQUESTS):
+            if cold:
+                run(auth_service.delete_user_from_cache, email)
+            start = time.perf_counter()
+            response = client.get(f"{API}/metrics/cache", headers=headers)
+            elapsed += time.perf_counter() - start
+            queries += query_count(response)
+        return elapsed / REQUESTS, queries
+
+    cold_time, cold_queries = authenticated_requests(cold=True)
+    warm_time, warm_queries = authenticated_requests(cold=False)
+    assert warm_queries == 0
+    report(
+        f"authenticated request, cold user cache: {cold_time * 1000:.2f} ms, "
+        f"{cold_queries / REQUESTS:.1f} queries per request"
+    )
+    report(
+        f"authenticated request, warm user cache: {warm_time * 1000:.2f} ms, "
+        f"{warm_queries / REQUESTS:.1f} queries per request"
+    )
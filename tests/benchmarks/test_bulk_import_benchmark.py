@@ -0,0 +1,60 @@
+"""
+10,000 trades imported with one bulk request against one request per trade.
+"""
+
+import time
+
+import pytest
+
+from src.config.constants import API
+from tests.test_transactions_page import asset_purchase
+
+pytestmark = pytest.mark.benchmark
+
+TRADES = 10000
+
+
+def test_bulk_import_against_single_requests(client, headers, create_account, report):
+    bulk_account = create_account(balance=10**6, currency="PLN")
+    single_account = create_account(balance=10**6, currency="EUR")
+
+    start = time.perf_counter()
+    response = client.post(
+        f"{API}/transactions/bulk",
+        json={
+            "transactions": [
+                asset_purchase(bulk_account, f"ASSET{i % 100}", 1)
+                for i in range(TRADES)
+            ]
+        },
+        headers=headers,
+    )
+    bulk = time.perf_counter() - start
+    assert response.json()["created"] == TRADES
+
+    start = time.perf_counter()
+    for i in range(TRADES):
+        trade = asset_purchase(single_account, f"ASSET{i % 100}", 1)
+        response = client.post(
+            f"{API}/assets/",
+            json={
+                "transaction_in": {
+                    "account_id": single_account,
+                    "amount": trade["amount"],
+                    "type": "INVESTMENT",
+                },
+                "asset": {
+                    "asset_name": trade["asset_name"],
+                    "purchase_share_price": trade["purchase_share_price"],
+                    "share_quantity": trade["share_quantity"],
+                },
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+    single = time.perf_counter() - start
+
+    report(
+        f"{TRADES:,} trades: bulk {bulk:.2f} s ({TRADES / bulk:,.0f} trades/s), "
+        f"single requests {single:.2f} s ({TRADES / single:,.0f} trades/s)"
+    )
@@ -0,0 +1,61 @@
+"""
+Throughput of RedisCache writes and reads one key at a time against the
+pipelined bulk methods.
+
+fakeredis stands in for Redis and has no network round trip, so it shows
+the client-side cost only; set REDIS_BENCHMARK_URL (for example
+redis://localhost:6379/15) to run against a real server, where the round
+trips saved by pipelining dominate.
+"""
+
+import asyncio
+import os
+import time
+
+import fakeredis
+import pytest
+from redis.asyncio import Redis
+
+from src.database.cache import RedisCache
+from src.database.serializers import OrjsonSerializer
+
+pytestmark = pytest.mark.benchmark
+
+KEYS = 10000
+VALUE = {"rate": 4.3275, "day": "2024-05-01"}
+
+
+def test_single_key_against_bulk_operations(report):
+    url = os.environ.get("REDIS_BENCHMARK_URL")
+
+    async def scenario() -> dict[str, float]:
+        redis = Redis.from_url(url) if url else fakeredis.FakeAsyncRedis()
+        cache = RedisCache(redis, OrjsonSerializer())
+        keys = [f"benchmark:{i}" for i in range(KEYS)]
+        timings = {}
+        try:
+            start = time.perf_counter()
+            for key in keys:
+                await cache.set_to_cache(key, VALUE, 60)
+            timings["set_to_cache"] = time.perf_counter() - start
+            start = time.perf_counter()
+            for key in keys:
+                await cache.get_from_cache(key)
+            timings["get_from_cache"] = time.perf_counter() - start
+            start = time.perf_counter()
+            await cache.set_many(dict.fromkeys(keys, VALUE), 60)
+            timings["set_many"] = time.perf_counter() - start
+            start = time.perf_counter()
+            values = await cache.get_many(keys)
+            timings["get_many"] = time.perf_counter() - start
+            assert values == [VALUE] * KEYS
+            start = time.perf_counter()
+            await cache.delete_many(keys)
+            timings["delete_many"] = time.perf_counter() - start
+        finally:
+            await redis.aclose()
+        return timings
+
+    target = "redis" if url else "fakeredis"
+    for name, elapsed in asyncio.run(scenario()).items():
+        report(f"{name} x{KEYS} [{target}]: {KEYS / elapsed:,.0f} keys/s")
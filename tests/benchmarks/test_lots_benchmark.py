@@ -0,0 +1,50 @@
+"""
+Cost of a sale as the number of open lots grows.
+
+LotQueue.take touches only the lots a sale consumes, so taking one lot
+should cost the same with a thousand or a million open. Through the API a
+sale loads only the purchases it consumes, but the query still reads every
+open purchase of the asset to find them, which shows as the lots grow.
+"""
+
+import time
+
+import pytest
+
+from src.config.constants import API
+from src.services.lots import LotQueue
+from tests.benchmark import measure
+from tests.test_lots import sale
+from tests.test_transactions_page import asset_purchase
+
+pytestmark = pytest.mark.benchmark
+
+SALES = 50
+
+
+def test_take_from_many_open_lots(report):
+    for lots in (1000, 100000, 1000000):
+        queue = LotQueue()
+        for lot_id in range(lots):
+            queue.push(lot_id, 1.0, 1.0, 100)
+        seconds = measure(lambda: queue.take(1.0), number=100, repeat=5)
+        report(f"LotQueue.take of one lot, {lots:,} open: {seconds * 1e6:.1f} us")
+
+
+def test_sale_against_many_open_lots(client, headers, create_account, report):
+    for lots, currency in ((100, "PLN"), (10000, "EUR")):
+        account_id = create_account(balance=10**6, currency=currency)
+        response = client.post(
+            f"{API}/transactions/bulk",
+            json={"transactions": [asset_purchase(account_id, "AAPL", 1)] * lots},
+            headers=headers,
+        )
+        assert response.json()["created"] == lots
+        start = time.perf_counter()
+        for _ in range(SALES):
+            response = client.post(
+                f"{API}/assets/sell", json=sale(account_id, 5, 1), headers=headers
+            )
+            assert response.status_code == 201, response.text
+        seconds = (time.perf_counter() - start) / SALES
+        report(f"sale of one share, {lots:,} open lots: {seconds * 1000:.1f} ms")
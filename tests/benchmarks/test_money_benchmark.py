@@ -0,0 +1,40 @@
+"""
+Summing 1,000,000 amounts as int64 minor units, as Decimal and as float.
+
+The valuation keeps money in int64 minor units so totals are exact and
+still summed at NumPy speed; Decimal is exact but summed one Python object
+at a time.
+"""
+
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.schemas.money import from_minor_units
+from tests.benchmark import measure
+
+pytestmark = pytest.mark.benchmark
+
+AMOUNTS = 1000000
+
+
+def test_aggregation_of_minor_units(report):
+    rng = random.Random(0)
+    minor_units = [rng.randrange(1, 10**8) for _ in range(AMOUNTS)]
+    decimals = [from_minor_units(amount) for amount in minor_units]
+    array = np.asarray(minor_units, dtype=np.int64)
+    floats = np.asarray([float(amount) for amount in decimals])
+
+    int64 = measure(lambda: array.sum())
+    decimal = measure(lambda: sum(decimals, Decimal(0)), repeat=3)
+    float64 = measure(lambda: floats.sum())
+
+    assert from_minor_units(array.sum()) == sum(decimals, Decimal(0))
+    report(
+        f"sum of {AMOUNTS:,} amounts: int64 minor units {int64 * 1000:.2f} ms, "
+        f"Decimal {decimal * 1000:.1f} ms ({decimal / int64:.0f}x), "
+        f"float64 {float64 * 1000:.2f} ms, off by "
+        f"{abs(Decimal(floats.sum()) - sum(decimals, Decimal(0))):.2e}"
+    )
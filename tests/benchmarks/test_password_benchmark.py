@@ -0,0 +1,78 @@
+"""
+Latency of account reads while logins hash passwords at a production cost.
+
+bcrypt runs in the worker pool of the password handler, so reads should
+keep their latency while logins are in flight, and logins beyond the queue
+limit should be answered with 503 instead of waiting. With SQLite the reads
+also wait for the database lock taken by the writes of the logins.
+"""
+
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+import main
+from src.config.constants import API
+from src.services.dependencies import password_handler
+from tests.benchmark import latency_summary
+from tests.conftest import PASSWORD, login
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 12
+READERS = 10
+READS = 500
+LOGINS = 20
+
+
+def test_account_reads_during_logins(client, create_account, run, report, monkeypatch):
+    monkeypatch.setattr(password_handler, "rounds", ROUNDS)
+    email = "bcrypt-benchmark@example.com"
+    headers = login(client, email)  # stored hash is upgraded to ROUNDS
+    client.post(
+        f"{API}/accounts/",
+        json={"currency": "PLN", "balance_investable_funds": 100},
+        headers=headers,
+    )
+
+    async def load(with_logins: bool) -> tuple[list[float], list[int], float]:
+        latencies: list[float] = []
+        statuses: list[int] = []
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+
+            async def reader() -> None:
+                for _ in range(READS // READERS):
+                    start = time.perf_counter()
+                    response = await http.get(f"{API}/accounts/", headers=headers)
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+
+            async def log_in() -> None:
+                response = await http.post(
+                    f"{API}/auth/login",
+                    data={"username": email, "password": PASSWORD},
+                    headers={"user-agent": "Mozilla/5.0"},
+                )
+                statuses.append(response.status_code)
+
+            start = time.perf_counter()
+            tasks = [reader() for _ in range(READERS)]
+            if with_logins:
+                tasks += [log_in() for _ in range(LOGINS)]
+            await asyncio.gather(*tasks)
+            return latencies, statuses, time.perf_counter() - start
+
+    idle, _, _ = run(load, False)
+    busy, statuses, elapsed = run(load, True)
+    report(f"GET /accounts/ alone: {latency_summary(idle)}")
+    report(
+        f"GET /accounts/ during {LOGINS} logins at cost {ROUNDS}: "
+        f"{latency_summary(busy)}; login statuses {dict(Counter(statuses))}, "
+        f"{elapsed:.2f} s"
+    )
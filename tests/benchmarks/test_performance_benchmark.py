@@ -0,0 +1,48 @@
+"""
+XIRR of 100 instruments and time-weighted returns solved over 10,000 and
+1,000,000 cash flows.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.performance import performance_engine
+from tests.benchmark import measure
+
+pytestmark = pytest.mark.benchmark
+
+SERIES = 100
+
+
+@pytest.mark.parametrize("cash_flows", [10000, 1000000])
+def test_performance_metrics(cash_flows, report):
+    rng = np.random.default_rng(0)
+    # money put in over five years, each series sold at a gain at the end
+    groups = np.concatenate(
+        (rng.integers(0, SERIES, cash_flows - SERIES), np.arange(SERIES))
+    )
+    years = np.concatenate((rng.uniform(0, 5, cash_flows - SERIES), np.full(SERIES, 5)))
+    amounts = -rng.uniform(10, 1000, cash_flows)
+    invested = np.bincount(groups, weights=-amounts, minlength=SERIES)
+    amounts[-SERIES:] = invested * rng.uniform(1.0, 2.0, SERIES)
+
+    days = np.arange(cash_flows // 10)
+    values = np.cumsum(rng.uniform(-1, 2, len(days))) + 10**6
+    flow_days = np.sort(rng.integers(0, len(days), cash_flows))
+    flows = rng.uniform(-100, 100, cash_flows)
+
+    rates = performance_engine.xirr(groups, years, amounts, SERIES)
+    assert not np.isnan(rates).any()
+    solve = measure(
+        lambda: performance_engine.xirr(groups, years, amounts, SERIES), repeat=3
+    )
+    twr = measure(
+        lambda: performance_engine.time_weighted_returns(
+            days, values, flow_days, flows
+        ),
+        repeat=3,
+    )
+    report(
+        f"{cash_flows:,} cash flows: XIRR of {SERIES} series {solve * 1000:.1f} ms, "
+        f"TWR over {len(days):,} days {twr * 1000:.1f} ms"
+    )
@@ -0,0 +1,78 @@
+"""
+Memory of the revoked token prefilter and the blacklist lookups it saves.
+
+Every authenticated request looks up the jti of its token in the blacklist.
+With the prefilter seeded, a token that was never revoked is answered
+without touching either cache tier.
+"""
+
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from src.config.config import settings
+from src.database.bloom import BloomFilter
+from src.database.cache import KeyPrefilter, LocalCache, RedisCache, TieredCache
+from src.database.cache_keys import BLACKLIST_KEY_PREFIX, blacklist_key
+from src.database.serializers import OrjsonSerializer
+
+pytestmark = pytest.mark.benchmark
+
+REVOKED = 10000
+LOOKUPS = 20000
+
+
+def test_prefilter_memory_per_revoked_token(report):
+    capacity = settings.revoked_token_filter_capacity
+    error_rate = settings.revoked_token_filter_error_rate
+    bloom = BloomFilter(capacity, error_rate)
+    for i in range(capacity):
+        bloom.add(blacklist_key(f"revoked-{i}"))
+    false_positives = (
+        sum(blacklist_key(f"valid-{i}") in bloom for i in range(LOOKUPS)) / LOOKUPS
+    )
+
+    report(
+        f"prefilter at {capacity:,} revoked tokens: {bloom.size_bytes / 1024:.0f} KiB, "
+        f"{bloom.size_bytes / capacity:.2f} B/token, "
+        f"false positives {false_positives:.4%} (target {error_rate:.4%})"
+    )
+    assert false_positives < 2 * error_rate
+
+
+def test_lookups_saved_by_the_prefilter(report):
+    async def scenario(with_prefilter: bool) -> tuple[float, int, dict]:
+        redis = fakeredis.FakeAsyncRedis()
+        await redis.mset({blacklist_key(f"revoked-{i}"): b"1" for i in range(REVOKED)})
+        prefilters = []
+        if with_prefilter:
+            prefilter = KeyPrefilter(
+                BLACKLIST_KEY_PREFIX,
+                settings.revoked_token_filter_capacity,
+                settings.revoked_token_filter_error_rate,
+            )
+            await prefilter.rebuild(redis)
+            prefilters.append(prefilter)
+        cache = TieredCache(
+            RedisCache(redis, OrjsonSerializer()),
+            LocalCache(settings.local_cache_max_size),
+            prefilters=prefilters,
+        )
+        start = time.perf_counter()
+        for i in range(LOOKUPS):  # a fresh access token per request
+            await cache.get_from_cache(blacklist_key(f"valid-{i}"))
+        elapsed = time.perf_counter() - start
+        stats = cache.stats()
+        await redis.aclose()
+        return elapsed, stats["redis"], stats["prefilters"]
+
+    for with_prefilter in (False, True):
+        elapsed, redis_stats, prefilter_stats = asyncio.run(scenario(with_prefilter))
+        saved = prefilter_stats[0]["skipped_lookups"] if prefilter_stats else 0
+        report(
+            f"blacklist lookups x{LOOKUPS} {'with' if with_prefilter else 'without'} "
+            f"prefilter: {elapsed / LOOKUPS * 1e6:.1f} us/lookup, "
+            f"{saved} answered by the prefilter, redis {redis_stats}"
+        )
@@ -0,0 +1,53 @@
+"""
+Payload size and encode/decode time of a cached user: the versioned orjson
+DTO against pickle of the ORM User instance it replaced.
+"""
+
+import pickle
+
+import pytest
+from sqlalchemy import select
+
+from src.database.db import SessionLocal
+from src.database.models import User
+from src.database.serializers import OrjsonSerializer
+from src.schemas.users import CachedUser
+from tests.benchmark import measure
+from tests.conftest import login
+
+pytestmark = pytest.mark.benchmark
+
+NUMBER = 10000
+
+
+def test_cached_user_payloads(client, report):
+    email = "serializer-benchmark@example.com"
+    login(client, email)
+    with SessionLocal() as session:
+        user = session.scalar(select(User).where(User.email == email))
+        session.expunge(user)
+    dto = CachedUser.model_validate(user)
+    serializer = OrjsonSerializer(schemas=[CachedUser])
+
+    pickled = pickle.dumps(user)
+    encoded = serializer.dumps(dto)
+    assert serializer.loads(encoded) == dto
+
+    for name, size, encode, decode in (
+        (
+            "pickle of ORM User",
+            len(pickled),
+            measure(lambda: pickle.dumps(user), NUMBER),
+            measure(lambda: pickle.loads(pickled), NUMBER),
+        ),
+        (
+            "orjson CachedUser",
+            len(encoded),
+            measure(lambda: serializer.dumps(dto), NUMBER),
+            measure(lambda: serializer.loads(encoded), NUMBER),
+        ),
+    ):
+        report(
+            f"{name}: {size} bytes, encode {encode * 1e6:.2f} us, "
+            f"decode {decode * 1e6:.2f} us"
+        )
@@ -0,0 +1,83 @@
+"""
+Login latency as the refresh_tokens table grows.
+
+The session cap counts the live sessions of one user, so with the index on
+(user_id, session_id) a login should cost the same with a few rows as with
+millions of sessions of other users. Set BENCHMARK_REFRESH_TOKENS to change
+the number of rows (1,000,000 by default).
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from src.config.constants import API
+from src.database.db import engine
+from src.database.models import RefreshToken, User
+from tests.benchmark import latency_summary
+from tests.conftest import PASSWORD, login
+
+pytestmark = pytest.mark.benchmark
+
+ROWS = int(os.environ.get("BENCHMARK_REFRESH_TOKENS", 1000000))
+BATCH = 50000
+LOGINS = 200
+
+
+def login_latencies(client, email: str) -> list[float]:
+    latencies = []
+    for _ in range(LOGINS):
+        start = time.perf_counter()
+        response = client.post(
+            f"{API}/auth/login",
+            data={"username": email, "password": PASSWORD},
+            headers={"user-agent": "Mozilla/5.0"},
+        )
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+        client.post(
+            f"{API}/auth/logout",
+            headers={"Authorization": f"Bearer {response.json()['access_token']}"},
+        )
+    return latencies
+
+
+def test_login_latency_with_many_sessions(client, report):
+    email = "sessions-benchmark@example.com"
+    other_email = "sessions-benchmark-other@example.com"
+    login(client, email)
+    login(client, other_email)
+    with engine.connect() as connection:
+        other_user = connection.scalar(select(User.id).where(User.email == other_email))
+
+    report(
+        f"login, few refresh_tokens: {latency_summary(login_latencies(client, email))}"
+    )
+
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+    with engine.begin() as connection:
+        for offset in range(0, ROWS, BATCH):
+            connection.execute(
+                insert(RefreshToken),
+                [
+                    {
+                        "user_id": other_user,
+                        "token": uuid.uuid4().hex,
+                        "session_id": uuid.uuid4().hex,
+                        "expires_at": expires_at,
+                    }
+                    for _ in range(min(BATCH, ROWS - offset))
+                ],
+            )
+    try:
+        latencies = login_latencies(client, email)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(
+                delete(RefreshToken).where(RefreshToken.user_id == other_user)
+            )
+    report(f"login, {ROWS:,} refresh_tokens: {latency_summary(latencies)}")
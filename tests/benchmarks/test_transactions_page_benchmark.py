@@ -0,0 +1,87 @@
+"""
+Latency of the first and of a deep page of an account's transactions.
+
+A keyset page is one range scan of the (account_id, created_at, id) index,
+so the last page of 20,000 transactions should cost the same as the first.
+The same page read with OFFSET is timed for comparison.
+"""
+
+import base64
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from sqlalchemy import bindparam, select, tuple_, update
+
+from src.config.constants import API
+from src.database.db import engine
+from src.database.models import Transaction
+from tests.benchmark import measure
+from tests.test_transactions_page import asset_purchase
+
+pytestmark = pytest.mark.benchmark
+
+transactions = Transaction.__table__
+
+TRANSACTIONS = 20000
+LIMIT = 50
+
+
+def test_first_and_deep_page(client, headers, create_account, report):
+    account_id = create_account(balance=10**7)
+    ids = []
+    for _ in range(TRANSACTIONS // 10000):
+        response = client.post(
+            f"{API}/transactions/bulk",
+            json={"transactions": [asset_purchase(account_id, "AAPL", 1)] * 10000},
+            headers=headers,
+        )
+        ids.extend(response.json()["transaction_ids"])
+    start = datetime(2024, 1, 1)
+    created_at = [start + timedelta(seconds=i) for i in range(TRANSACTIONS)]
+    with engine.begin() as connection:
+        connection.execute(
+            update(transactions)
+            .where(transactions.c.id == bindparam("transaction_id"))
+            .values(created_at=bindparam("value")),
+            [
+                {"transaction_id": transaction_id, "value": value}
+                for transaction_id, value in zip(ids, created_at)
+            ],
+        )
+    # the last row of the page before the deepest one, newest first
+    depth = TRANSACTIONS - LIMIT
+    after = LIMIT
+    cursor = base64.urlsafe_b64encode(
+        orjson.dumps([created_at[after].isoformat(), ids[after]])
+    ).decode("ascii")
+    url = f"{API}/accounts/{account_id}/transactions"
+
+    def page(params: dict) -> None:
+        response = client.get(url, params={"limit": LIMIT, **params}, headers=headers)
+        assert len(response.json()["items"]) == LIMIT, response.text
+
+    def query_page(keyset: bool) -> None:
+        statement = select(transactions).where(transactions.c.account_id == account_id)
+        if keyset:
+            statement = statement.where(
+                tuple_(transactions.c.created_at, transactions.c.id)
+                < tuple_(created_at[after], ids[after])
+            )
+        else:
+            statement = statement.offset(depth)
+        statement = statement.order_by(
+            transactions.c.created_at.desc(), transactions.c.id.desc()
+        ).limit(LIMIT)
+        with engine.connect() as connection:
+            assert len(connection.execute(statement).all()) == LIMIT
+
+    first = measure(lambda: page({}), number=20)
+    deep = measure(lambda: page({"cursor": cursor}), number=20)
+    keyset = measure(lambda: query_page(True), number=20)
+    offset = measure(lambda: query_page(False), number=20)
+    report(
+        f"transactions page of {LIMIT} out of {TRANSACTIONS:,}: first "
+        f"{first * 1000:.1f} ms, last {deep * 1000:.1f} ms; query of the last "
+        f"page by keyset {keyset * 1000:.2f} ms, by OFFSET {offset * 1000:.2f} ms"
+    )
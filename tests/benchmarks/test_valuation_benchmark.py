@@ -0,0 +1,77 @@
+"""
+Valuation of 100,000 positions spread over many accounts in one pass.
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.config.constants import INSTRUMENT_ASSET, INSTRUMENT_CURRENCY
+from src.database.models import Account
+from src.services.cross_rates import CrossRates
+from src.services.valuation import valuation_engine
+from tests.benchmark import measure
+
+pytestmark = pytest.mark.benchmark
+
+POSITIONS = 100000
+ACCOUNTS = 1000
+CURRENCIES = ("PLN", "EUR", "USD")
+
+
+def test_valuation_of_100k_positions(report):
+    rng = random.Random(0)
+    cross_rates = CrossRates(CURRENCIES, np.array([1.0, 4.3, 4.0]), date(2024, 5, 1))
+    accounts = [
+        Account(
+            id=i,
+            currency=CURRENCIES[i % len(CURRENCIES)],
+            balance_investable_funds=Decimal("1000.00"),
+        )
+        for i in range(ACCOUNTS)
+    ]
+    instruments = [f"ASSET{i}" for i in range(500)]
+    positions = [
+        (
+            rng.randrange(ACCOUNTS),
+            INSTRUMENT_ASSET if i % 4 else INSTRUMENT_CURRENCY,
+            rng.choice(instruments) if i % 4 else rng.choice(CURRENCIES),
+            rng.uniform(1, 100),
+            rng.randrange(100, 10**7),
+        )
+        for i in range(POSITIONS)
+    ]
+    prices = {
+        (currency, INSTRUMENT_ASSET, instrument): rng.uniform(1, 500)
+        for currency in CURRENCIES
+        for instrument in instruments
+    }
+
+    for name, func in (
+        (
+            "value_accounts",
+            lambda: valuation_engine.value_accounts(
+                accounts, positions, prices, cross_rates
+            ),
+        ),
+        (
+            "account_totals",
+            lambda: valuation_engine.account_totals(
+                accounts, positions, cross_rates, prices
+            ),
+        ),
+        (
+            "summarize",
+            lambda: valuation_engine.summarize(
+                accounts, positions, cross_rates, "PLN", prices
+            ),
+        ),
+    ):
+        seconds = measure(func, repeat=3)
+        report(
+            f"{name}, {POSITIONS:,} positions in {ACCOUNTS:,} accounts: "
+            f"{seconds * 1000:.0f} ms"
+        )
@@ -0,0 +1,169 @@
+"""
+Shared fixtures.
+
+The settings are read from the environment when src is imported, so the
+defaults below are set first. The tests run against a throwaway SQLite
+database and an in-memory Redis stand-in, and need neither server.
+"""
+
+import os
+import tempfile
+import uuid
+
+DATABASE_FILE = os.path.join(tempfile.gettempdir(), "investment-tracker-tests.sqlite")
+
+for name, value in {
+    "DATABASE_NAME": "tests",
+    "DATABASE_USERNAME": "tests",
+    "DATABASE_PASSWORD": "tests",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "SQLALCHEMY_DATABASE_URL": f"sqlite:///{DATABASE_FILE}",
+    "ASYNC_SQLALCHEMY_DATABASE_URL": f"sqlite+aiosqlite:///{DATABASE_FILE}",
+    "SECRET_KEY": "tests-secret-key-of-at-least-32-bytes",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "15",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "tests",
+    "MAIL_USERNAME": "tests",
+    "MAIL_PASSWORD": "tests",
+    "MAIL_FROM": "tests@example.com",
+    "MAIL_PORT": "465",
+    "MAIL_SERVER": "localhost",
+    "MAIL_FROM_NAME": "tests",
+    "MAIL_STARTTLS": "false",
+    "MAIL_SSL_TLS": "true",
+    "USE_CREDENTIALS": "true",
+    "VALIDATE_CERTS": "false",
+    "BCRYPT_ROUNDS": "4",
+    "QUERY_COUNT_HEADER": "true",
+}.items():
+    os.environ.setdefault(name, value)
+
+if os.path.exists(DATABASE_FILE):
+    os.remove(DATABASE_FILE)
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+import main
+from src.config.constants import API
+from src.database import dependencies
+from src.database.db import engine
+from src.database.models import Base, User
+from src.services.email import FastApiEmailService
+
+PASSWORD = "Passw0rd!x"
+
+benchmark_results: list[str] = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the micro-benchmarks marked with @pytest.mark.benchmark",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if benchmark_results:
+        terminalreporter.section("benchmarks")
+        for line in benchmark_results:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture
+def report():
+    """
+    Add a line to the benchmark results printed at the end of the run.
+    """
+    return benchmark_results.append
+
+
+@pytest.fixture(scope="session")
+def client():
+    async def send_email(*args, **kwargs):
+        pass
+
+    Base.metadata.create_all(engine)
+    dependencies.cache.remote.redis_connection = fakeredis.FakeAsyncRedis()
+    FastApiEmailService.send_email = send_email
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def run(client):
+    """
+    Run a coroutine function on the event loop of the application, where its
+    database and Redis connections live.
+    """
+    return client.portal.call
+
+
+def login(client: TestClient, email: str | None = None) -> dict:
+    """
+    Sign up a confirmed user and log in.
+
+    Args:
+        client (TestClient): client of the application
+        email (str | None): email of the user, a new one if None
+
+    Returns:
+        dict: Authorization header of the user
+    """
+    email = email or f"{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post(
+        f"{API}/auth/signup",
+        json={
+            "username": email.split("@")[0],
+            "email": email,
+            "password": {"password": PASSWORD},
+        },
+    )
+    assert response.status_code in (201, 409), response.text
+    with engine.begin() as connection:
+        connection.execute(
+            update(User).where(User.email == email).values(is_confirmed=True)
+        )
+    response = client.post(
+        f"{API}/auth/login",
+        data={"username": email, "password": PASSWORD},
+        headers={"user-agent": "Mozilla/5.0"},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def headers(client) -> dict:
+    return login(client)
+
+
+@pytest.fixture
+def create_account(client, headers):
+    def create_account(balance: float = 100000.0, currency: str = "PLN") -> int:
+        response = client.post(
+            f"{API}/accounts/",
+            json={"currency": currency, "balance_investable_funds": balance},
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["account"]["id"]
+
+    return create_account
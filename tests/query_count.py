@@ -0,0 +1,38 @@
+from typing import Callable
+
+from src.database.query_counter import QUERY_COUNT_HEADER
+
+
+def query_count(response) -> int:
+    """
+    Number of SQL statements run for a response, reported by the application
+    when settings.query_count_header is enabled.
+
+    Args:
+        response: response of the test client
+
+    Returns:
+        int: statement count
+    """
+    return int(response.headers[QUERY_COUNT_HEADER])
+
+
+def assert_constant_query_count(
+    run: Callable[[int], int], sizes: tuple[int, ...] = (1, 10, 50)
+) -> None:
+    """
+    Fail if the number of statements grows with the number of rows, which is
+    how N+1 loading of a list endpoint shows up.
+
+    Args:
+        run (Callable[[int], int]): prepares n rows, calls the endpoint and returns its statement count
+        sizes (tuple[int, ...]): numbers of rows to try
+
+    Raises:
+        AssertionError: statement counts differ between sizes
+    """
+    counts = {size: run(size) for size in sizes}
+    if len(set(counts.values())) > 1:
+        raise AssertionError(
+            f"Statement count depends on the number of rows (rows: statements): {counts}"
+        )
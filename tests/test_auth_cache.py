@@ -0,0 +1,38 @@
+from src.config.config import settings
+from src.config.constants import API
+from src.database import dependencies
+from src.database.cache_keys import CACHE_KEY_PREFIX, user_key
+from src.services.auth import auth_service
+from tests.conftest import login
+from tests.query_count import query_count
+
+
+def test_user_key_is_namespaced_and_versioned():
+    assert user_key("a@example.com") == f"{CACHE_KEY_PREFIX}:user:a@example.com"
+    assert CACHE_KEY_PREFIX.startswith("investment-tracker:v")
+
+
+def test_authenticated_request_runs_no_query_on_a_warm_cache(client, run, monkeypatch):
+    email = "warm-cache@example.com"
+    monkeypatch.setattr(settings, "metrics_emails", [email])
+    headers = login(client, email)
+    run(auth_service.delete_user_from_cache, email)
+
+    cold = client.get(f"{API}/metrics/cache", headers=headers)
+    warm = client.get(f"{API}/metrics/cache", headers=headers)
+
+    assert cold.status_code == warm.status_code == 200
+    assert query_count(cold) == 1
+    assert query_count(warm) == 0
+
+
+def test_user_is_cached_under_the_key_it_is_read_from(client, run):
+    email = "cache-key@example.com"
+    headers = login(client, email)
+    run(auth_service.delete_user_from_cache, email)
+    client.get(f"{API}/metrics/cache", headers=headers)
+
+    redis = dependencies.cache.remote.redis_connection
+    assert run(redis.exists, user_key(email)) == 1
+    run(auth_service.delete_user_from_cache, email)
+    assert run(redis.exists, user_key(email)) == 0
@@ -0,0 +1,114 @@
+from src.config.constants import API
+from tests.conftest import login
+from tests.test_transactions_page import asset_purchase, currency_purchase
+
+
+def bulk(client, headers, items: list[dict]) -> dict:
+    response = client.post(
+        f"{API}/transactions/bulk", json={"transactions": items}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def errors(result: dict) -> dict[int, str]:
+    return {error["index"]: error["detail"] for error in result["errors"]}
+
+
+def balance(client, headers, account_id: int) -> float:
+    response = client.get(f"{API}/accounts/{account_id}", headers=headers)
+    return float(response.json()["balance_investable_funds"])
+
+
+def withdrawal(account_id: int, currency: str, amount: float) -> dict:
+    return {**currency_purchase(account_id, currency, amount), "type": "WITHDRAW"}
+
+
+def test_items_are_checked_against_a_running_balance(client, headers, create_account):
+    account_id = create_account(balance=100)
+
+    result = bulk(
+        client,
+        headers,
+        [
+            currency_purchase(account_id, "EUR", 60),
+            currency_purchase(account_id, "EUR", 60),
+            withdrawal(account_id, "EUR", 40),
+            currency_purchase(account_id, "EUR", 60),
+        ],
+    )
+
+    assert result["created"] == 3
+    assert errors(result) == {1: "Insufficient funds"}
+    assert result["transaction_ids"][1] is None
+    assert balance(client, headers, account_id) == 20
+
+
+def test_withdrawals_are_checked_against_holdings(client, headers, create_account):
+    account_id = create_account(balance=100)
+    bulk(client, headers, [currency_purchase(account_id, "EUR", 40)])  # 10 EUR
+
+    result = bulk(
+        client,
+        headers,
+        [
+            withdrawal(account_id, "EUR", 44),
+            withdrawal(account_id, "USD", 4),
+            withdrawal(account_id, "EUR", 24),
+            withdrawal(account_id, "EUR", 16),
+            withdrawal(account_id, "EUR", 4),
+        ],
+    )
+
+    assert result["created"] == 2
+    assert errors(result) == {
+        0: "Insufficient holdings",
+        1: "Insufficient holdings",
+        4: "Insufficient holdings",
+    }
+
+
+def test_invalid_items_are_rejected_one_by_one(client, headers, create_account):
+    account_id = create_account(balance=100)
+    mismatched = {**asset_purchase(account_id, "AAPL", 2), "amount": 11}
+
+    result = bulk(
+        client,
+        headers,
+        [
+            currency_purchase(account_id, "EUR", 0),
+            currency_purchase(account_id, "EUR", -5),
+            mismatched,
+            asset_purchase(account_id, "AAPL", 2),
+            currency_purchase(account_id + 10**6, "EUR"),
+        ],
+    )
+
+    assert result["created"] == 1
+    assert sorted(errors(result)) == [0, 1, 2, 4]
+    assert errors(result)[4] == "Account not found"
+    assert balance(client, headers, account_id) == 90
+
+
+def test_accounts_of_other_users_are_rejected(client, headers, create_account):
+    account_id = create_account(balance=100)
+
+    result = bulk(client, login(client), [currency_purchase(account_id, "EUR")])
+
+    assert errors(result) == {0: "You are not authorized to perform this action"}
+
+
+def test_batch_without_accepted_items_writes_nothing(client, headers, create_account):
+    account_id = create_account(balance=10)
+
+    result = bulk(
+        client,
+        headers,
+        [currency_purchase(account_id, "EUR", 20), withdrawal(account_id, "EUR", 1)],
+    )
+    page = client.get(f"{API}/accounts/{account_id}/transactions", headers=headers)
+
+    assert result["created"] == 0
+    assert result["transaction_ids"] == [None, None]
+    assert page.json()["items"] == []
+    assert balance(client, headers, account_id) == 10
@@ -0,0 +1,98 @@
+import asyncio
+
+import fakeredis
+
+from src.database.cache import KeyPrefilter, LocalCache, RedisCache, TieredCache
+from src.database.dependencies import get_redis, redis_pool
+from src.database.serializers import OrjsonSerializer
+
+
+def redis_cache() -> RedisCache:
+    return RedisCache(fakeredis.FakeAsyncRedis(), OrjsonSerializer())
+
+
+def test_set_stores_the_value_with_its_expiry():
+    async def scenario():
+        cache = redis_cache()
+        await cache.set_to_cache("key", {"a": 1}, 60)
+        return (
+            await cache.get_from_cache("key"),
+            await cache.redis_connection.ttl("key"),
+        )
+
+    value, ttl = asyncio.run(scenario())
+    assert value == {"a": 1}
+    assert 0 < ttl <= 60
+
+
+def test_bulk_operations():
+    async def scenario():
+        cache = redis_cache()
+        await cache.set_many({"a": 1, "b": [2], "c": "3"}, 60)
+        found = await cache.get_many(["a", "missing", "b", "c"])
+        ttls = [await cache.redis_connection.ttl(key) for key in "abc"]
+        await cache.delete_many(["a", "c"])
+        left = await cache.get_many(["a", "b", "c"])
+        empty = await cache.get_many([])
+        return found, ttls, left, empty
+
+    found, ttls, left, empty = asyncio.run(scenario())
+    assert found == [1, None, [2], "3"]
+    assert all(0 < ttl <= 60 for ttl in ttls)
+    assert left == [None, [2], None]
+    assert empty == []
+
+
+def test_tiered_cache_serves_local_copies_and_drops_them_on_write():
+    async def scenario():
+        remote = redis_cache()
+        cache = TieredCache(remote, LocalCache(100), local_ttl=60, negative_ttl=60)
+        await cache.set_to_cache("key", 1, 60)
+        await cache.get_from_cache("key")
+        await remote.set_to_cache("key", 2, 60)  # written by another worker
+        stale = await cache.get_from_cache("key")
+        await cache.set_to_cache("key", 3, 60)
+        fresh = await cache.get_from_cache("key")
+        return stale, fresh
+
+    assert asyncio.run(scenario()) == (1, 3)
+
+
+def test_local_cache_evicts_the_least_recently_used():
+    cache = LocalCache(max_size=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get("a")
+    cache.set("c", 3, 60)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.evictions == 1
+
+
+def test_redis_clients_share_one_pool():
+    assert get_redis().connection_pool is redis_pool
+    assert get_redis().connection_pool is get_redis().connection_pool
+
+
+def test_misses_under_a_prefilter_prefix_are_not_cached_locally():
+    async def scenario():
+        remote = redis_cache()
+        prefilter = KeyPrefilter("blacklist:", 100, 0.001)
+        cache = TieredCache(
+            remote,
+            LocalCache(100),
+            local_ttl=60,
+            negative_ttl=60,
+            prefilters=[prefilter],
+        )
+        await cache.get_from_cache("blacklist:token")
+        await cache.get_many(["blacklist:other", "user:a"])
+        # blacklisted by another worker, its invalidation not received yet
+        await remote.set_to_cache("blacklist:token", "blacklisted", 60)
+        await remote.set_to_cache("user:a", 1, 60)
+        return (
+            await cache.get_from_cache("blacklist:token"),
+            await cache.get_many(["blacklist:token", "user:a"]),
+        )
+
+    assert asyncio.run(scenario()) == ("blacklisted", ["blacklisted", None])
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.database.cache import LocalCache
+from src.services.auth import AuthService
+
+
+def auth_service() -> AuthService:
+    return AuthService(cache=None, claims_cache=LocalCache(100))
+
+
+def test_verified_claims_are_served_from_the_cache():
+    service = auth_service()
+    token, _ = asyncio.run(service.create_refresh_token({"sub": "a@example.com"}))
+
+    assert asyncio.run(service.decode_refresh_token(token)) == "a@example.com"
+    assert asyncio.run(service.decode_refresh_token(token)) == "a@example.com"
+    assert (service.claims_cache.misses, service.claims_cache.hits) == (1, 1)
+
+
+def test_claims_are_not_cached_past_the_expiry_of_the_token():
+    service = auth_service()
+    token, _ = asyncio.run(
+        service.create_refresh_token(
+            {"sub": "a@example.com"}, expires_delta=timedelta(seconds=1)
+        )
+    )
+    asyncio.run(service.decode_refresh_token(token))
+    time.sleep(1.1)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.decode_refresh_token(token))
+    assert error.value.status_code == 401
+
+
+def test_tampered_token_is_verified_again():
+    service = auth_service()
+    token, _ = asyncio.run(service.create_refresh_token({"sub": "a@example.com"}))
+    asyncio.run(service.decode_refresh_token(token))
+    header, payload, signature = token.split(".")
+    tampered = f"{header}.{payload}.{signature[::-1]}"
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.decode_refresh_token(tampered))
+    assert error.value.status_code == 401
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.services.cross_rates import CrossRateMatrix, CrossRates
+
+
+class FakeRateService:
+    def __init__(self, rates: dict[str, float]) -> None:
+        self.rates = rates
+        self.calls = 0
+
+    async def get_rates(self, pairs: list[tuple[str, str]], day: date) -> dict:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {(base, quote): self.rates[base] for base, quote in pairs}
+
+
+def test_matrix_is_derived_from_the_rates_to_the_pivot():
+    cross_rates = CrossRates(
+        ("PLN", "EUR", "USD"), np.array([1.0, 4.3, 4.0]), date(2024, 5, 1)
+    )
+
+    assert np.allclose(np.diag(cross_rates.matrix), 1.0)
+    assert cross_rates.matrix[1, 0] == pytest.approx(4.3)
+    assert cross_rates.matrix[0, 2] == pytest.approx(0.25)
+    assert cross_rates.matrix[1, 2] == pytest.approx(4.3 / 4.0)
+    assert not cross_rates.matrix.flags.writeable
+
+
+def test_convert_many_amounts_at_once():
+    cross_rates = CrossRates(
+        ("PLN", "EUR", "USD"), np.array([1.0, np.nan, 4.0]), date(2024, 5, 1)
+    )
+    base = cross_rates.indices(["USD", "PLN", "EUR", "GBP"])
+
+    converted = cross_rates.convert(np.array([10.0, 8.0, 1.0, 1.0]), base, 0)
+
+    assert base.tolist() == [2, 0, 1, -1]
+    assert converted[:2].tolist() == [40.0, 8.0]
+    assert np.isnan(converted[2:]).all()  # unknown rate, unsupported currency
+
+
+def test_matrix_is_rebuilt_only_when_the_rates_change():
+    rate_service = FakeRateService({"EUR": 4.3, "USD": 4.0})
+    matrix = CrossRateMatrix(rate_service, ("PLN", "EUR", "USD"), ttl=0)
+
+    async def scenario():
+        first = await matrix.get()
+        same = await matrix.get()
+        rate_service.rates["USD"] = 4.1
+        changed = await matrix.get()
+        return first, same, changed
+
+    first, same, changed = asyncio.run(scenario())
+    assert same is first
+    assert changed is not first
+    assert changed.matrix[2, 0] == pytest.approx(4.1)
+    assert first.matrix[2, 0] == pytest.approx(4.0)  # readers keep their matrix
+    assert matrix.rebuilds == 2
+
+
+def test_concurrent_readers_share_one_rebuild():
+    rate_service = FakeRateService({"EUR": 4.3, "USD": 4.0})
+    matrix = CrossRateMatrix(rate_service, ("PLN", "EUR", "USD"), ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(*(matrix.get() for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert all(result is results[0] for result in results)
+    assert rate_service.calls == 1
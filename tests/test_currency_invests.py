@@ -0,0 +1,37 @@
+from src.config.constants import API
+from tests.query_count import assert_constant_query_count, query_count
+
+
+def test_list_currency_invests_query_count_is_constant(client, headers, create_account):
+    account_id = create_account()
+    created = 0
+
+    def run(n: int) -> int:
+        nonlocal created
+        response = client.post(
+            f"{API}/transactions/bulk",
+            json={
+                "transactions": [
+                    {
+                        "account_id": account_id,
+                        "amount": 1,
+                        "type": "INVESTMENT",
+                        "currency": "EUR",
+                        "purchase_exchange_rate": 0.25,
+                    }
+                ]
+                * (n - created)
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        created = n
+        response = client.get(
+            f"{API}/currencies/", params={"account_id": account_id}, headers=headers
+        )
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == n
+        assert all(len(item["transactions"]) == 1 for item in response.json())
+        return query_count(response)
+
+    assert_constant_query_count(run, sizes=(1, 5, 25, 100))
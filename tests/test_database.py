@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import select
+
+from src.config.config import settings
+from src.database.db import (
+    AsyncSessionLocal,
+    SessionLocal,
+    ThreadedSession,
+    new_session,
+    session_scope,
+)
+from src.database.models import Transaction
+from src.repositories.accounts import PostgresAccountRepo
+
+
+async def account_ids(session, user_id: int) -> list[int]:
+    try:
+        accounts = await PostgresAccountRepo(session).get_accounts(user_id)
+        return sorted(account.id for account in accounts)
+    finally:
+        await session.close()
+
+
+def test_new_session_follows_settings():
+    session = new_session()
+    expected = AsyncSessionLocal.class_ if settings.database_async else ThreadedSession
+    assert isinstance(session, expected)
+
+
+def test_threaded_and_async_sessions_read_the_same_rows(
+    client, headers, create_account, run
+):
+    ids = sorted(
+        create_account(currency=currency) for currency in ("PLN", "USD", "EUR")
+    )
+    user_id = client.get("/api/v1/accounts/", headers=headers).json()[0]["user_id"]
+
+    assert run(account_ids, ThreadedSession(SessionLocal()), user_id) == ids
+    if AsyncSessionLocal is not None:
+        assert run(account_ids, AsyncSessionLocal(), user_id) == ids
+
+
+def test_threaded_session_streams_partitions(client, headers, create_account, run):
+    account_id = create_account()
+    response = client.post(
+        "/api/v1/transactions/bulk",
+        json={
+            "transactions": [
+                {
+                    "account_id": account_id,
+                    "amount": 1,
+                    "type": "INVESTMENT",
+                    "currency": "EUR",
+                    "purchase_exchange_rate": 0.25,
+                }
+            ]
+            * 7
+        },
+        headers=headers,
+    )
+    assert response.json()["created"] == 7
+
+    async def read_partitions() -> list[int]:
+        session = ThreadedSession(SessionLocal())
+        try:
+            result = await session.stream(
+                select(Transaction.id)
+                .where(Transaction.account_id == account_id)
+                .execution_options(yield_per=3)
+            )
+            return [len(partition) async for partition in result.partitions()]
+        finally:
+            await session.close()
+
+    assert run(read_partitions) == [3, 3, 1]
+
+
+def test_session_scope_rolls_back_on_error(client, headers, create_account, run):
+    account_id = create_account(balance=10)
+
+    async def fail() -> None:
+        async with session_scope() as db:
+            account = await PostgresAccountRepo(db).get_account_by_id(account_id)
+            account.balance_investable_funds = 0
+            await db.flush()
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run(fail)
+    response = client.get(f"/api/v1/accounts/{account_id}", headers=headers)
+    assert response.json()["balance_investable_funds"] == 10
@@ -0,0 +1,247 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from src.config.constants import API
+from src.database.db import engine
+from src.database.models import Deposit, Transaction
+from src.services.deposits import AccrualEngine, AccrualWriter, accrual_engine
+from tests.conftest import login
+
+OPENED_AT = datetime(2023, 1, 1, 9, tzinfo=timezone.utc)
+MATURITY = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "compounding, interest",
+    [
+        ("simple", 5000),
+        ("daily", 5127),
+        ("monthly", 5116),
+        ("quarterly", 5095),
+        ("annually", 5000),
+    ],
+)
+def test_one_year_at_five_percent(compounding, interest):
+    accrual = accrual_engine.accrue(
+        [(1, 100000, 5.0, compounding, OPENED_AT, MATURITY)], date(2024, 1, 1)
+    )
+    assert accrual["interest"].tolist() == [interest]
+    assert accrual["matured"].tolist() == [True]
+
+
+def test_started_period_earns_simple_interest():
+    # one whole quarter and 35 days of the next one
+    interest = accrual_engine.interest(
+        np.array([100000]), np.array([0.05]), np.array([4]), np.array([100])
+    )
+    assert interest.tolist() == [round(100000 * (0.0125 + 1.0125 * 0.0125 * 35 / 365))]
+
+
+def test_accrual_stops_at_maturity_and_starts_at_opening():
+    terms = [
+        (1, 100000, 5.0, "simple", OPENED_AT, MATURITY),
+        (2, 100000, 5.0, "simple", OPENED_AT, datetime(2025, 1, 1)),
+        (3, 100000, 5.0, "simple", datetime(2024, 6, 1), datetime(2025, 1, 1)),
+        (4, 100000, 5.0, "simple", datetime(2024, 8, 1), datetime(2025, 1, 1)),
+    ]
+
+    accrual = accrual_engine.accrue(terms, date(2024, 7, 1))
+
+    # 365, 547 and 30 days at 5% a year, nothing before the opening
+    assert accrual["interest"].tolist() == [5000, 7493, 411, 0]
+    assert accrual["matured"].tolist() == [True, False, False, False]
+    assert accrual["accrued_on"][0] == MATURITY.date().toordinal()
+
+
+def test_value_deposits_totals():
+    terms = [
+        (1, 100000, 5.0, "simple", OPENED_AT, MATURITY),
+        (2, 250050, 4.0, "monthly", OPENED_AT, MATURITY),
+    ]
+
+    value = accrual_engine.value_deposits(7, terms, date(2023, 7, 2))
+
+    assert value.account_id == 7
+    assert value.principal == Decimal("3500.50")
+    assert value.accrued_interest == sum(
+        deposit.accrued_interest for deposit in value.deposits
+    )
+    assert value.value == value.principal + value.accrued_interest
+    assert not any(deposit.matured for deposit in value.deposits)
+
+
+def test_no_deposits():
+    value = AccrualEngine().value_deposits(7, [], date(2024, 1, 1))
+    assert value.deposits == []
+    assert value.value == Decimal("0.00")
+
+
+def open_deposit(client, headers, account_id: int, amount, **deposit):
+    return client.post(
+        f"{API}/deposits/",
+        json={
+            "transaction_in": {
+                "account_id": account_id,
+                "amount": amount,
+                "type": "INVESTMENT",
+            },
+            "deposit": {
+                "interest_rate": 5.0,
+                "maturity_date": (
+                    datetime.now(timezone.utc) + timedelta(days=365)
+                ).isoformat(),
+                **deposit,
+            },
+        },
+        headers=headers,
+    )
+
+
+@pytest.mark.parametrize("amount", [-100, 0])
+def test_deposit_needs_a_positive_amount(client, headers, create_account, amount):
+    account_id = create_account(balance=100)
+
+    response = open_deposit(client, headers, account_id, amount)
+
+    assert response.status_code == 422
+    account = client.get(f"{API}/accounts/{account_id}", headers=headers).json()
+    assert account["balance_investable_funds"] == 100
+
+
+def update_deposit(deposit_id: int, opened_at: datetime, **values) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            update(Transaction)
+            .where(Transaction.deposit_id == deposit_id)
+            .values(created_at=opened_at)
+        )
+        if values:
+            connection.execute(
+                update(Deposit).where(Deposit.id == deposit_id).values(**values)
+            )
+
+
+def get_deposit(client, headers, deposit_id: int) -> dict:
+    response = client.get(f"{API}/deposits/{deposit_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_deposit_routes(client, headers, create_account):
+    account_id = create_account(balance=1000)
+
+    response = open_deposit(client, headers, account_id, 400, compounding="monthly")
+
+    assert response.status_code == 201, response.text
+    deposit = response.json()["deposit"]
+    assert deposit["compounding"] == "monthly"
+    assert deposit["accrued_interest"] == 0
+    assert deposit["accrued_on"] is None
+    assert [t["amount"] for t in deposit["transactions"]] == [400]
+    account = client.get(f"{API}/accounts/{account_id}", headers=headers).json()
+    assert account["balance_investable_funds"] == 600
+    assert get_deposit(client, headers, deposit["id"])["transactions"] == (
+        deposit["transactions"]
+    )
+    response = client.get(
+        f"{API}/deposits/", params={"account_id": account_id}, headers=headers
+    )
+    assert [d["id"] for d in response.json()] == [deposit["id"]]
+
+    response = client.get(
+        f"{API}/deposits/value", params={"account_id": account_id}, headers=headers
+    )
+    assert response.json()["principal"] == 400
+    assert response.json()["accrued_interest"] == 0
+
+
+@pytest.mark.parametrize(
+    "amount, deposit, detail",
+    [
+        (2000, {}, "Insufficient funds"),
+        (
+            100,
+            {"maturity_date": "2020-01-01T00:00:00"},
+            "Maturity date must be in the future",
+        ),
+    ],
+)
+def test_deposit_is_refused(client, headers, create_account, amount, deposit, detail):
+    account_id = create_account(balance=1000)
+
+    response = open_deposit(client, headers, account_id, amount, **deposit)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_deposit_of_another_user(client, headers, create_account):
+    account_id = create_account(balance=1000)
+    deposit_id = open_deposit(client, headers, account_id, 100).json()["deposit"]["id"]
+
+    response = client.get(f"{API}/deposits/{deposit_id}", headers=login(client))
+    assert response.status_code == 403
+
+    response = client.get(f"{API}/deposits/{deposit_id + 1000}", headers=headers)
+    assert response.status_code == 404
+
+
+def test_accrual_writer_skips_accrued_and_matured_deposits(
+    client, headers, create_account, run
+):
+    account_id = create_account(balance=3000)
+    deposit_ids = [
+        open_deposit(client, headers, account_id, 1000).json()["deposit"]["id"]
+        for _ in range(3)
+    ]
+    today = datetime.now(timezone.utc).date()
+    year_ago = datetime.now(timezone.utc) - timedelta(days=365)
+    matured = year_ago + timedelta(days=73)
+    update_deposit(deposit_ids[0], year_ago)
+    # accrued today by an earlier run
+    update_deposit(
+        deposit_ids[1], year_ago, accrued_interest=Decimal("7.00"), accrued_on=today
+    )
+    # accrued up to its maturity
+    update_deposit(
+        deposit_ids[2],
+        year_ago,
+        maturity_date=matured,
+        accrued_interest=Decimal("1.23"),
+        accrued_on=matured.date(),
+    )
+    writer = AccrualWriter(batch_size=1)
+
+    assert run(writer.run_once) >= 1
+    # the second run of a day finds nothing to do
+    assert run(writer.run_once) == 0
+
+    deposits = [get_deposit(client, headers, i) for i in deposit_ids]
+    assert [d["accrued_interest"] for d in deposits] == [50, 7, 1.23]
+    assert [d["accrued_on"] for d in deposits] == [
+        today.isoformat(),
+        today.isoformat(),
+        matured.date().isoformat(),
+    ]
+    assert writer.stats()["runs"] == 2
+    assert writer.stats()["last_deposits"] == 0
+
+
+def test_valuation_includes_the_accrued_interest(client, headers, create_account, run):
+    account_id = create_account(balance=1000)
+    deposit_id = open_deposit(client, headers, account_id, 1000).json()["deposit"]["id"]
+    update_deposit(deposit_id, datetime.now(timezone.utc) - timedelta(days=365))
+    run(AccrualWriter().run_once)
+
+    response = client.get(f"{API}/accounts/{account_id}/valuation", headers=headers)
+
+    [position] = response.json()["positions"]
+    assert position["instrument"] == str(deposit_id)
+    assert position["cost_basis"] == 1000
+    assert position["market_value"] == 1050
+    assert position["unrealized_pnl"] == 50
+    assert position["priced"] is True
@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from src.config.constants import API
+from src.schemas.assets import CostMethodEnum
+from src.services.lots import LotMatcher, LotQueue
+
+
+def test_parts_of_a_lot_add_up_to_its_cost():
+    queue = LotQueue()
+    queue.push(1, 3.0, 3.0, 1000)
+
+    costs = [queue.take(1.0)[0] for _ in range(3)]
+
+    assert costs == [333, 334, 333]
+    assert queue.cost == 0
+    assert len(queue) == 0
+
+
+def test_random_sales_add_up_to_the_purchase_costs():
+    rng = random.Random(0)
+    queue = LotQueue()
+    total = 0
+    for lot_id in range(50):
+        cost = rng.randrange(1, 10**6)
+        queue.push(lot_id, 7.0, 7.0, cost)
+        total += cost
+
+    taken = 0
+    while len(queue):
+        taken += queue.take(rng.uniform(0.1, 20.0))[0]
+
+    assert taken == total
+    assert queue.quantity == 0.0
+
+
+def test_take_touches_only_the_lots_it_consumes():
+    queue = LotQueue()
+    for lot_id in range(5):
+        queue.push(lot_id, 2.0, 2.0, 200)
+
+    cost, matches = queue.take(3.0)
+
+    assert cost == 300
+    assert matches == [(0, 2.0, 0.0), (1, 1.0, 1.0)]
+    assert list(queue.open_lots()) == [(1, 1.0), (2, 2.0), (3, 2.0), (4, 2.0)]
+    assert queue.quantity == 7.0
+    assert queue.cost == 700
+
+
+def test_consumed_lots_are_compacted_before_the_arrays_grow():
+    queue = LotQueue(capacity=4)
+    for lot_id in range(4):
+        queue.push(lot_id, 1.0, 1.0, 100)
+    queue.take(3.0)
+
+    queue.push(4, 1.0, 1.0, 100)  # the live lot is moved to the front
+    assert len(queue._ids) == 4
+    assert queue._head == 0
+    for lot_id in range(5, 8):
+        queue.push(lot_id, 1.0, 1.0, 100)  # full of live lots, doubled
+    assert len(queue._ids) == 8
+    assert [lot_id for lot_id, _ in queue.open_lots()] == [3, 4, 5, 6, 7]
+
+
+def test_fully_sold_lots_are_not_opened():
+    queue = LotQueue()
+    queue.push(1, 2.0, 0.0, 200)
+    queue.push(2, 2.0, 0.5, 200)
+    assert list(queue.open_lots()) == [(2, 0.5)]
+    assert queue.cost == 50
+
+
+@pytest.mark.parametrize(
+    "method, cost_basis",
+    [(CostMethodEnum.FIFO, 1000), (CostMethodEnum.AVERAGE, 1500)],
+)
+def test_cost_methods(method, cost_basis):
+    matcher = LotMatcher(method)
+    matcher.buy("AAPL", 1, 1.0, 1000)
+    matcher.buy("AAPL", 2, 1.0, 2000)
+
+    sale = matcher.sell("AAPL", 1.0, 3000)
+    rest = matcher.sell("AAPL", 1.0, 3000)
+
+    assert sale.cost_basis == cost_basis
+    assert sale.realized_pnl == 3000 - cost_basis
+    assert sale.matches == [(1, 1.0, 0.0)]
+    assert sale.cost_basis + rest.cost_basis == 3000
+    assert list(matcher.open_lots()) == []
+
+
+def trade(account_id: int, price: float, quantity: float, amount=None) -> dict:
+    return {
+        "transaction_in": {
+            "account_id": account_id,
+            "amount": price * quantity if amount is None else amount,
+            "type": "INVESTMENT",
+        },
+        "asset": {
+            "asset_name": "AAPL",
+            "purchase_share_price": price,
+            "share_quantity": quantity,
+        },
+    }
+
+
+def sale(account_id: int, price: float, quantity: float, amount=None) -> dict:
+    body = trade(account_id, price, quantity, amount)
+    body["transaction_in"]["type"] = "WITHDRAW"
+    body["asset"] = {
+        "asset_name": "AAPL",
+        "share_price": price,
+        "share_quantity": quantity,
+    }
+    return body
+
+
+def test_sell_asset(client, headers, create_account):
+    account_id = create_account(balance=1000)
+    for price in (10, 20):
+        response = client.post(
+            f"{API}/assets/", json=trade(account_id, price, 2), headers=headers
+        )
+        assert response.status_code == 201, response.text
+
+    response = client.post(
+        f"{API}/assets/sell", json=sale(account_id, 30, 3), headers=headers
+    )
+
+    assert response.status_code == 201, response.text
+    result = response.json()
+    assert result["cost_basis"] == 40.0
+    assert result["realized_pnl"] == 50.0
+    assert [lot["current_share_quantity"] for lot in result["lots"]] == [0.0, 1.0]
+
+
+def test_sale_is_rejected(client, headers, create_account):
+    account_id = create_account(balance=1000)
+    client.post(f"{API}/assets/", json=trade(account_id, 10, 2), headers=headers)
+
+    oversold = client.post(
+        f"{API}/assets/sell", json=sale(account_id, 10, 3), headers=headers
+    )
+    mismatched = client.post(
+        f"{API}/assets/sell", json=sale(account_id, 10, 1, amount=11), headers=headers
+    )
+
+    assert oversold.status_code == 400
+    assert oversold.json()["detail"] == "Insufficient shares"
+    assert mismatched.status_code == 400
+    assert mismatched.json()["detail"] == (
+        "Amount must equal share price times share quantity"
+    )
@@ -0,0 +1,28 @@
+import pytest
+
+from src.config.config import settings
+from src.config.constants import API
+from tests.conftest import login
+
+ENDPOINTS = ["pool", "cache", "token_reaper", "rates", "snapshots", "accruals"]
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_metrics_need_an_ops_user(client, headers, endpoint):
+    response = client.get(f"{API}/metrics/{endpoint}", headers=headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_metrics_of_an_ops_user(client, monkeypatch, endpoint):
+    email = "ops@example.com"
+    monkeypatch.setattr(settings, "metrics_emails", [email])
+
+    response = client.get(f"{API}/metrics/{endpoint}", headers=login(client, email))
+
+    assert response.status_code == 200, response.text
+
+
+def test_metrics_need_a_login(client):
+    assert client.get(f"{API}/metrics/cache").status_code == 401
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.accounts import AccountIn
+from src.schemas.money import apply_rate, from_minor_units, to_minor_units, to_money
+
+
+@pytest.mark.parametrize(
+    "amount, expected",
+    [
+        (Decimal("0.125"), Decimal("0.12")),
+        (Decimal("0.135"), Decimal("0.14")),
+        (Decimal("-0.125"), Decimal("-0.12")),
+        (0.1 + 0.2, Decimal("0.30")),
+        (2.675, Decimal("2.68")),  # the float repr, not its binary value
+        (7, Decimal("7.00")),
+    ],
+)
+def test_to_money_rounds_half_to_even(amount, expected):
+    assert to_money(amount) == expected
+    assert to_money(amount).as_tuple().exponent == -2
+
+
+def test_apply_rate_rounds_once():
+    assert apply_rate(Decimal("100.00"), 0.2345) == Decimal("23.45")
+    assert apply_rate(Decimal("0.10"), 0.25) == Decimal("0.02")
+    assert apply_rate(Decimal("0.30"), 0.25) == Decimal("0.08")
+
+
+def test_minor_units_round_trip():
+    assert to_minor_units(Decimal("1234.56")) == 123456
+    assert to_minor_units(0.1 + 0.2) == 30
+    assert from_minor_units(123456) == Decimal("1234.56")
+    assert from_minor_units(to_minor_units(Decimal("-0.01"))) == Decimal("-0.01")
+    large = 10**16 + 1  # past the exact range of float64
+    assert to_minor_units(from_minor_units(large)) == large
+
+
+def test_money_fields_are_exact():
+    assert AccountIn(
+        currency="PLN", balance_investable_funds=19.99
+    ).balance_investable_funds == Decimal("19.99")
+    assert AccountIn(
+        currency="PLN", balance_investable_funds="0.10"
+    ).balance_investable_funds == Decimal("0.10")
+    with pytest.raises(ValidationError):
+        AccountIn(currency="PLN", balance_investable_funds="0.001")
+    with pytest.raises(ValidationError):
+        AccountIn(currency="PLN", balance_investable_funds="-0.01")
@@ -0,0 +1,91 @@
+import asyncio
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+
+from src.database.db import engine
+from src.database.models import User
+from src.services.dependencies import password_handler
+from src.services.password import BcryptPasswordHandler
+from tests.conftest import PASSWORD, login
+
+
+@pytest.fixture
+def handler():
+    handler = BcryptPasswordHandler(
+        rounds=4, executor_type="thread", workers=1, max_queue=1
+    )
+    yield handler
+    handler.shutdown()
+
+
+def test_hash_and_verify(handler):
+    hashed = asyncio.run(handler.hash_password("secret"))
+    assert hashed.startswith("$2b$04$")
+    assert asyncio.run(handler.verify_password("secret", hashed))
+    assert not asyncio.run(handler.verify_password("other", hashed))
+
+
+def test_needs_rehash(handler):
+    handler.rounds = 5
+    assert handler.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(4)).decode())
+    assert not handler.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(5)).decode())
+    assert handler.needs_rehash("not a bcrypt hash")
+
+
+def test_stronger_hash_is_not_rehashed(handler):
+    assert not handler.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(6)).decode())
+
+
+def test_requests_over_the_queue_limit_are_rejected(handler):
+    async def hash_many() -> list:
+        return await asyncio.gather(
+            *(handler.hash_password("secret") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(hash_many())
+    assert all(isinstance(result, str) for result in results[:2])
+    assert isinstance(results[2], HTTPException)
+    assert results[2].status_code == 503
+    assert handler.pending == 0
+
+
+def store_hash(email: str, rounds: int) -> str:
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode()
+    with engine.begin() as connection:
+        connection.execute(
+            update(User).where(User.email == email).values(password=hashed)
+        )
+    return hashed
+
+
+def stored_hash(email: str) -> str:
+    with engine.connect() as connection:
+        return connection.scalar(select(User.password).where(User.email == email))
+
+
+def test_login_upgrades_an_outdated_hash(client, monkeypatch):
+    email = "rehash@example.com"
+    login(client, email)
+    outdated = store_hash(email, 4)
+    monkeypatch.setattr(password_handler, "rounds", 5)
+
+    login(client, email)
+
+    stored = stored_hash(email)
+    assert stored != outdated
+    assert stored.startswith("$2b$05$")
+    assert bcrypt.checkpw(PASSWORD.encode(), stored.encode())
+
+
+def test_login_keeps_a_stronger_hash(client):
+    email = "stronger-hash@example.com"
+    login(client, email)
+    stronger = store_hash(email, password_handler.rounds + 1)
+
+    login(client, email)
+
+    assert stored_hash(email) == stronger
@@ -0,0 +1,143 @@
+import math
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.database.models import Account, AccountSnapshot
+from src.schemas.valuations import AccountValuationOut, PositionValuationOut
+from src.services.performance import PerformanceEngine, performance_engine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def xirr(series: list[list[tuple[float, float]]], engine=performance_engine):
+    groups, years, amounts = [], [], []
+    for group, flows in enumerate(series):
+        for year, amount in flows:
+            groups.append(group)
+            years.append(year)
+            amounts.append(amount)
+    return engine.xirr(
+        np.asarray(groups), np.asarray(years), np.asarray(amounts), len(series)
+    )
+
+
+def test_xirr_of_many_series_at_once():
+    rates = xirr(
+        [
+            [(0, -100), (1, 110)],
+            [(0, -100), (2, 121)],
+            [(0, -100), (0.5, -100), (1, 205)],
+            [(0, -100), (1, 50)],
+        ]
+    )
+
+    assert rates[0] == pytest.approx(0.10)
+    assert rates[1] == pytest.approx(0.10)
+    npv = -100 - 100 / (1 + rates[2]) ** 0.5 + 205 / (1 + rates[2])
+    assert npv == pytest.approx(0, abs=1e-6)
+    assert rates[3] == pytest.approx(-0.50)
+
+
+def test_xirr_without_a_sign_change_has_no_solution():
+    rates = xirr([[(0, -100), (1, -10)], [(0, 100)], [(0, -100), (1, 110)]])
+
+    assert np.isnan(rates[:2]).all()
+    assert rates[2] == pytest.approx(0.10)
+
+
+def test_xirr_falls_back_to_bisection():
+    rates = xirr([[(0, -100), (1, 110)]], PerformanceEngine(max_iterations=0))
+    assert rates[0] == pytest.approx(0.10, abs=1e-8)
+
+
+def test_time_weighted_returns_take_out_cash_flows():
+    days = np.array([1, 2, 3, 4])
+    values = np.array([100, 110, 220, 0])
+    # 100 invested on day 3 is not a gain; flows on the first day are before it
+    returns = PerformanceEngine.time_weighted_returns(
+        days, values, np.array([1, 3]), np.array([50, 100])
+    )
+
+    assert returns == pytest.approx([0.10, 120 / 110 - 1, -1.0])
+    assert (
+        len(PerformanceEngine.time_weighted_returns(days[:1], values[:1], [], [])) == 0
+    )
+
+
+def position(instrument_type: str, instrument: str, market_value: str):
+    return PositionValuationOut(
+        instrument_type=instrument_type,
+        instrument=instrument,
+        quantity=1.0,
+        cost_basis=Decimal(0),
+        market_value=Decimal(market_value),
+        unrealized_pnl=Decimal(market_value),
+        priced=True,
+    )
+
+
+def test_account_performance():
+    account = Account(id=1, currency="PLN")
+    cash_flows = [
+        ("ASSET", "AAPL", 10000, START),
+        ("CURRENCY", "EUR", 5000, START),
+    ]
+    snapshots = [
+        AccountSnapshot(day=date(2024, 1, 1), positions_value=Decimal("150.00")),
+        AccountSnapshot(day=date(2024, 1, 2), positions_value=Decimal("165.00")),
+        AccountSnapshot(day=date(2024, 1, 3), positions_value=Decimal("148.50")),
+    ]
+    valuation = AccountValuationOut(
+        account_id=1,
+        currency="PLN",
+        cash=Decimal(0),
+        cost_basis=Decimal("150.00"),
+        positions_value=Decimal("160.00"),
+        unrealized_pnl=Decimal("10.00"),
+        market_value=Decimal("160.00"),
+        positions=[
+            position("ASSET", "AAPL", "110.00"),
+            position("CURRENCY", "EUR", "50.00"),
+        ],
+    )
+
+    performance = performance_engine.account_performance(
+        account, cash_flows, snapshots, valuation, START + timedelta(days=365.25)
+    )
+
+    assert performance.invested == Decimal("150.00")
+    assert performance.xirr == pytest.approx(160 / 150 - 1)
+    instruments = {item.instrument: item for item in performance.instruments}
+    assert instruments["AAPL"].xirr == pytest.approx(0.10)
+    assert instruments["EUR"].xirr == pytest.approx(0.0, abs=1e-9)
+    assert performance.twr == pytest.approx(1.1 * 0.9 - 1)
+    assert performance.max_drawdown == pytest.approx(-0.1)
+    assert performance.volatility == pytest.approx(
+        np.std([0.1, -0.1], ddof=1) * math.sqrt(365)
+    )
+    assert performance.days == 2
+
+
+def test_account_performance_without_history():
+    valuation = AccountValuationOut(
+        account_id=1,
+        currency="PLN",
+        cash=Decimal(0),
+        cost_basis=Decimal(0),
+        positions_value=Decimal(0),
+        unrealized_pnl=Decimal(0),
+        market_value=Decimal(0),
+        positions=[],
+    )
+
+    performance = performance_engine.account_performance(
+        Account(id=1, currency="PLN"), [], [], valuation, START
+    )
+
+    assert performance.xirr is None
+    assert performance.twr is None
+    assert performance.max_drawdown is None
+    assert performance.instruments == []
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from src.commands.rebuild_positions import rebuild_positions
+from src.config.constants import API, INSTRUMENT_CURRENCY
+from src.database.db import session_scope
+from src.repositories.positions import PostgresPositionRepo
+from tests.test_deposits import open_deposit
+from tests.test_lots import sale, trade
+from tests.test_transactions_page import bulk_import, currency_purchase
+
+
+async def apply_trades(trades: list[tuple]) -> None:
+    async with session_scope() as db:
+        await PostgresPositionRepo(db).apply_trades(trades)
+        await db.commit()
+
+
+async def get_positions(account_id: int) -> list[tuple]:
+    async with session_scope() as db:
+        rows = await PostgresPositionRepo(db).get_positions([account_id])
+        return sorted(
+            (instrument_type, instrument, round(quantity, 9), cost_basis)
+            for _, instrument_type, instrument, quantity, cost_basis in rows
+        )
+
+
+def test_trades_update_their_position(client, create_account, run):
+    account_id = create_account()
+    run(
+        apply_trades,
+        [
+            (account_id, INSTRUMENT_CURRENCY, "EUR", 10.0, Decimal("40.00")),
+            (account_id, INSTRUMENT_CURRENCY, "EUR", 5.0, Decimal("20.00")),
+        ],
+    )
+    run(
+        apply_trades,
+        [(account_id, INSTRUMENT_CURRENCY, "EUR", -3.0, Decimal("-12.00"))],
+    )
+
+    assert run(get_positions, account_id) == [(INSTRUMENT_CURRENCY, "EUR", 12.0, 4800)]
+
+
+def test_rebuild_reproduces_the_live_positions(client, headers, create_account, run):
+    account_id = create_account(balance=1000)
+    bulk_import(
+        client,
+        headers,
+        [
+            currency_purchase(account_id, "EUR", 40),
+            currency_purchase(account_id, "USD", 20),
+            {**currency_purchase(account_id, "EUR", 12), "type": "WITHDRAW"},
+        ],
+    )
+    for price in (10, 20):
+        client.post(f"{API}/assets/", json=trade(account_id, price, 2), headers=headers)
+    response = client.post(
+        f"{API}/assets/sell", json=sale(account_id, 30, 3), headers=headers
+    )
+    assert response.status_code == 201, response.text
+    assert open_deposit(client, headers, account_id, 100).status_code == 201
+    live = run(get_positions, account_id)
+
+    rebuilt = run(rebuild_positions, [account_id])
+
+    assert rebuilt == len(live) == 4
+    assert run(get_positions, account_id) == live
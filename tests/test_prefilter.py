@@ -0,0 +1,91 @@
+import asyncio
+
+import fakeredis
+import jwt
+
+from src.config.constants import API
+from src.database import dependencies
+from src.database.bloom import BloomFilter
+from src.database.cache import KeyPrefilter, LocalCache, RedisCache, TieredCache
+from src.database.cache_keys import BLACKLIST_KEY_PREFIX, blacklist_key
+from src.database.serializers import OrjsonSerializer
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    added = [f"added:{i}" for i in range(10000)]
+    for item in added:
+        bloom.add(item)
+
+    assert all(item in bloom for item in added)
+    false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+    assert false_positives < 10000 * 0.02
+
+
+def test_prefilter_skips_keys_it_has_never_seen():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis()
+        await redis.set(f"{BLACKLIST_KEY_PREFIX}revoked", "blacklisted")
+        prefilter = KeyPrefilter(BLACKLIST_KEY_PREFIX, 100, 0.001)
+        before = prefilter.might_contain(f"{BLACKLIST_KEY_PREFIX}valid")
+        prefilter.connected = True  # as set by the invalidation listener
+        await prefilter.rebuild(redis)
+        return prefilter, before
+
+    prefilter, before = asyncio.run(scenario())
+    assert before  # not seeded yet, every key may exist
+    assert prefilter.ready
+    assert prefilter.might_contain(f"{BLACKLIST_KEY_PREFIX}revoked")
+    assert not prefilter.might_contain(f"{BLACKLIST_KEY_PREFIX}valid")
+    prefilter.add(f"{BLACKLIST_KEY_PREFIX}valid")
+    assert prefilter.might_contain(f"{BLACKLIST_KEY_PREFIX}valid")
+    assert (prefilter.checked_lookups, prefilter.skipped_lookups) == (3, 1)
+
+
+def test_saturated_prefilter_is_rebuilt_but_not_ready_while_disconnected():
+    async def scenario():
+        remote = RedisCache(fakeredis.FakeAsyncRedis(), OrjsonSerializer())
+        prefilter = KeyPrefilter(BLACKLIST_KEY_PREFIX, 2, 0.001)
+        cache = TieredCache(remote, LocalCache(100), prefilters=[prefilter])
+        keys = [f"{BLACKLIST_KEY_PREFIX}{i}" for i in range(3)]
+        for key in keys:
+            await cache.set_to_cache(key, "blacklisted", 60)
+        await asyncio.gather(*cache._rebuilds)
+        disconnected = prefilter.ready
+
+        prefilter.connected = True
+        await prefilter.rebuild(remote.redis_connection)
+        return prefilter, keys, disconnected
+
+    prefilter, keys, disconnected = asyncio.run(scenario())
+    assert not disconnected
+    assert prefilter.ready
+    assert prefilter.stats()["keys"] == 3
+    assert all(prefilter.might_contain(key) for key in keys)
+
+
+def test_bytes_per_key_is_measured_on_the_added_keys():
+    prefilter = KeyPrefilter(BLACKLIST_KEY_PREFIX, 1000, 0.001)
+    size = prefilter.stats()["size_bytes"]
+    assert prefilter.stats()["bytes_per_key"] == size
+
+    for i in range(10):
+        prefilter.add(f"{BLACKLIST_KEY_PREFIX}{i}")
+
+    assert prefilter.stats()["bytes_per_key"] == size / 10
+
+
+def test_logged_out_token_is_rejected_until_it_expires(client, run, headers):
+    token = headers["Authorization"].removeprefix("Bearer ")
+    jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+    prefilter = dependencies.cache.prefilters[0]
+
+    assert client.get(f"{API}/accounts/", headers=headers).status_code == 200
+    assert prefilter.ready
+    assert client.post(f"{API}/auth/logout", headers=headers).status_code == 200
+    assert client.get(f"{API}/accounts/", headers=headers).status_code == 401
+
+    redis = dependencies.cache.remote.redis_connection
+    ttl = run(redis.ttl, blacklist_key(jti))
+    assert 0 < ttl <= 15 * 60 + 1
+    assert prefilter.might_contain(blacklist_key(jti))
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.database.db import session_scope
+from src.repositories.exchange_rates import PostgresExchangeRateRepo
+from src.services.rates import CsvRateProvider, RateService
+
+
+class DictCache:
+    def __init__(self) -> None:
+        self.values = {}
+
+    async def get_from_cache(self, key: str):
+        return self.values.get(key)
+
+    async def set_to_cache(self, key: str, value, ttl: int) -> None:
+        self.values[key] = value
+
+
+class FakeRateProvider:
+    def __init__(self, rate: float | None) -> None:
+        self.rate = rate
+        self.calls = []
+
+    async def get_rate(self, base: str, quote: str, day: date) -> float | None:
+        self.calls.append((base, quote, day))
+        await asyncio.sleep(0.01)
+        return self.rate
+
+
+async def stored_rate(base: str, quote: str, day: date) -> float | None:
+    async with session_scope() as db:
+        return await PostgresExchangeRateRepo(db).get_rate(base, quote, day)
+
+
+async def store_rate(base: str, quote: str, day: date, rate: float) -> None:
+    async with session_scope() as db:
+        await PostgresExchangeRateRepo(db).add_rate(base, quote, day, rate)
+
+
+def test_concurrent_lookups_share_one_fetch(client, run):
+    provider = FakeRateProvider(4.3)
+    service = RateService(provider, cache=DictCache())
+    today = datetime.now(timezone.utc).date()
+
+    async def lookups():
+        return await asyncio.gather(*(service.get_rate("EUR", "PLN") for _ in range(5)))
+
+    assert run(lookups) == [4.3] * 5
+    assert provider.calls == [("EUR", "PLN", today)]
+    assert service.stats() == {
+        "lookups": 5,
+        "coalesced_lookups": 4,
+        "provider_calls": 1,
+        "in_flight": 0,
+    }
+    # the next lookup is a cache hit
+    assert run(service.get_rate, "EUR", "PLN") == 4.3
+    assert len(provider.calls) == 1
+
+
+def test_past_rates_are_read_from_the_table(client, run):
+    day = date(2001, 2, 3)
+    run(store_rate, "USD", "PLN", day, 4.1)
+    provider = FakeRateProvider(9.9)
+    service = RateService(provider, cache=DictCache())
+
+    assert run(service.get_rate, "USD", "PLN", day) == 4.1
+    assert provider.calls == []
+
+
+def test_fetched_rates_are_stored(client, run):
+    day = date(2001, 2, 4)
+    provider = FakeRateProvider(4.2)
+
+    assert run(RateService(provider, cache=DictCache()).get_rate, "EUR", "USD", day)
+    assert run(stored_rate, "EUR", "USD", day) == 4.2
+
+    # a new worker with an empty cache does not fetch it again
+    assert run(RateService(provider, cache=DictCache()).get_rate, "EUR", "USD", day)
+    assert len(provider.calls) == 1
+
+
+def test_unknown_rate_is_neither_cached_nor_stored(client, run):
+    day = date(2001, 2, 5)
+    cache = DictCache()
+    service = RateService(FakeRateProvider(None), cache=cache)
+
+    assert run(service.get_rates, [("EUR", "PLN"), ("PLN", "PLN")], day) == {
+        ("PLN", "PLN"): 1.0
+    }
+    assert cache.values == {}
+    assert run(stored_rate, "EUR", "PLN", day) is None
+
+
+@pytest.fixture
+def csv_provider(tmp_path) -> CsvRateProvider:
+    path = tmp_path / "rates.csv"
+    path.write_text(
+        "day,base,quote,rate\n"
+        "2024-05-02,EUR,PLN,4.25\n"
+        "2024-05-01,EUR,PLN,4.3\n"
+        "2024-05-01,USD,PLN,4.0\n"
+    )
+    return CsvRateProvider(str(path))
+
+
+@pytest.mark.parametrize(
+    "base, quote, day, rate",
+    [
+        ("EUR", "PLN", date(2024, 5, 1), 4.3),
+        ("EUR", "PLN", date(2024, 5, 10), 4.25),
+        ("PLN", "EUR", date(2024, 5, 2), 1 / 4.25),
+        ("PLN", "USD", date(2024, 5, 3), 0.25),
+        ("EUR", "PLN", date(2024, 4, 30), None),
+        ("EUR", "USD", date(2024, 5, 1), None),
+    ],
+)
+def test_csv_provider(csv_provider, base, quote, day, rate):
+    assert asyncio.run(csv_provider.get_rate(base, quote, day)) == rate
+
+
+def test_missing_csv_file_has_no_rates(tmp_path):
+    provider = CsvRateProvider(str(tmp_path / "missing.csv"))
+    assert asyncio.run(provider.get_rate("EUR", "PLN", date(2024, 5, 1))) is None
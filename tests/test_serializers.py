@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from src.database.serializers import OrjsonSerializer, PickleSerializer
+from src.schemas.users import CachedUser
+
+USER = CachedUser(
+    id=1,
+    username="user",
+    email="user@example.com",
+    created_at=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    updated_at=None,
+    is_confirmed=True,
+)
+
+
+def test_schema_round_trip():
+    serializer = OrjsonSerializer(schemas=[CachedUser])
+    payload = serializer.dumps(USER)
+    assert payload.startswith(OrjsonSerializer.VERSION + OrjsonSerializer.SCHEMA)
+    assert serializer.loads(payload) == USER
+
+
+def test_plain_value_round_trip():
+    serializer = OrjsonSerializer()
+    value = {"rate": 4.25, "items": [1, 2], "note": None}
+    assert serializer.loads(serializer.dumps(value)) == value
+
+
+def test_other_format_version_is_a_miss():
+    serializer = OrjsonSerializer(schemas=[CachedUser])
+    payload = serializer.dumps(USER)
+    assert serializer.loads(b"\x00" + payload[1:]) is None
+
+
+def test_unregistered_schema_is_a_miss():
+    payload = OrjsonSerializer(schemas=[CachedUser]).dumps(USER)
+    assert OrjsonSerializer().loads(payload) is None
+
+
+def test_pickle_serializer_round_trip():
+    serializer = PickleSerializer()
+    assert serializer.loads(serializer.dumps(USER)) == USER
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from src.config.constants import MAX_ACTIVE_SESSIONS
+from src.database.db import engine, session_scope
+from src.database.models import RefreshToken, User
+from src.repositories.tokens import PostgresTokenRepo
+from src.services.token_reaper import TokenReaper
+from tests.conftest import login
+
+
+def user_id(client) -> int:
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    login(client, email)
+    with engine.connect() as connection:
+        return connection.scalar(select(User.id).where(User.email == email))
+
+
+async def add_sessions(user_id: int, expires_at: datetime, count: int) -> list[bool]:
+    async with session_scope() as db:
+        token_repo = PostgresTokenRepo(db)
+        return [
+            await token_repo.add_refresh_token(
+                uuid.uuid4().hex, user_id, uuid.uuid4().hex, expires_at
+            )
+            for _ in range(count)
+        ]
+
+
+async def count_sessions(user_id: int) -> int:
+    async with session_scope() as db:
+        return len(await PostgresTokenRepo(db).get_refresh_tokens(user_id))
+
+
+def test_sessions_are_capped(client, run):
+    user = user_id(client)  # logging in opened the first session
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+
+    added = run(add_sessions, user, expires_at, MAX_ACTIVE_SESSIONS)
+
+    assert added == [True] * (MAX_ACTIVE_SESSIONS - 1) + [False]
+    assert run(count_sessions, user) == MAX_ACTIVE_SESSIONS
+
+
+def test_expired_sessions_do_not_count(client, run):
+    user = user_id(client)
+    expired_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+
+    added = run(add_sessions, user, expired_at, MAX_ACTIVE_SESSIONS)
+
+    assert added == [True] * MAX_ACTIVE_SESSIONS
+    assert run(add_sessions, user, expires_at, 1) == [True]
+
+
+def test_reaper_deletes_only_expired_sessions(client, run):
+    user = user_id(client)
+    run(add_sessions, user, datetime.now(timezone.utc) - timedelta(minutes=1), 3)
+
+    purged = run(TokenReaper(batch_size=2).run_once)
+
+    assert purged >= 3
+    with engine.connect() as connection:
+        left = connection.scalars(
+            select(RefreshToken.expires_at).where(RefreshToken.user_id == user)
+        ).all()
+    assert len(left) == 1  # the session of the login
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from src.config.constants import API
+from src.database.db import session_scope
+from src.repositories.snapshots import PostgresSnapshotRepo
+from src.services.cross_rates import CrossRates
+from src.services.snapshots import SnapshotWriter, period_start
+
+
+class FixedCrossRates:
+    async def get(self) -> CrossRates:
+        return CrossRates(
+            ("PLN", "EUR", "USD"), np.array([1.0, 4.3, 4.0]), date(2024, 5, 1)
+        )
+
+
+def snapshot_rows(account_id: int, day: date, cash: str) -> list[dict]:
+    return [
+        {
+            "account_id": account_id,
+            "interval": interval,
+            "period_start": period_start(day, interval),
+            "day": day,
+            "cash": Decimal(cash),
+            "cost_basis": Decimal(0),
+            "positions_value": Decimal(0),
+        }
+        for interval in SnapshotWriter.INTERVALS
+    ]
+
+
+async def add_snapshots(rows: list[dict]) -> None:
+    async with session_scope() as db:
+        await PostgresSnapshotRepo(db).add_snapshots(rows)
+
+
+def history(client, headers, account_id: int, **params) -> list[tuple]:
+    response = client.get(
+        f"{API}/accounts/{account_id}/history", params=params, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return [
+        (point["period_start"], point["day"], point["cash"])
+        for point in response.json()["points"]
+    ]
+
+
+def test_period_start():
+    day = date(2024, 5, 16)  # a Thursday
+    assert period_start(day, "day") == day
+    assert period_start(day, "week") == date(2024, 5, 13)
+    assert period_start(day, "month") == date(2024, 5, 1)
+
+
+def test_run_once_rolls_every_account_up(client, headers, create_account, run):
+    account_id = create_account(balance=250)
+    writer = SnapshotWriter(batch_size=2, cross_rate_matrix=FixedCrossRates())
+
+    snapshotted = run(writer.run_once)
+
+    today = datetime.now(timezone.utc).date()
+    assert snapshotted >= 1
+    assert writer.last_day == today
+    for interval in ("day", "week", "month"):
+        assert history(client, headers, account_id, interval=interval) == [
+            (period_start(today, interval).isoformat(), today.isoformat(), 250.0)
+        ]
+
+
+def test_later_day_wins_the_rollup(client, headers, create_account, run):
+    account_id = create_account()
+    run(add_snapshots, snapshot_rows(account_id, date(2024, 5, 14), "2.00"))
+    run(add_snapshots, snapshot_rows(account_id, date(2024, 5, 13), "1.00"))
+    run(add_snapshots, snapshot_rows(account_id, date(2024, 5, 14), "3.00"))
+
+    assert history(client, headers, account_id, interval="day") == [
+        ("2024-05-13", "2024-05-13", 1.0),
+        ("2024-05-14", "2024-05-14", 3.0),  # a later run of the day overwrites
+    ]
+    # a late snapshot of an earlier day does not replace the week or month
+    assert history(client, headers, account_id, interval="week") == [
+        ("2024-05-13", "2024-05-14", 3.0)
+    ]
+    assert history(client, headers, account_id, interval="month") == [
+        ("2024-05-01", "2024-05-14", 3.0)
+    ]
+
+
+def test_history_filters(client, headers, create_account, run):
+    account_id = create_account()
+    days = [date(2024, 4, 29), date(2024, 5, 2), date(2024, 5, 9), date(2024, 6, 3)]
+    for i, day in enumerate(days):
+        run(add_snapshots, snapshot_rows(account_id, day, str(i)))
+
+    assert [
+        point[1]
+        for point in history(
+            client, headers, account_id, **{"from": "2024-05-01", "to": "2024-05-31"}
+        )
+    ] == ["2024-05-02", "2024-05-09"]
+    # periods containing from and to are included
+    assert history(
+        client, headers, account_id, interval="week", **{"from": "2024-05-01"}
+    ) == [
+        ("2024-04-29", "2024-05-02", 1.0),
+        ("2024-05-06", "2024-05-09", 2.0),
+        ("2024-06-03", "2024-06-03", 3.0),
+    ]
+    assert history(client, headers, account_id, interval="month", to="2024-05-15") == [
+        ("2024-04-01", "2024-04-29", 0.0),
+        ("2024-05-01", "2024-05-09", 2.0),
+    ]
+
+    response = client.get(
+        f"{API}/accounts/{account_id}/history",
+        params={"from": "2024-06-01", "to": "2024-05-01"},
+        headers=headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,131 @@
+import csv
+import importlib.util
+import io
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from src.config.constants import API, TRANSACTION_EXPORT_COLUMNS
+from src.services.transaction_export import transaction_exporter
+from tests.conftest import login
+from tests.test_transactions_page import asset_purchase, bulk_import, currency_purchase
+
+
+@pytest.fixture
+def exported(client, headers, create_account, monkeypatch):
+    # several batches for a handful of rows
+    monkeypatch.setattr(transaction_exporter, "batch_size", 2)
+    account_id = create_account()
+    ids = bulk_import(
+        client,
+        headers,
+        [
+            currency_purchase(account_id, "EUR", amount=12.34),
+            asset_purchase(account_id, "AAPL", quantity=0.5),
+            currency_purchase(account_id, "USD", amount=0.1),
+            currency_purchase(account_id, "EUR", amount=100),
+            asset_purchase(account_id, "MSFT"),
+        ],
+    )
+
+    def export(format: str):
+        return client.get(
+            f"{API}/accounts/{account_id}/transactions/export",
+            params={"format": format},
+            headers=headers,
+        )
+
+    return account_id, ids, export
+
+
+def test_csv_export(exported):
+    account_id, ids, export = exported
+
+    response = export("csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        f'attachment; filename="account_{account_id}_transactions.csv"'
+    )
+    header, *rows = csv.reader(io.StringIO(response.text))
+    assert tuple(header) == TRANSACTION_EXPORT_COLUMNS
+    rows = [dict(zip(header, row)) for row in rows]
+    assert [int(row["id"]) for row in rows] == ids
+    assert [row["amount"] for row in rows] == [
+        "12.34",
+        "2.50",
+        "0.10",
+        "100.00",
+        "10.00",
+    ]
+    assert [row["currency"] or row["asset_name"] for row in rows] == [
+        "EUR",
+        "AAPL",
+        "USD",
+        "EUR",
+        "MSFT",
+    ]
+
+
+def test_ndjson_export(exported):
+    _, ids, export = exported
+
+    response = export("ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [tuple(row) for row in rows] == [TRANSACTION_EXPORT_COLUMNS] * len(ids)
+    assert [row["id"] for row in rows] == ids
+    assert [Decimal(str(row["amount"])) for row in rows] == [
+        Decimal("12.34"),
+        Decimal("2.5"),
+        Decimal("0.1"),
+        Decimal("100"),
+        Decimal("10"),
+    ]
+    assert rows[1]["asset_id"] is not None and rows[1]["currency_invest_id"] is None
+
+
+def test_empty_export(client, headers, create_account):
+    account_id = create_account()
+    url = f"{API}/accounts/{account_id}/transactions/export"
+
+    response = client.get(url, headers=headers)
+    assert response.text.splitlines() == [",".join(TRANSACTION_EXPORT_COLUMNS)]
+
+    response = client.get(url, params={"format": "ndjson"}, headers=headers)
+    assert response.text == ""
+
+
+def test_parquet_export_needs_pyarrow(client, headers, create_account, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: None if name == "pyarrow" else find_spec(name, *args),
+    )
+    account_id = create_account()
+
+    response = client.get(
+        f"{API}/accounts/{account_id}/transactions/export",
+        params={"format": "parquet"},
+        headers=headers,
+    )
+
+    assert response.status_code == 501
+    assert response.json()["detail"] == (
+        "Export to parquet is not available on this server"
+    )
+
+
+def test_export_of_another_user(client, create_account):
+    account_id = create_account()
+
+    response = client.get(
+        f"{API}/accounts/{account_id}/transactions/export", headers=login(client)
+    )
+
+    assert response.status_code == 403
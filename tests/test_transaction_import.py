@@ -0,0 +1,120 @@
+import time
+
+import orjson
+
+from src.config.constants import API
+from src.services.transaction_import import ImportJobs, import_jobs
+from tests.conftest import login
+from tests.test_transactions_page import asset_purchase, currency_purchase
+
+CSV_COLUMNS = (
+    "account_id,amount,type,currency,purchase_exchange_rate,"
+    "asset_name,purchase_share_price,share_quantity"
+)
+
+
+def upload(client, headers, body: bytes, format: str) -> dict:
+    response = client.post(
+        f"{API}/transactions/import",
+        params={"format": format},
+        content=body,
+        headers=headers,
+    )
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+def wait_for(client, headers, job_id: str) -> dict:
+    for _ in range(200):
+        response = client.get(f"{API}/transactions/import/{job_id}", headers=headers)
+        assert response.status_code == 200, response.text
+        job = response.json()
+        if job["status"] in ("finished", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"import {job_id} did not finish")
+
+
+def transaction_ids(client, headers, account_id: int) -> list[int]:
+    response = client.get(
+        f"{API}/accounts/{account_id}/transactions",
+        params={"limit": 100},
+        headers=headers,
+    )
+    return [item["id"] for item in response.json()["items"]]
+
+
+def test_csv_import_in_batches(client, headers, create_account, monkeypatch):
+    monkeypatch.setattr(import_jobs, "batch_size", 2)
+    account_id = create_account(balance=100)
+    body = "\n".join(
+        [
+            CSV_COLUMNS,
+            f"{account_id},40,INVESTMENT,EUR,0.25,,,",
+            f"{account_id},10,INVESTMENT,,,AAPL,5,2",
+            f"{account_id},500,INVESTMENT,EUR,0.25,,,",
+            f"{account_id},20,WITHDRAW,EUR,0.25,,,",
+            f"{account_id},10,WITHDRAW,,,AAPL,5,2",
+        ]
+    ).encode()
+
+    job = wait_for(client, headers, upload(client, headers, body, "csv")["id"])
+
+    assert job["status"] == "finished"
+    assert job["format"] == "csv"
+    assert (job["rows_read"], job["rows_imported"], job["rows_rejected"]) == (5, 3, 2)
+    # errors carry the row number in the file, the header excluded
+    assert [error["index"] for error in job["errors"]] == [3, 5]
+    assert job["errors"][0]["detail"] == "Insufficient funds"
+    assert "Only asset purchases can be imported" in job["errors"][1]["detail"]
+    assert job["finished_at"] is not None
+    assert len(transaction_ids(client, headers, account_id)) == 3
+    account = client.get(f"{API}/accounts/{account_id}", headers=headers).json()
+    assert account["balance_investable_funds"] == 70
+
+
+def test_ndjson_import(client, headers, create_account):
+    account_id = create_account(balance=100)
+    lines = [
+        orjson.dumps(currency_purchase(account_id, "EUR", 20)),
+        b"",
+        b"{not json",
+        orjson.dumps(asset_purchase(account_id, "AAPL", 1)),
+        orjson.dumps({**currency_purchase(account_id, "EUR"), "amount": -1}),
+    ]
+
+    job = wait_for(
+        client, headers, upload(client, headers, b"\n".join(lines), "ndjson")["id"]
+    )
+
+    assert job["status"] == "finished"
+    assert (job["rows_read"], job["rows_imported"], job["rows_rejected"]) == (4, 2, 2)
+    errors = {error["index"]: error["detail"] for error in job["errors"]}
+    assert sorted(errors) == [2, 4]  # blank lines are not counted
+    assert errors[2].startswith("Invalid JSON")
+    assert errors[4].startswith("amount")
+    assert len(transaction_ids(client, headers, account_id)) == 2
+
+
+def test_job_progress_is_read_from_the_cache(client, headers, create_account, run):
+    account_id = create_account(balance=100)
+    body = f"{CSV_COLUMNS}\n{account_id},40,INVESTMENT,EUR,0.25,,,".encode()
+    job = wait_for(client, headers, upload(client, headers, body, "csv")["id"])
+
+    user_id = client.get(f"{API}/accounts/", headers=headers).json()[0]["user_id"]
+    other_worker = ImportJobs()
+    state = run(other_worker.get, job["id"], user_id)
+
+    assert state.model_dump(mode="json") == job
+    assert run(other_worker.get, job["id"], -1) is None
+
+
+def test_jobs_of_other_users_are_not_found(client, headers):
+    job = upload(client, headers, CSV_COLUMNS.encode(), "csv")
+
+    response = client.get(
+        f"{API}/transactions/import/{job['id']}", headers=login(client)
+    )
+
+    assert response.status_code == 404
+    assert wait_for(client, headers, job["id"])["rows_read"] == 0
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from src.config.constants import API
+from src.database.db import engine
+from src.database.models import Transaction
+
+
+def bulk_import(client, headers, items: list[dict]) -> list[int]:
+    response = client.post(
+        f"{API}/transactions/bulk", json={"transactions": items}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["errors"] == []
+    return response.json()["transaction_ids"]
+
+
+def currency_purchase(account_id: int, currency: str, amount: float = 10) -> dict:
+    return {
+        "account_id": account_id,
+        "amount": amount,
+        "type": "INVESTMENT",
+        "currency": currency,
+        "purchase_exchange_rate": 0.25,
+    }
+
+
+def asset_purchase(account_id: int, asset_name: str, quantity: float = 2) -> dict:
+    return {
+        "account_id": account_id,
+        "amount": 5 * quantity,
+        "type": "INVESTMENT",
+        "asset_name": asset_name,
+        "purchase_share_price": 5,
+        "share_quantity": quantity,
+    }
+
+
+def test_instrument_filter(client, headers, create_account):
+    account_id = create_account()
+    ids = bulk_import(
+        client,
+        headers,
+        [
+            currency_purchase(account_id, "EUR"),
+            asset_purchase(account_id, "AAPL"),
+            currency_purchase(account_id, "USD"),
+            asset_purchase(account_id, "EUR"),
+            currency_purchase(account_id, "EUR"),
+        ],
+    )
+    url = f"{API}/accounts/{account_id}/transactions"
+
+    response = client.get(url, params={"instrument": "EUR"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [item["id"] for item in response.json()["items"]] == [
+        ids[4],
+        ids[3],
+        ids[0],
+    ]
+
+    response = client.get(
+        url,
+        params={"instrument": "EUR", "instrument_type": "ASSET"},
+        headers=headers,
+    )
+    assert [item["id"] for item in response.json()["items"]] == [ids[3]]
+
+    response = client.get(url, params={"instrument": "AAPL"}, headers=headers)
+    assert [item["asset_id"] is not None for item in response.json()["items"]] == [True]
+
+    response = client.get(url, params={"instrument": "GBP"}, headers=headers)
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+def set_created_at(ids: list[int], created_at: list[datetime]) -> None:
+    # SQLite keeps server_default=now() as text without microseconds, which
+    # does not compare with bound datetimes; write them as the ORM does
+    with engine.begin() as connection:
+        for transaction_id, value in zip(ids, created_at):
+            connection.execute(
+                update(Transaction)
+                .where(Transaction.id == transaction_id)
+                .values(created_at=value)
+            )
+
+
+def pages(client, headers, url: str, params: dict) -> list[list[int]]:
+    pages, cursor = [], None
+    for _ in range(100):
+        page = client.get(
+            url,
+            params={**params, "cursor": cursor} if cursor else params,
+            headers=headers,
+        ).json()
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+    raise AssertionError("the cursor does not advance")
+
+
+def test_pages_return_every_transaction_once_newest_first(
+    client, headers, create_account
+):
+    account_id = create_account()
+    ids = bulk_import(
+        client, headers, [currency_purchase(account_id, "EUR") for _ in range(10)]
+    )
+    start = datetime(2024, 5, 1, 12)
+    # pairs of transactions created at the same time are ordered by id
+    set_created_at(ids, [start + timedelta(minutes=i // 2) for i in range(10)])
+
+    result = pages(
+        client, headers, f"{API}/accounts/{account_id}/transactions", {"limit": 3}
+    )
+
+    assert [len(page) for page in result] == [3, 3, 3, 1]
+    assert sum(result, []) == ids[::-1]
+
+
+def test_filters_apply_to_every_page(client, headers, create_account):
+    account_id = create_account()
+    ids = bulk_import(
+        client,
+        headers,
+        [currency_purchase(account_id, "EUR"), asset_purchase(account_id, "AAPL")] * 3,
+    )
+    start = datetime(2024, 5, 1, 12)
+    set_created_at(ids, [start + timedelta(days=i) for i in range(6)])
+    url = f"{API}/accounts/{account_id}/transactions"
+
+    assets = pages(client, headers, url, {"limit": 2, "instrument_type": "ASSET"})
+    dated = pages(
+        client,
+        headers,
+        url,
+        {
+            "limit": 1,
+            "date_from": (start + timedelta(days=1)).isoformat(),
+            "date_to": (start + timedelta(days=4)).isoformat(),
+        },
+    )
+
+    assert assets == [[ids[5], ids[3]], [ids[1]]]
+    assert dated == [[ids[3]], [ids[2]], [ids[1]]]
+
+
+def test_invalid_cursor_is_rejected(client, headers, create_account):
+    account_id = create_account()
+    url = f"{API}/accounts/{account_id}/transactions"
+
+    for cursor in ("not-a-cursor", "WzFd", "WyJ4IiwgMV0="):
+        response = client.get(url, params={"cursor": cursor}, headers=headers)
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Invalid cursor"
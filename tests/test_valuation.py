@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from src.config.constants import INSTRUMENT_ASSET, INSTRUMENT_CURRENCY
+from src.database.models import Account
+from src.services.cross_rates import CrossRates
+from src.services.valuation import valuation_engine
+
+# one PLN is worth one PLN, one EUR 4.30 PLN, one USD 4.00 PLN
+CROSS_RATES = CrossRates(
+    ("PLN", "EUR", "USD"), np.array([1.0, 4.3, 4.0]), date(2024, 5, 1)
+)
+ACCOUNTS = [
+    Account(id=1, currency="PLN", balance_investable_funds=Decimal("1000.00")),
+    Account(id=2, currency="EUR", balance_investable_funds=Decimal("10.00")),
+]
+POSITIONS = [
+    (1, INSTRUMENT_CURRENCY, "USD", 100.0, 39000),
+    (1, INSTRUMENT_ASSET, "AAPL", 1.0, 15000),
+    (1, INSTRUMENT_ASSET, "AAPL", 1.0, 17000),  # rows of one position are summed
+    (1, INSTRUMENT_ASSET, "MSFT", 3.0, 30000),  # no price, valued at cost
+    (2, INSTRUMENT_CURRENCY, "PLN", 43.0, 1000),
+    (3, INSTRUMENT_ASSET, "AAPL", 1.0, 100),  # account not valued
+]
+PRICES = {("PLN", INSTRUMENT_ASSET, "AAPL"): 200.0}
+
+
+def test_value_accounts():
+    first, second = valuation_engine.value_accounts(
+        ACCOUNTS, POSITIONS, PRICES, CROSS_RATES
+    )
+
+    positions = {position.instrument: position for position in first.positions}
+    assert positions["USD"].market_value == Decimal("400.00")
+    assert positions["USD"].unrealized_pnl == Decimal("10.00")
+    assert positions["AAPL"].quantity == 2.0
+    assert positions["AAPL"].cost_basis == Decimal("320.00")
+    assert positions["AAPL"].market_value == Decimal("400.00")
+    assert not positions["MSFT"].priced
+    assert positions["MSFT"].market_value == Decimal("300.00")
+    assert first.cash == Decimal("1000.00")
+    assert first.cost_basis == Decimal("1010.00")
+    assert first.positions_value == Decimal("1100.00")
+    assert first.market_value == Decimal("2100.00")
+    assert second.positions[0].market_value == Decimal("10.00")
+    assert second.market_value == Decimal("20.00")
+
+
+def test_value_accounts_without_positions():
+    (account,) = valuation_engine.value_accounts(ACCOUNTS[:1], [])
+    assert account.positions == []
+    assert account.market_value == Decimal("1000.00")
+
+
+def test_account_totals_match_value_accounts():
+    totals = valuation_engine.account_totals(ACCOUNTS, POSITIONS, CROSS_RATES, PRICES)
+    accounts = valuation_engine.value_accounts(ACCOUNTS, POSITIONS, PRICES, CROSS_RATES)
+
+    assert totals["positions_value"].tolist() == [
+        int(account.positions_value * 100) for account in accounts
+    ]
+    assert totals["cost_basis"].tolist() == [101000, 1000]
+    assert totals["cash"].tolist() == [100000, 1000]
+
+
+def test_summarize_in_base_currency():
+    summary = valuation_engine.summarize(
+        ACCOUNTS, POSITIONS, CROSS_RATES, "PLN", PRICES
+    )
+
+    assert summary.base == "PLN"
+    assert summary.cash == Decimal("1043.00")
+    assert summary.positions_value == Decimal("1143.00")
+    assert summary.market_value == Decimal("2186.00")
+    assert summary.unconverted_account_ids == []
+
+
+def test_summarize_reports_accounts_without_a_rate():
+    cross_rates = CrossRates(
+        ("PLN", "EUR", "USD"), np.array([1.0, np.nan, 4.0]), date(2024, 5, 1)
+    )
+    summary = valuation_engine.summarize(ACCOUNTS, POSITIONS, cross_rates, "PLN")
+
+    assert summary.unconverted_account_ids == [2]
+    assert summary.cash == Decimal("1000.00")